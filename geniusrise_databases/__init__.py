@@ -13,44 +13,109 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from geniusrise_databases.arangodb import ArangoDB
-from geniusrise_databases.athena import Athena
-from geniusrise_databases.azure_table import AzureTableStorage
-from geniusrise_databases.bigquery import BigQuery
-from geniusrise_databases.bigtable import Bigtable
-from geniusrise_databases.cassandra import Cassandra
-from geniusrise_databases.cloud_sql import GoogleCloudSQL
-from geniusrise_databases.cockroach import CockroachDB
-from geniusrise_databases.cosmosdb import CosmosDB
-from geniusrise_databases.couchbase import Couchbase
-from geniusrise_databases.db2 import DB2
-from geniusrise_databases.documentdb import DocumentDB
-from geniusrise_databases.dynamodb import DynamoDB
-from geniusrise_databases.elasticsearch import Elasticsearch
-from geniusrise_databases.firestore import Firestore
-from geniusrise_databases.graphite import Graphite
-from geniusrise_databases.hbase import HBase
-from geniusrise_databases.influxdb import InfluxDB
-from geniusrise_databases.kairosdb import KairosDB
-from geniusrise_databases.keyspaces import AWSKeyspaces
-from geniusrise_databases.ldap import LDAP
-from geniusrise_databases.memsql import MemSQL
-from geniusrise_databases.mongodb import MongoDB
-from geniusrise_databases.mysql import MySQL
-from geniusrise_databases.neo4j import Neo4j
-from geniusrise_databases.nuodb import NuoDB
-from geniusrise_databases.opentsdb import OpenTSDB
-from geniusrise_databases.oracle import Oracle
-from geniusrise_databases.postgres import PostgreSQL
-from geniusrise_databases.presto import Presto
-from geniusrise_databases.redis import Redis
-from geniusrise_databases.riak import Riak
-from geniusrise_databases.spanner import Spanner
-from geniusrise_databases.sql_server import SQLServer
-from geniusrise_databases.sqlite import SQLite
-from geniusrise_databases.sybase import Sybase
-from geniusrise_databases.teradata import Teradata
-from geniusrise_databases.tidb import TiDB
-from geniusrise_databases.timescaledb import TimescaleDB
-from geniusrise_databases.vertica import Vertica
-from geniusrise_databases.voltdb import VoltDB
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from geniusrise_databases.arangodb import ArangoDB
+    from geniusrise_databases.athena import Athena
+    from geniusrise_databases.azure_table import AzureTableStorage
+    from geniusrise_databases.bigquery import BigQuery
+    from geniusrise_databases.bigtable import Bigtable
+    from geniusrise_databases.cassandra import Cassandra
+    from geniusrise_databases.cloud_sql import GoogleCloudSQL
+    from geniusrise_databases.cockroach import CockroachDB
+    from geniusrise_databases.cosmosdb import CosmosDB
+    from geniusrise_databases.couchbase import Couchbase
+    from geniusrise_databases.db2 import DB2
+    from geniusrise_databases.documentdb import DocumentDB
+    from geniusrise_databases.dynamodb import DynamoDB
+    from geniusrise_databases.elasticsearch import Elasticsearch
+    from geniusrise_databases.firestore import Firestore
+    from geniusrise_databases.graphite import Graphite
+    from geniusrise_databases.hbase import HBase
+    from geniusrise_databases.influxdb import InfluxDB
+    from geniusrise_databases.kairosdb import KairosDB
+    from geniusrise_databases.keyspaces import AWSKeyspaces
+    from geniusrise_databases.ldap import LDAP
+    from geniusrise_databases.memsql import MemSQL
+    from geniusrise_databases.mongodb import MongoDB
+    from geniusrise_databases.mysql import MySQL
+    from geniusrise_databases.neo4j import Neo4j
+    from geniusrise_databases.nuodb import NuoDB
+    from geniusrise_databases.opentsdb import OpenTSDB
+    from geniusrise_databases.oracle import Oracle
+    from geniusrise_databases.postgres import PostgreSQL
+    from geniusrise_databases.presto import Presto
+    from geniusrise_databases.redis import Redis
+    from geniusrise_databases.riak import Riak
+    from geniusrise_databases.spanner import Spanner
+    from geniusrise_databases.sql_server import SQLServer
+    from geniusrise_databases.sqlite import SQLite
+    from geniusrise_databases.sybase import Sybase
+    from geniusrise_databases.teradata import Teradata
+    from geniusrise_databases.tidb import TiDB
+    from geniusrise_databases.timescaledb import TimescaleDB
+    from geniusrise_databases.vertica import Vertica
+    from geniusrise_databases.voltdb import VoltDB
+
+# Spout classes are imported on first access so that importing the package
+# does not pull in the drivers of every supported database.
+_SPOUTS = {
+    "ArangoDB": "geniusrise_databases.arangodb",
+    "Athena": "geniusrise_databases.athena",
+    "AzureTableStorage": "geniusrise_databases.azure_table",
+    "BigQuery": "geniusrise_databases.bigquery",
+    "Bigtable": "geniusrise_databases.bigtable",
+    "Cassandra": "geniusrise_databases.cassandra",
+    "GoogleCloudSQL": "geniusrise_databases.cloud_sql",
+    "CockroachDB": "geniusrise_databases.cockroach",
+    "CosmosDB": "geniusrise_databases.cosmosdb",
+    "Couchbase": "geniusrise_databases.couchbase",
+    "DB2": "geniusrise_databases.db2",
+    "DocumentDB": "geniusrise_databases.documentdb",
+    "DynamoDB": "geniusrise_databases.dynamodb",
+    "Elasticsearch": "geniusrise_databases.elasticsearch",
+    "Firestore": "geniusrise_databases.firestore",
+    "Graphite": "geniusrise_databases.graphite",
+    "HBase": "geniusrise_databases.hbase",
+    "InfluxDB": "geniusrise_databases.influxdb",
+    "KairosDB": "geniusrise_databases.kairosdb",
+    "AWSKeyspaces": "geniusrise_databases.keyspaces",
+    "LDAP": "geniusrise_databases.ldap",
+    "MemSQL": "geniusrise_databases.memsql",
+    "MongoDB": "geniusrise_databases.mongodb",
+    "MySQL": "geniusrise_databases.mysql",
+    "Neo4j": "geniusrise_databases.neo4j",
+    "NuoDB": "geniusrise_databases.nuodb",
+    "OpenTSDB": "geniusrise_databases.opentsdb",
+    "Oracle": "geniusrise_databases.oracle",
+    "PostgreSQL": "geniusrise_databases.postgres",
+    "Presto": "geniusrise_databases.presto",
+    "Redis": "geniusrise_databases.redis",
+    "Riak": "geniusrise_databases.riak",
+    "Spanner": "geniusrise_databases.spanner",
+    "SQLServer": "geniusrise_databases.sql_server",
+    "SQLite": "geniusrise_databases.sqlite",
+    "Sybase": "geniusrise_databases.sybase",
+    "Teradata": "geniusrise_databases.teradata",
+    "TiDB": "geniusrise_databases.tidb",
+    "TimescaleDB": "geniusrise_databases.timescaledb",
+    "Vertica": "geniusrise_databases.vertica",
+    "VoltDB": "geniusrise_databases.voltdb",
+}
+
+__all__ = list(_SPOUTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _SPOUTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    klass = getattr(importlib.import_module(_SPOUTS[name]), name)
+    globals()[name] = klass
+    return klass
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
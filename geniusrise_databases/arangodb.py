@@ -16,6 +16,8 @@
 import arango
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class ArangoDB(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -90,6 +92,9 @@ class ArangoDB(Spout):
             self.log.error(f"Error connecting to ArangoDB server: {e}")
             return
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         # Perform the ArangoDB operation
         try:
             cursor = db[collection].fetch()
@@ -99,8 +104,11 @@ class ArangoDB(Spout):
                 if not doc:
                     break
 
-                # Save the fetched document to a file
-                self.output.save(doc)
+                # Buffer the fetched document
+                buffer.add(doc)
+
+            # Flush the remaining buffered rows
+            buffer.flush()
 
             # Update the state
             current_state = self.state.get_state(self.id) or {
@@ -17,6 +17,8 @@ import boto3
 import time
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class Athena(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -80,6 +82,9 @@ class Athena(Spout):
         # Initialize the Athena client
         athena = boto3.client("athena", region_name=region_name)
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         # Perform the Athena operation
         try:
             result = athena.start_query_execution(
@@ -100,8 +105,11 @@ class Athena(Spout):
                 self.log.info(f"Waiting for query to complete ({status})...")
                 time.sleep(5)
 
-            # Save the query results to a file
-            self.output.save(result["ResultSet"])
+            # Buffer the query results
+            buffer.add(result["ResultSet"])
+
+            # Flush the remaining buffered rows
+            buffer.flush()
 
             # Update the state
             current_state = self.state.get_state(self.id) or {
@@ -17,6 +17,8 @@ from azure.cosmosdb.table.models import Entity
 from azure.cosmosdb.table.tableservice import TableService
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class AzureTableStorage(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -74,12 +76,18 @@ class AzureTableStorage(Spout):
         """
         table_service = TableService(account_name=account_name, account_key=account_key)
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             entities = table_service.query_entities(table_name)
             fetched_data = [Entity(e) for e in entities]
 
-            # Save the fetched rows to a file
-            self.output.save(fetched_data)
+            # Buffer the fetched rows
+            buffer.extend(fetched_data)
+
+            # Flush the remaining buffered rows
+            buffer.flush()
 
             # Update the state
             current_state = self.state.get_state(self.id) or {
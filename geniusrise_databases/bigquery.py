@@ -13,8 +13,135 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Optional
+
 import google.cloud.bigquery as bigquery
 from geniusrise import BatchOutput, Spout, State
+from google.cloud import bigquery_storage_v1
+from google.cloud.bigquery_storage_v1 import types
+
+from geniusrise_databases.buffered_output import BufferedOutput
+from geniusrise_databases.dbapi import select_query
+from geniusrise_databases.parquet_output import ParquetOutput
+
+log = logging.getLogger(__name__)
+
+
+def read_stream(
+    client: bigquery_storage_v1.BigQueryReadClient,
+    session: types.ReadSession,
+    stream: str,
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    stop: threading.Event,
+) -> int:
+    """
+    Read one stream of a read session as Arrow record batches and write it to its own output files.
+
+    With Parquet output the record batches are written as they are, otherwise they are converted into rows.
+
+    Args:
+        client (bigquery_storage_v1.BigQueryReadClient): The Storage Read API client.
+        session (types.ReadSession): The read session.
+        stream (str): The name of the stream.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        stop (threading.Event): Set when the read fails, to stop reading.
+
+    Returns:
+        int: The number of rows read.
+    """
+    buffer = BufferedOutput.from_arguments(output, buffer_arguments)
+
+    for page in client.read_rows(stream).rows(session).pages:
+        if stop.is_set():
+            return buffer.rows_written
+        batch = page.to_arrow()
+        if isinstance(buffer, ParquetOutput):
+            # Parquet files are written from the Arrow data as it is received
+            buffer.add_batch(batch)
+        else:
+            buffer.extend(batch.to_pylist())
+
+    buffer.flush()
+    return buffer.rows_written
+
+
+def read_table(
+    project_id: str,
+    dataset_id: str,
+    table_id: str,
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    columns: Optional[str] = None,
+    row_restriction: Optional[str] = None,
+    streams: int = 0,
+    workers: Optional[int] = None,
+    billing_project_id: Optional[str] = None,
+) -> int:
+    """
+    Read a table with the BigQuery Storage Read API, as parallel streams that each write their own output files.
+
+    Args:
+        project_id (str): The Google Cloud project ID of the table.
+        dataset_id (str): The BigQuery dataset ID.
+        table_id (str): The BigQuery table ID.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        columns (Optional[str]): Comma-separated list of the columns to read. Defaults to all columns.
+        row_restriction (Optional[str]): A SQL filter the rows are restricted to, e.g. "country = 'US'".
+        streams (int): The largest number of streams, 0 to let BigQuery choose. Defaults to 0.
+        workers (Optional[int]): The number of threads. Defaults to the number of streams.
+        billing_project_id (Optional[str]): The project the read is billed to. Defaults to the project of the table.
+
+    Returns:
+        int: The number of rows read.
+    """
+    client = bigquery_storage_v1.BigQueryReadClient()
+
+    read_options = types.ReadSession.TableReadOptions()
+    if columns:
+        read_options.selected_fields = [column.strip() for column in columns.split(",")]
+    if row_restriction:
+        read_options.row_restriction = row_restriction
+
+    session = client.create_read_session(
+        parent=f"projects/{billing_project_id or project_id}",
+        read_session=types.ReadSession(
+            table=f"projects/{project_id}/datasets/{dataset_id}/tables/{table_id}",
+            data_format=types.DataFormat.ARROW,
+            read_options=read_options,
+        ),
+        max_stream_count=streams,
+    )
+    if not session.streams:
+        log.info("The read session has no streams, the table has no matching rows")
+        return 0
+
+    workers = workers or len(session.streams)
+    log.info(f"Reading {len(session.streams)} streams with {workers} threads")
+
+    stop = threading.Event()
+    processed_rows = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(read_stream, client, session, stream.name, output, buffer_arguments, stop)
+            for stream in session.streams
+        ]
+        try:
+            for future in as_completed(futures):
+                processed_rows += future.result()
+                log.info(f"Total rows processed: {processed_rows}")
+        except BaseException:
+            stop.set()
+            executor.shutdown(cancel_futures=True)
+            raise
+
+    return processed_rows
 
 
 class BigQuery(Spout):
@@ -59,25 +186,57 @@ class BigQuery(Spout):
         super().__init__(output, state)
         self.top_level_arguments = kwargs
 
-    def fetch(self, project_id: str, dataset_id: str, table_id: str):
+    def fetch(
+        self,
+        project_id: str,
+        dataset_id: str,
+        table_id: str,
+        columns: Optional[str] = None,
+        where: Optional[str] = None,
+        limit: Optional[int] = None,
+    ):
         """
         📖 Fetch data from a BigQuery table and save it in batch.
 
+        Without a filter, the rows are listed straight from the table, which runs no query job and bills no bytes,
+        and only the selected columns are transferred. With a filter, a query reading only the selected columns is
+        run, so only those columns are scanned.
+
         Args:
             project_id (str): The Google Cloud project ID.
             dataset_id (str): The BigQuery dataset ID.
             table_id (str): The BigQuery table ID.
+            columns (Optional[str]): Comma-separated list of the columns to read. Defaults to all columns.
+            where (Optional[str]): A filter the rows are restricted to, e.g. "country = 'US'". Defaults to all rows.
+            limit (Optional[int]): The largest number of rows to read. Defaults to no limit.
 
         Raises:
+            ValueError: If a column is not in the table.
             Exception: If unable to connect to the BigQuery server or execute the query.
         """
         # Initialize BigQuery client
         client = bigquery.Client(project=project_id)
 
-        # Execute the query and save the results to a file
-        query = f"SELECT * FROM `{dataset_id}.{table_id}`"
-        results = client.query(query).result()
-        self.output.save(results)
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
+        # Execute the query or list the table and buffer the results
+        if where:
+            query = select_query(f"`{dataset_id}.{table_id}`", columns, where, limit)
+            results = client.query(query).result()
+        else:
+            table = client.get_table(f"{project_id}.{dataset_id}.{table_id}")
+            selected_fields = None
+            if columns:
+                fields = {field.name: field for field in table.schema}
+                names = [column.strip() for column in columns.split(",")]
+                for name in names:
+                    if name not in fields:
+                        raise ValueError(f"Invalid column: {name}")
+                selected_fields = [fields[name] for name in names]
+            results = client.list_rows(table, selected_fields=selected_fields, max_results=limit)
+        buffer.extend(dict(row) for row in results)
+        buffer.flush()
 
         # Update the state
         current_state = self.state.get_state(self.id) or {
@@ -86,5 +245,76 @@ class BigQuery(Spout):
             "processed_rows": 0,
         }
         current_state["success_count"] += 1
-        current_state["processed_rows"] = len(results)
+        current_state["processed_rows"] = buffer.rows_written
         self.state.set_state(self.id, current_state)
+
+    def fetch_storage(
+        self,
+        project_id: str,
+        dataset_id: str,
+        table_id: str,
+        columns: Optional[str] = None,
+        row_restriction: Optional[str] = None,
+        streams: int = 0,
+        workers: Optional[int] = None,
+        billing_project_id: Optional[str] = None,
+    ):
+        """
+        🧩 Fetch a BigQuery table through the Storage Read API as parallel streams and save it in batch.
+
+        The table is read directly from storage, without running a query job, as Arrow record batches. Only the
+        selected columns and the rows matching the row restriction leave BigQuery, and every stream writes its own
+        output files.
+
+        Args:
+            project_id (str): The Google Cloud project ID.
+            dataset_id (str): The BigQuery dataset ID.
+            table_id (str): The BigQuery table ID.
+            columns (Optional[str]): Comma-separated list of the columns to read. Defaults to all columns.
+            row_restriction (Optional[str]): A SQL filter the rows are restricted to, e.g. "country = 'US'".
+                Defaults to all rows.
+            streams (int): The largest number of parallel streams, 0 to let BigQuery choose. Defaults to 0.
+            workers (Optional[int]): The number of threads. Defaults to the number of streams.
+            billing_project_id (Optional[str]): The project the read is billed to. Defaults to project_id.
+
+        Raises:
+            Exception: If unable to connect to the BigQuery server or read the table.
+        """
+        try:
+            processed_rows = read_table(
+                project_id,
+                dataset_id,
+                table_id,
+                self.output,
+                self.top_level_arguments,
+                columns=columns,
+                row_restriction=row_restriction,
+                streams=streams,
+                workers=workers,
+                billing_project_id=billing_project_id,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from BigQuery: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
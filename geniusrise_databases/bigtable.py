@@ -13,8 +13,197 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
 from geniusrise import BatchOutput, Spout, State
 from google.cloud import bigtable
+from google.cloud.bigtable import row_filters
+
+from geniusrise_databases.buffered_output import BufferedOutput
+
+log = logging.getLogger(__name__)
+
+
+def to_datetime(value: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp, assuming UTC when it has no time zone.
+
+    Args:
+        value (str): The timestamp, e.g. "2023-01-01T00:00:00".
+
+    Returns:
+        datetime: The timestamp.
+    """
+    timestamp = datetime.fromisoformat(value)
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+
+
+def build_row_filter(
+    column_families: Optional[str] = None,
+    columns: Optional[str] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    versions: Optional[int] = None,
+) -> Optional[row_filters.RowFilter]:
+    """
+    Build the filter that restricts the cells read on the server.
+
+    Args:
+        column_families (Optional[str]): Comma-separated list of the column families to read. Defaults to all.
+        columns (Optional[str]): Comma-separated list of "family:qualifier" columns to read, in addition to the
+            column families. Defaults to all.
+        start_time (Optional[str]): The ISO 8601 timestamp of the oldest cells to read, inclusive. Defaults to none.
+        end_time (Optional[str]): The ISO 8601 timestamp of the newest cells to read, exclusive. Defaults to none.
+        versions (Optional[int]): The number of most recent cells to read per column. Defaults to all.
+
+    Returns:
+        Optional[row_filters.RowFilter]: The filter, or None to read all cells.
+    """
+    selections: List[row_filters.RowFilter] = []
+    for family in (column_families or "").split(","):
+        if family.strip():
+            selections.append(row_filters.FamilyNameRegexFilter(re.escape(family.strip())))
+    for column in (columns or "").split(","):
+        if column.strip():
+            family, _, qualifier = column.strip().partition(":")
+            selections.append(
+                row_filters.RowFilterChain(
+                    filters=[
+                        row_filters.FamilyNameRegexFilter(re.escape(family)),
+                        row_filters.ColumnQualifierRegexFilter(re.escape(qualifier.encode())),
+                    ]
+                )
+            )
+
+    filters: List[row_filters.RowFilter] = []
+    if len(selections) == 1:
+        filters.append(selections[0])
+    elif selections:
+        filters.append(row_filters.RowFilterUnion(filters=selections))
+    if start_time or end_time:
+        filters.append(
+            row_filters.TimestampRangeFilter(
+                row_filters.TimestampRange(
+                    start=to_datetime(start_time) if start_time else None,
+                    end=to_datetime(end_time) if end_time else None,
+                )
+            )
+        )
+    if versions:
+        filters.append(row_filters.CellsColumnLimitFilter(versions))
+
+    if not filters:
+        return None
+    elif len(filters) == 1:
+        return filters[0]
+    return row_filters.RowFilterChain(filters=filters)
+
+
+def shard_ranges(samples: List[Tuple[bytes, int]], shards: Optional[int] = None) -> List[Tuple[bytes, bytes]]:
+    """
+    Split the keyspace of a table into row ranges aligned on its tablets.
+
+    Args:
+        samples (List[Tuple[bytes, int]]): The row keys and offsets in bytes returned by `sample_row_keys`.
+        shards (Optional[int]): The largest number of ranges, adjacent tablets being merged into ranges of about
+            the same size. Defaults to one range per tablet.
+
+    Returns:
+        List[Tuple[bytes, bytes]]: The start key, inclusive, and end key, exclusive, of every range, an empty key
+            standing for the start or end of the table.
+    """
+    keys = [(key, offset) for key, offset in samples if key]
+    if shards and len(keys) >= shards:
+        step = max(samples[-1][1], 1) / shards
+        merged: List[Tuple[bytes, int]] = []
+        for key, offset in keys:
+            if len(merged) < shards - 1 and offset >= step * (len(merged) + 1):
+                merged.append((key, offset))
+        keys = merged
+
+    bounds = [b""] + [key for key, _ in keys] + [b""]
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+
+def to_text(value: bytes) -> str:
+    """
+    Decode a row key or qualifier, escaping the bytes that are not UTF-8.
+
+    Args:
+        value (bytes): The row key or qualifier.
+
+    Returns:
+        str: The decoded value.
+    """
+    return value.decode("utf-8", "backslashreplace")
+
+
+def row_to_dict(row: Any) -> Dict[str, Any]:
+    """
+    Convert a Bigtable row into a dict of its row key and cells.
+
+    Args:
+        row (Any): The PartialRowData.
+
+    Returns:
+        Dict[str, Any]: The row key and, per column family and qualifier, the list of cells with their value and
+            timestamp.
+    """
+    return {
+        "row_key": to_text(row.row_key),
+        "cells": {
+            family: {
+                to_text(qualifier): [
+                    {"value": cell.value, "timestamp": cell.timestamp.isoformat() if cell.timestamp else None}
+                    for cell in cells
+                ]
+                for qualifier, cells in qualifiers.items()
+            }
+            for family, qualifiers in row.cells.items()
+        },
+    }
+
+
+def read_range(
+    table: Any,
+    start_key: bytes,
+    end_key: bytes,
+    row_filter: Optional[row_filters.RowFilter],
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    stop: threading.Event,
+) -> int:
+    """
+    Stream one row range of a table and write it to its own output files as the rows arrive.
+
+    Args:
+        table (Any): The Bigtable table.
+        start_key (bytes): The first row key of the range, empty for the start of the table.
+        end_key (bytes): The row key after the range, empty for the end of the table.
+        row_filter (Optional[row_filters.RowFilter]): The filter applied on the server.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        stop (threading.Event): Set when another range fails, to stop reading.
+
+    Returns:
+        int: The number of rows read.
+    """
+    buffer = BufferedOutput.from_arguments(output, buffer_arguments)
+    rows = table.read_rows(start_key=start_key or None, end_key=end_key or None, filter_=row_filter)
+
+    for row in rows:
+        if stop.is_set():
+            rows.cancel()
+            return buffer.rows_written
+        buffer.add(row_to_dict(row))
+
+    buffer.flush()
+    return buffer.rows_written
 
 
 class Bigtable(Spout):
@@ -75,23 +264,129 @@ class Bigtable(Spout):
         instance = client.instance(instance_id)
         table = instance.table(table_id)
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
+        try:
+            processed_rows = 0
+            for row in table.read_rows():
+                # Buffer the fetched row as it is streamed
+                buffer.add(row_to_dict(row))
+                processed_rows += 1
+
+            # Flush the remaining buffered rows
+            buffer.flush()
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from Bigtable: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+    def fetch_sharded(
+        self,
+        project_id: str,
+        instance_id: str,
+        table_id: str,
+        column_families: Optional[str] = None,
+        columns: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        versions: Optional[int] = None,
+        shards: Optional[int] = None,
+        workers: int = 8,
+    ):
+        """
+        🧩 Fetch a Google Cloud Bigtable as concurrent row ranges and save it in batch.
+
+        The keyspace is split into ranges aligned on the tablets of the table using `sample_row_keys`, and the ranges
+        are streamed concurrently on a thread pool, every range writing its own output files as its rows arrive. The
+        column and timestamp restrictions are applied on the server as a row filter.
+
+        Args:
+            project_id (str): The Google Cloud Project ID.
+            instance_id (str): The Bigtable instance ID.
+            table_id (str): The Bigtable table ID.
+            column_families (Optional[str]): Comma-separated list of the column families to read. Defaults to all.
+            columns (Optional[str]): Comma-separated list of "family:qualifier" columns to read, in addition to the
+                column families. Defaults to all.
+            start_time (Optional[str]): The ISO 8601 timestamp of the oldest cells to read, inclusive, in UTC unless
+                it has a time zone. Defaults to none.
+            end_time (Optional[str]): The ISO 8601 timestamp of the newest cells to read, exclusive. Defaults to none.
+            versions (Optional[int]): The number of most recent cells to read per column. Defaults to all.
+            shards (Optional[int]): The largest number of row ranges. Defaults to one per tablet.
+            workers (int): The number of threads. Defaults to 8.
+
+        Raises:
+            Exception: If unable to connect to the Bigtable server or fetch the data.
+        """
+        client = bigtable.Client(project=project_id)
+        instance = client.instance(instance_id)
+        table = instance.table(table_id)
+
         try:
-            rows = table.read_rows()
-            rows.consume_all()
+            row_filter = build_row_filter(column_families, columns, start_time, end_time, versions)
+            samples = [(sample.row_key, sample.offset_bytes) for sample in table.sample_row_keys()]
+            ranges = shard_ranges(samples, shards)
+            self.log.info(f"Reading {table_id} as {len(ranges)} row ranges with {workers} threads")
+
+            stop = threading.Event()
+            processed_rows = 0
 
-            # Save the fetched rows to a file
-            self.output.save(rows)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        read_range,
+                        table,
+                        start_key,
+                        end_key,
+                        row_filter,
+                        self.output,
+                        self.top_level_arguments,
+                        stop,
+                    )
+                    for start_key, end_key in ranges
+                ]
+                try:
+                    for future in as_completed(futures):
+                        processed_rows += future.result()
+                        self.log.info(f"Total rows processed: {processed_rows}")
+                except BaseException:
+                    stop.set()
+                    executor.shutdown(cancel_futures=True)
+                    raise
 
             # Update the state
             current_state = self.state.get_state(self.id) or {
                 "success_count": 0,
                 "failure_count": 0,
+                "processed_rows": 0,
             }
             current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
             self.state.set_state(self.id, current_state)
 
             # Log the total number of rows processed
-            self.log.info(f"Total rows processed: {len(rows)}")
+            self.log.info(f"Total rows processed: {processed_rows}")
 
         except Exception as e:
             self.log.error(f"Error fetching data from Bigtable: {e}")
@@ -100,6 +395,7 @@ class Bigtable(Spout):
             current_state = self.state.get_state(self.id) or {
                 "success_count": 0,
                 "failure_count": 0,
+                "processed_rows": 0,
             }
             current_state["failure_count"] += 1
             self.state.set_state(self.id, current_state)
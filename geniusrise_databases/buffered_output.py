@@ -0,0 +1,350 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import shortuuid
+from geniusrise import BatchOutput
+
+
+# Binary types of drivers that are not bytes, by qualified name so that the drivers are not imported
+_BINARY_TYPES = {"boto3.dynamodb.types.Binary"}
+
+
+def to_json(value: Any) -> Any:
+    """
+    Encode a value that `json` cannot serialize.
+
+    Binary values are encoded as base64 and sets as lists, anything else as its string representation.
+
+    Args:
+        value (Any): The value.
+
+    Returns:
+        Any: A JSON serializable value.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)) or (
+        f"{type(value).__module__}.{type(value).__qualname__}" in _BINARY_TYPES
+    ):
+        return base64.b64encode(bytes(value)).decode()
+    elif isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def encode_json(row: Any) -> str:
+    """
+    Serialize a row as JSON, encoding the values `json` cannot serialize with `to_json`.
+
+    Args:
+        row (Any): The row.
+
+    Returns:
+        str: The JSON document.
+    """
+    return json.dumps(row, default=to_json)
+
+
+class BufferedOutput:
+    r"""
+    🧺 BufferedOutput: Coalesces rows fetched by a spout into larger output files.
+
+    Rows are serialized as they are added and written to the output folder of the wrapped `BatchOutput`
+    as a single JSON array once the buffer holds `max_rows` rows, `max_bytes` bytes of serialized data,
+    or once the oldest buffered row is `max_seconds` old. The files have the same layout as the ones
+    written by `BatchOutput.save(rows)`.
+
+    An `on_flush` callback is called with the name of each written file and the last row in it, e.g. to
+    checkpoint how far an extraction got. An `encode` function replaces the default serialization of a row, e.g.
+    to keep the types of a database that has its own JSON dialect.
+
+    The thresholds can be set from the spout's keyword arguments:
+        - buffer_rows (int): Maximum number of rows per file. Defaults to 10000.
+        - buffer_bytes (int): Maximum serialized size of a file in bytes. Defaults to 64 MiB.
+        - buffer_seconds (float): Maximum age of a buffered row in seconds. Defaults to 60.
+
+    Spouts initialized with `output_format="parquet"` get a `ParquetOutput` instead, which writes Parquet files.
+
+    Usage:
+    ```python
+    buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+    for row in rows:
+        buffer.add(row)
+    buffer.flush()
+    ```
+    """
+
+    def __init__(
+        self,
+        output: BatchOutput,
+        max_rows: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_seconds: float = 60.0,
+        on_flush: Optional[Callable[[str, Any], None]] = None,
+        encode: Callable[[Any], str] = encode_json,
+    ) -> None:
+        """
+        Initialize a new buffered output.
+
+        Args:
+            output (BatchOutput): The output the buffered rows are written to.
+            max_rows (int): Maximum number of rows per file. Defaults to 10000.
+            max_bytes (int): Maximum serialized size of a file in bytes. Defaults to 64 MiB.
+            max_seconds (float): Maximum age of a buffered row in seconds. Defaults to 60.
+            on_flush (Optional[Callable[[str, Any], None]]): Called with the name of each written file and the
+                last row in it. Defaults to None.
+            encode (Callable[[Any], str]): Serializes a row as JSON. Defaults to `encode_json`.
+        """
+        self.output = output
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.on_flush = on_flush
+        self.encode = encode
+        self.log = logging.getLogger(self.__class__.__name__)
+
+        self.rows_written = 0
+        self.files_written = 0
+
+        self._rows: List[str] = []
+        self._bytes = 0
+        self._started: Optional[float] = None
+        self._last_row: Any = None
+
+    @classmethod
+    def from_arguments(
+        cls,
+        output: BatchOutput,
+        arguments: Dict[str, Any],
+        on_flush: Optional[Callable[[str, Any], None]] = None,
+        encode: Callable[[Any], str] = encode_json,
+    ) -> "BufferedOutput":
+        """
+        Create a buffered output using the `buffer_*` keyword arguments of a spout.
+
+        Args:
+            output (BatchOutput): The output the buffered rows are written to.
+            arguments (Dict[str, Any]): The keyword arguments the spout was initialized with.
+            on_flush (Optional[Callable[[str, Any], None]]): Called with the name of each written file and the
+                last row in it. Defaults to None.
+            encode (Callable[[Any], str]): Serializes a row as JSON, not used by Parquet outputs. Defaults to
+                `encode_json`.
+
+        Returns:
+            BufferedOutput: The buffered output.
+
+        Raises:
+            ValueError: If the output format is not supported.
+        """
+        output_format = arguments.get("output_format", "json")
+        if output_format == "parquet":
+            from geniusrise_databases.parquet_output import ParquetOutput
+
+            return ParquetOutput.from_arguments(output, arguments, on_flush=on_flush)
+        elif output_format != "json":
+            raise ValueError(f"Invalid output format: {output_format}")
+
+        return cls(
+            output,
+            max_rows=int(arguments.get("buffer_rows", 10000)),
+            max_bytes=int(arguments.get("buffer_bytes", 64 * 1024 * 1024)),
+            max_seconds=float(arguments.get("buffer_seconds", 60.0)),
+            on_flush=on_flush,
+            encode=encode,
+        )
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __enter__(self) -> "BufferedOutput":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.flush()
+
+    def add(self, row: Any) -> None:
+        """
+        ➕ Add a single row to the buffer, flushing it if any threshold is reached.
+
+        Args:
+            row (Any): The row to add, serialized with `encode`.
+        """
+        encoded = self.encode(row)
+        if self._started is None:
+            self._started = time.monotonic()
+
+        self._rows.append(encoded)
+        self._bytes += len(encoded) + 2
+        self._last_row = row
+
+        if self.is_due():
+            self.flush()
+
+    def extend(self, rows: Iterable[Any]) -> None:
+        """
+        ➕ Add several rows to the buffer, flushing it whenever a threshold is reached.
+
+        Args:
+            rows (Iterable[Any]): The rows to add.
+        """
+        for row in rows:
+            self.add(row)
+
+    def is_due(self) -> bool:
+        """
+        Check whether the buffer has reached any of its thresholds.
+
+        Returns:
+            bool: True if the buffer should be flushed.
+        """
+        if not self._rows:
+            return False
+        return (
+            len(self._rows) >= self.max_rows
+            or self._bytes >= self.max_bytes
+            or time.monotonic() - self._started >= self.max_seconds  # type: ignore
+        )
+
+    def flush(self) -> Optional[str]:
+        """
+        💾 Write the buffered rows to a new file in the output folder.
+
+        Returns:
+            Optional[str]: The name of the written file, or None if the buffer was empty.
+        """
+        if not self._rows:
+            return None
+
+        filename = str(shortuuid.uuid())
+        with open(os.path.join(self.output.output_folder, filename), "w") as f:
+            f.write("[")
+            f.write(", ".join(self._rows))
+            f.write("]")
+
+        count = len(self._rows)
+        self.rows_written += count
+        self.files_written += 1
+        self.log.debug(f"✅ Wrote {count} rows into {self.output.output_folder}/{filename}.")
+
+        last_row = self._last_row
+        self._rows = []
+        self._bytes = 0
+        self._started = None
+        self._last_row = None
+
+        if self.on_flush is not None:
+            self.on_flush(filename, last_row)
+        return filename
+
+
+class RollingFileOutput:
+    r"""
+    📜 RollingFileOutput: Streams raw bytes into size-capped files in the output folder.
+
+    Data is written as it arrives, without being decoded, and a new file is started once the current one
+    holds `max_bytes` bytes. Rolling only happens between two `write` calls, so callers that write whole
+    records at a time get files that never split a record. An optional `header` is written at the start of
+    every file.
+
+    Usage:
+    ```python
+    with RollingFileOutput(self.output, extension=".csv", max_bytes=256 * 1024 * 1024) as writer:
+        cursor.copy_expert("COPY table TO STDOUT WITH (FORMAT csv)", writer)
+    ```
+    """
+
+    def __init__(
+        self,
+        output: BatchOutput,
+        extension: str = "",
+        max_bytes: int = 256 * 1024 * 1024,
+        header: bytes = b"",
+        chunk_size: int = 8 * 1024 * 1024,
+    ) -> None:
+        """
+        Initialize a new rolling file output.
+
+        Args:
+            output (BatchOutput): The output whose folder the files are written to.
+            extension (str): The extension of the written files, e.g. ".csv". Defaults to no extension.
+            max_bytes (int): The size after which a new file is started, 0 to never roll. Defaults to 256 MiB.
+            header (bytes): Bytes written at the start of every file. Defaults to none.
+            chunk_size (int): The size of the write buffer of each file. Defaults to 8 MiB.
+        """
+        self.output = output
+        self.extension = extension
+        self.max_bytes = max_bytes
+        self.header = header
+        self.chunk_size = chunk_size
+        self.log = logging.getLogger(self.__class__.__name__)
+
+        self.bytes_written = 0
+        self.files_written = 0
+
+        self._file: Optional[Any] = None
+        self._filename: Optional[str] = None
+        self._file_bytes = 0
+
+    def __enter__(self) -> "RollingFileOutput":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def write(self, data: bytes) -> None:
+        """
+        ✍️ Write bytes to the current file, starting a new file first if the current one is full.
+
+        Args:
+            data (bytes): The bytes to write.
+        """
+        if self._file is not None and self.max_bytes and self._file_bytes >= self.max_bytes:
+            self.close()
+
+        if self._file is None:
+            self._filename = f"{shortuuid.uuid()}{self.extension}"
+            self._file = open(os.path.join(self.output.output_folder, self._filename), "wb", buffering=self.chunk_size)
+            self._file_bytes = 0
+            if self.header:
+                self._file.write(self.header)
+                self._file_bytes += len(self.header)
+
+        self._file.write(data)
+        self._file_bytes += len(data)
+        self.bytes_written += len(data)
+
+    def close(self) -> Optional[str]:
+        """
+        💾 Close the current file.
+
+        Returns:
+            Optional[str]: The name of the closed file, or None if no file was open.
+        """
+        if self._file is None:
+            return None
+
+        self._file.close()
+        self.files_written += 1
+        self.log.debug(f"✅ Wrote {self._file_bytes} bytes into {self.output.output_folder}/{self._filename}.")
+
+        filename = self._filename
+        self._file = None
+        self._filename = None
+        return filename
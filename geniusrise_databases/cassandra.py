@@ -13,12 +13,282 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Dict
+import logging
+import queue
+import threading
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from cassandra.cluster import Cluster
-from cassandra.query import SimpleStatement
+from cassandra.cluster import Cluster, Session
+from cassandra.query import SimpleStatement, dict_factory, tuple_factory
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+from geniusrise_databases.dbapi import checkpoint_key
+
+log = logging.getLogger(__name__)
+
+# The lowest and highest tokens of the partitioners with integer tokens. The default partitioner of Amazon Keyspaces
+# returns the same tokens as the RandomPartitioner.
+TOKEN_BOUNDS = {
+    "org.apache.cassandra.dht.Murmur3Partitioner": (-(2**63), 2**63 - 1),
+    "org.apache.cassandra.dht.RandomPartitioner": (-1, 2**127),
+    "com.amazonaws.cassandra.DefaultPartitioner": (-1, 2**127),
+}
+
+
+def token_ranges(ring: List[int], ranges: int, lower: int, upper: int) -> List[Tuple[int, int]]:
+    """
+    Split the token ring into ranges that do not cross the token boundaries of the cluster.
+
+    Every range between two consecutive tokens of the ring is owned by the same replicas, and is split into equal
+    sub-ranges so that there are at least `ranges` ranges in total.
+
+    Args:
+        ring (List[int]): The tokens of the cluster.
+        ranges (int): The smallest number of ranges.
+        lower (int): The lowest token of the partitioner.
+        upper (int): The highest token of the partitioner.
+
+    Returns:
+        List[Tuple[int, int]]: The ranges as (start, end], covering (lower, upper].
+    """
+    bounds = [lower] + sorted({token for token in ring if lower < token < upper}) + [upper]
+    splits = -(-ranges // (len(bounds) - 1))
+
+    result = []
+    for start, end in zip(bounds, bounds[1:]):
+        points = [start + (end - start) * i // splits for i in range(splits + 1)]
+        result += [(a, b) for a, b in zip(points, points[1:]) if a < b]
+    return result
+
+
+def cluster_token_ranges(session: Session, ranges: int) -> List[Tuple[int, int]]:
+    """
+    Split the token ring of the cluster of a session into ranges aligned to its token map.
+
+    When the driver has no token map, e.g. when token metadata is disabled or the service does not expose its ring,
+    the whole ring of the partitioner is split evenly.
+
+    Args:
+        session (Session): The session.
+        ranges (int): The smallest number of ranges.
+
+    Returns:
+        List[Tuple[int, int]]: The ranges as (start, end].
+
+    Raises:
+        ValueError: If the partitioner of the cluster does not have integer tokens.
+    """
+    metadata = session.cluster.metadata
+    partitioner = metadata.partitioner
+    if partitioner is None:
+        # The driver only reads the partitioner along with the token metadata
+        row = session.execute("SELECT partitioner FROM system.local").one()
+        partitioner = row["partitioner"] if isinstance(row, dict) else row[0]
+    if partitioner not in TOKEN_BOUNDS:
+        raise ValueError(f"Unsupported partitioner: {partitioner}")
+
+    token_map = metadata.token_map
+    ring = [token.value for token in token_map.ring] if token_map and token_map.ring else []
+    return token_ranges(ring, ranges, *TOKEN_BOUNDS[partitioner])
+
+
+def convert_rows(column_names: Sequence[str], rows: List[Tuple], row_format: str = "dict") -> List[Any]:
+    """
+    Convert a page of tuple rows into the rows that are saved.
+
+    Args:
+        column_names (Sequence[str]): The column names of the result.
+        rows (List[Tuple]): The rows, as returned by `tuple_factory`.
+        row_format (str): "dict" for a dict per row or "tuple" for a list of column values per row.
+            Defaults to "dict".
+
+    Returns:
+        List[Any]: The rows.
+
+    Raises:
+        ValueError: If the row format is not supported.
+    """
+    if row_format == "dict":
+        return [dict(zip(column_names, row)) for row in rows]
+    elif row_format == "tuple":
+        return rows
+    else:
+        raise ValueError(f"Invalid row format: {row_format}")
+
+
+class PrefetchingPager:
+    """
+    Iterates over the pages of a query while fetching the next pages in the background.
+
+    The request for page N+1 is sent with the paging state of page N as soon as page N arrives, so the network is
+    busy while the consumer converts and saves the previous pages. Up to `depth` pages are held ahead of the
+    consumer.
+
+    Usage:
+    ```python
+    for column_names, rows in PrefetchingPager(session, SimpleStatement(query, fetch_size=1000), depth=2):
+        ...
+    ```
+    """
+
+    def __init__(self, session: Session, statement: Any, parameters: Any = None, depth: int = 2) -> None:
+        """
+        Start fetching the first page of a query.
+
+        Args:
+            session (Session): The session.
+            statement (Any): The statement, with its fetch size.
+            parameters (Any): The parameters of the statement. Defaults to None.
+            depth (int): The largest number of pages fetched ahead of the consumer. Defaults to 2.
+        """
+        self.session = session
+        self.statement = statement
+        self.parameters = parameters
+        self.depth = max(depth, 1)
+
+        self._pages: deque = deque()
+        self._condition = threading.Condition(threading.RLock())
+        self._paging_state: Optional[bytes] = None
+        self._fetching = False
+        self._done = False
+        self._error: Optional[BaseException] = None
+
+        with self._condition:
+            self._fetch()
+
+    def _fetch(self) -> None:
+        self._fetching = True
+        future = self.session.execute_async(self.statement, self.parameters, paging_state=self._paging_state)
+        future.add_callbacks(callback=self._on_page, callback_args=(future,), errback=self._on_error)
+
+    def _on_page(self, rows: List[Any], future: Any) -> None:
+        result = future.result()
+        with self._condition:
+            self._pages.append((result.column_names, rows))
+            self._paging_state = result.paging_state
+            self._fetching = False
+
+            if not self._paging_state:
+                self._done = True
+            elif len(self._pages) < self.depth:
+                self._fetch()
+            self._condition.notify_all()
+
+    def _on_error(self, error: BaseException) -> None:
+        with self._condition:
+            self._error = error
+            self._fetching = False
+            self._condition.notify_all()
+
+    def __iter__(self) -> Iterator[Tuple[Sequence[str], List[Any]]]:
+        return self
+
+    def __next__(self) -> Tuple[Sequence[str], List[Any]]:
+        with self._condition:
+            while not self._pages and self._fetching and self._error is None:
+                self._condition.wait()
+            if self._error is not None:
+                raise self._error
+            if not self._pages:
+                raise StopIteration
+
+            page = self._pages.popleft()
+            if not self._done and not self._fetching:
+                self._fetch()
+            return page
+
+
+def scan_token_ranges(
+    session: Session,
+    table: str,
+    partition_key: List[str],
+    ranges: List[Tuple[int, int]],
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    state: State,
+    key: str,
+    columns: str = "*",
+    page_size: int = 1000,
+    concurrency: int = 16,
+) -> int:
+    """
+    Read a table as concurrent token range queries, checkpointing the ranges that were written to the output.
+
+    Up to `concurrency` ranges are queried at once with `execute_async`, each with a single page in flight. The rows
+    are written to the output from the calling thread. A range is checkpointed once all of its rows have been
+    written, so that a rerun skips it, and the checkpoints are cleared once all ranges have been read.
+
+    Args:
+        session (Session): The session, with a row factory that returns dicts.
+        table (str): The table to read.
+        partition_key (List[str]): The partition key columns of the table.
+        ranges (List[Tuple[int, int]]): The token ranges to read, as (start, end].
+        output (BatchOutput): The output the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        state (State): The state the checkpoints are kept in.
+        key (str): The state key of the checkpoints.
+        columns (str): The select list. Defaults to "*".
+        page_size (int): The number of rows to fetch per page. Defaults to 1000.
+        concurrency (int): The largest number of ranges queried at once. Defaults to 16.
+
+    Returns:
+        int: The number of rows read in this run.
+    """
+    token = f"token({', '.join(partition_key)})"
+    statement = session.prepare(f"SELECT {columns} FROM {table} WHERE {token} > ? AND {token} <= ?")
+    statement.fetch_size = page_size
+
+    done = set((state.get_state(key) or {}).get("done") or [])
+    pending = deque(r for r in ranges if f"{r[0]}:{r[1]}" not in done)
+    log.info(f"Reading {len(pending)} of {len(ranges)} token ranges")
+
+    # Ranges whose rows have all been added to the buffer, but not written yet
+    unflushed: List[str] = []
+
+    def save(filename: Optional[str], row: Any) -> None:
+        done.update(unflushed)
+        unflushed.clear()
+        state.set_state(key, {"done": sorted(done)})
+
+    buffer = BufferedOutput.from_arguments(output, buffer_arguments, on_flush=save)
+    events: queue.Queue = queue.Queue()
+    in_flight = 0
+    processed_rows = 0
+
+    def submit(token_range: Tuple[int, int]) -> None:
+        future = session.execute_async(statement, token_range)
+        future.add_callbacks(
+            callback=lambda rows: events.put((token_range, future, rows, None)),
+            errback=lambda error: events.put((token_range, future, None, error)),
+        )
+
+    while pending or in_flight:
+        while pending and in_flight < concurrency:
+            submit(pending.popleft())
+            in_flight += 1
+
+        token_range, future, rows, error = events.get()
+        if error is not None:
+            raise error
+
+        buffer.extend(rows)
+        processed_rows += len(rows)
+
+        if future.has_more_pages:
+            future.start_fetching_next_page()
+        else:
+            in_flight -= 1
+            unflushed.append(f"{token_range[0]}:{token_range[1]}")
+            log.info(f"Total rows processed: {processed_rows}")
+
+    buffer.flush()
+
+    # The whole table has been read, the next run starts from the beginning
+    state.set_state(key, {"done": None})
+    return processed_rows
+
 
 class Cassandra(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs: Any) -> None:
@@ -69,6 +339,8 @@ class Cassandra(Spout):
         keyspace: str,
         query: str,
         page_size: int = 100,
+        prefetch: int = 2,
+        row_format: str = "dict",
     ) -> None:
         """
         📖 Fetch data from a Cassandra database and save it in batch.
@@ -78,6 +350,9 @@ class Cassandra(Spout):
             keyspace (str): The Cassandra keyspace to use.
             query (str): The CQL query to execute.
             page_size (int): The number of rows to fetch per page. Defaults to 100.
+            prefetch (int): The number of pages fetched ahead while the previous pages are saved. Defaults to 2.
+            row_format (str): "dict" to save each row as a dict, or "tuple" to save it as a list of column values.
+                Defaults to "dict".
 
         Raises:
             Exception: If unable to connect to the Cassandra cluster or execute the query.
@@ -85,19 +360,111 @@ class Cassandra(Spout):
         # Initialize Cassandra connection
         cluster = Cluster(contact_points=hosts.split(","))
         session = cluster.connect(keyspace)
+        session.row_factory = tuple_factory
+
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
 
         try:
+            # Validate the row format before querying
+            convert_rows([], [], row_format)
             statement = SimpleStatement(query, fetch_size=page_size)
-            rows = session.execute(statement)
             processed_rows = 0
 
-            for row in rows:
-                # Save the fetched rows to a file
-                self.output.save(dict(row))
+            for column_names, rows in PrefetchingPager(session, statement, depth=prefetch):
+                # Buffer the fetched rows
+                buffer.extend(convert_rows(column_names, rows, row_format))
 
                 # Update the number of processed rows
-                processed_rows += 1
-                self.log.debug(f"Processed row {processed_rows}")
+                processed_rows += len(rows)
+                self.log.info(f"Total rows processed: {processed_rows}")
+
+            # Flush the remaining buffered rows
+            buffer.flush()
+
+            # Update the state
+            current_state: Dict[str, Any] = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from Cassandra: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+        finally:
+            session.shutdown()
+            cluster.shutdown()
+
+    def fetch_token_ranges(
+        self,
+        hosts: str,
+        keyspace: str,
+        table: str,
+        columns: str = "*",
+        page_size: int = 1000,
+        ranges: Optional[int] = None,
+        concurrency: int = 16,
+    ) -> None:
+        """
+        🧩 Fetch a whole Cassandra table as concurrent token range queries and save it in batch.
+
+        The token ring is split into ranges aligned to the token map of the cluster, and the ranges are read with
+        `token(partition key) > ? AND token(partition key) <= ?` queries, `concurrency` of them at a time. Ranges
+        whose rows have been written are checkpointed in the state, so a rerun with the same arguments only reads
+        the remaining ones.
+
+        Args:
+            hosts (str): Comma-separated list of Cassandra hosts.
+            keyspace (str): The Cassandra keyspace to use.
+            table (str): The table to read.
+            columns (str): The select list. Defaults to "*".
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+            ranges (Optional[int]): The smallest number of token ranges. Defaults to the number of tokens of the ring,
+                and at least 4 ranges per concurrent query.
+            concurrency (int): The largest number of ranges queried at once. Defaults to 16.
+
+        Raises:
+            Exception: If unable to connect to the Cassandra cluster or execute the query.
+        """
+        # Initialize Cassandra connection
+        cluster = Cluster(contact_points=hosts.split(","))
+        session = cluster.connect(keyspace)
+        session.row_factory = dict_factory
+
+        try:
+            metadata = cluster.metadata
+            partition_key = [column.name for column in metadata.keyspaces[keyspace].tables[table].partition_key]
+            ring_size = len(metadata.token_map.ring) if metadata.token_map and metadata.token_map.ring else 1
+            token_range_list = cluster_token_ranges(session, ranges or max(ring_size, 4 * concurrency))
+
+            processed_rows = scan_token_ranges(
+                session,
+                table,
+                partition_key,
+                token_range_list,
+                self.output,
+                self.top_level_arguments,
+                self.state,
+                checkpoint_key("Cassandra", hosts, keyspace, table, columns, len(token_range_list)),
+                columns=columns,
+                page_size=page_size,
+                concurrency=concurrency,
+            )
 
             # Update the state
             current_state: Dict[str, Any] = self.state.get_state(self.id) or {
@@ -16,6 +16,8 @@
 import azure.cosmos.cosmos_client as cosmos_client
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class CosmosDB(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -79,6 +81,9 @@ class CosmosDB(Spout):
         # Initialize Cosmos DB client
         client = cosmos_client.CosmosClient(endpoint, {"masterKey": "my_master_key"})
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             # Connect to the database and collection
             database = client.get_database_client(database)  # type: ignore
@@ -102,8 +107,8 @@ class CosmosDB(Spout):
                 if not response:
                     break
 
-                # Save the batch of documents to a file
-                self.output.save(response)
+                # Buffer the batch of documents
+                buffer.extend(response)
 
                 # Update the number of processed documents
                 processed_documents += len(response)
@@ -112,6 +117,9 @@ class CosmosDB(Spout):
                 # Get the continuation token
                 continuation_token = response["_continuation_token"]
 
+            # Flush the remaining buffered rows
+            buffer.flush()
+
             # Update the state
             current_state = self.state.get_state(self.id) or {
                 "success_count": 0,
@@ -19,6 +19,8 @@ from couchbase.auth import PasswordAuthenticator
 from couchbase.cluster import Cluster, ClusterOptions
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class Couchbase(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs: Any) -> None:
@@ -96,19 +98,25 @@ class Couchbase(Spout):
         bucket = cluster.bucket(bucket_name)
         collection = bucket.default_collection()
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             # Execute the query
             result = cluster.query(query)
             processed_docs = 0
 
             for row in result.rows():
-                # Save the fetched document to a file
-                self.output.save(row)
+                # Buffer the fetched document
+                buffer.add(row)
 
                 # Update the number of processed documents
                 processed_docs += 1
                 self.log.debug(f"Processed document {processed_docs}")
 
+            # Flush the remaining buffered rows
+            buffer.flush()
+
             # Update the state
             current_state: Dict[str, Any] = self.state.get_state(self.id) or {
                 "success_count": 0,
@@ -0,0 +1,689 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import importlib
+import logging
+import multiprocessing
+import json
+import os
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from geniusrise import BatchOutput, State
+
+from geniusrise_databases.buffered_output import BufferedOutput
+
+# A picklable description of how to open a DB-API connection: the driver module name and the positional and
+# keyword arguments of its `connect` function. Worker processes use it to open their own connections.
+ConnectSpec = Tuple[str, Sequence[Any], Dict[str, Any]]
+
+log = logging.getLogger(__name__)
+
+
+def connect(spec: ConnectSpec) -> Any:
+    """
+    Open a DB-API connection from a connect spec.
+
+    Args:
+        spec (ConnectSpec): The driver module name and the arguments of its `connect` function.
+
+    Returns:
+        Any: The connection.
+    """
+    driver, args, kwargs = spec
+    return importlib.import_module(driver).connect(*args, **kwargs)
+
+
+def bind(paramstyle: str, values: Sequence[Any]) -> Tuple[List[str], Any]:
+    """
+    Build the placeholders and the parameters for a list of values in the paramstyle of a driver.
+
+    Args:
+        paramstyle (str): The DB-API paramstyle of the driver.
+        values (Sequence[Any]): The values to bind.
+
+    Returns:
+        Tuple[List[str], Any]: The placeholder of each value and the parameters to pass to `execute`.
+
+    Raises:
+        ValueError: If the paramstyle is not supported.
+    """
+    if paramstyle in ("format", "pyformat"):
+        return ["%s"] * len(values), tuple(values)
+    elif paramstyle == "qmark":
+        return ["?"] * len(values), tuple(values)
+    elif paramstyle == "numeric":
+        return [f":{i + 1}" for i in range(len(values))], tuple(values)
+    elif paramstyle == "named":
+        return [f":p{i}" for i in range(len(values))], {f"p{i}": v for i, v in enumerate(values)}
+    else:
+        raise ValueError(f"Invalid paramstyle: {paramstyle}")
+
+
+def _interpolate(low: Any, high: Any, i: int, n: int) -> Any:
+    if isinstance(low, int):
+        return low + (high - low) * i // n
+    try:
+        return low + (high - low) * i / n
+    except TypeError:
+        raise ValueError(f"Cannot interpolate values of type {type(low).__name__}, use split=ntile") from None
+
+
+def split_points(cursor: Any, table: str, column: str, partitions: int, split: str = "minmax") -> List[Any]:
+    """
+    Compute the values that split a table into ranges of a column.
+
+    "minmax" reads the minimum and maximum of the column and splits that interval evenly, which is cheap but
+    assumes the values are evenly distributed. It works for numeric, date and timestamp columns. "ntile" uses the
+    `NTILE` window function to split the rows into equally sized buckets, which handles skewed and non-numeric
+    columns at the cost of sorting the column once.
+
+    Args:
+        cursor (Any): A DB-API cursor.
+        table (str): The table to split.
+        column (str): The column to split on.
+        partitions (int): The number of ranges.
+        split (str): "minmax" or "ntile". Defaults to "minmax".
+
+    Returns:
+        List[Any]: The sorted, distinct split points, at most partitions - 1 of them.
+
+    Raises:
+        ValueError: If the split method is not supported.
+    """
+    if split == "minmax":
+        cursor.execute(f"SELECT MIN({column}), MAX({column}) FROM {table}")
+        low, high = cursor.fetchone()
+        if low is None or low == high:
+            return []
+        points = [_interpolate(low, high, i, partitions) for i in range(1, partitions)]
+    elif split == "ntile":
+        cursor.execute(
+            f"SELECT MAX(split_value) FROM ("
+            f"SELECT {column} AS split_value, NTILE({partitions}) OVER (ORDER BY {column}) AS split_bucket "
+            f"FROM {table} WHERE {column} IS NOT NULL"
+            f") split_buckets GROUP BY split_bucket"
+        )
+        points = [row[0] for row in cursor.fetchall()][:-1]
+    else:
+        raise ValueError(f"Invalid split method: {split}")
+
+    return sorted(set(points))
+
+
+def range_queries(
+    table: str,
+    column: str,
+    points: List[Any],
+    paramstyle: str,
+    columns: str = "*",
+) -> List[Tuple[str, Any]]:
+    """
+    Build one query per range between consecutive split points.
+
+    The ranges are `column <= p1`, `p1 < column <= p2`, ..., `column > pN`, so every row falls into exactly one of
+    them. Rows with a NULL split column are read with the first range.
+
+    Args:
+        table (str): The table to read.
+        column (str): The column the table is split on.
+        points (List[Any]): The sorted split points.
+        paramstyle (str): The DB-API paramstyle of the driver.
+        columns (str): The select list. Defaults to "*".
+
+    Returns:
+        List[Tuple[str, Any]]: The statement and the parameters of each range.
+    """
+    select = f"SELECT {columns} FROM {table}"
+    if not points:
+        return [(select, ())]
+
+    queries = []
+    for i in range(len(points) + 1):
+        if i == 0:
+            placeholders, params = bind(paramstyle, [points[0]])
+            where = f"{column} <= {placeholders[0]} OR {column} IS NULL"
+        elif i == len(points):
+            placeholders, params = bind(paramstyle, [points[-1]])
+            where = f"{column} > {placeholders[0]}"
+        else:
+            placeholders, params = bind(paramstyle, [points[i - 1], points[i]])
+            where = f"{column} > {placeholders[0]} AND {column} <= {placeholders[1]}"
+        queries.append((f"{select} WHERE {where}", params))
+    return queries
+
+
+def extract_range(
+    spec: ConnectSpec,
+    statement: str,
+    params: Any,
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    page_size: int = 1000,
+) -> int:
+    """
+    Read one range on its own connection and write it to its own output files.
+
+    Args:
+        spec (ConnectSpec): How to open the connection.
+        statement (str): The range query.
+        params (Any): The parameters of the range query.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+    Returns:
+        int: The number of rows read.
+    """
+    connection = connect(spec)
+    buffer = BufferedOutput.from_arguments(output, buffer_arguments)
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute(statement, params)
+        columns = [column[0] for column in cursor.description]
+
+        while True:
+            rows = cursor.fetchmany(page_size)
+            if not rows:
+                break
+            buffer.extend(dict(zip(columns, row)) for row in rows)
+
+        buffer.flush()
+        cursor.close()
+        return buffer.rows_written
+
+    finally:
+        connection.close()
+
+
+def extract_partitioned(
+    spec: ConnectSpec,
+    table: str,
+    split_column: str,
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    partitions: Optional[int] = None,
+    workers: Optional[int] = None,
+    split: str = "minmax",
+    page_size: int = 1000,
+) -> int:
+    """
+    Read a table as concurrent ranges of a split column, each on its own connection in a worker process.
+
+    Args:
+        spec (ConnectSpec): How to open a connection.
+        table (str): The table to read.
+        split_column (str): The column to split the table on, ideally the indexed primary key.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        partitions (Optional[int]): The number of ranges. Defaults to the number of CPUs.
+        workers (Optional[int]): The number of worker processes. Defaults to the number of ranges.
+        split (str): How to compute the ranges, "minmax" or "ntile". Defaults to "minmax".
+        page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+    Returns:
+        int: The number of rows read.
+    """
+    partitions = partitions or os.cpu_count() or 1
+    paramstyle = importlib.import_module(spec[0]).paramstyle
+
+    connection = connect(spec)
+    try:
+        cursor = connection.cursor()
+        points = split_points(cursor, table, split_column, partitions, split)
+        cursor.close()
+    finally:
+        connection.close()
+
+    queries = range_queries(table, split_column, points, paramstyle)
+    log.info(f"Reading {table} as {len(queries)} ranges of {split_column}")
+
+    processed_rows = 0
+    executor = ProcessPoolExecutor(
+        max_workers=min(workers or len(queries), len(queries)),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    try:
+        futures = [
+            executor.submit(extract_range, spec, statement, params, output, buffer_arguments, page_size)
+            for statement, params in queries
+        ]
+        for future in as_completed(futures):
+            processed_rows += future.result()
+            log.info(f"Total rows processed: {processed_rows}")
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+    return processed_rows
+
+
+def checkpoint_key(*parts: Any) -> str:
+    """
+    Build a state key that is stable across runs of the same extraction.
+
+    Args:
+        *parts (Any): The values identifying the extraction, e.g. the spout class, host, database and query.
+
+    Returns:
+        str: The state key.
+    """
+    return "checkpoint-" + hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def serializable(value: Any) -> Any:
+    """
+    Convert a key value into something every state backend can store.
+
+    Values that are not JSON types are stored as strings, which the databases cast back when they are bound as
+    parameters and compared to the column. `restore` turns dates, timestamps and decimals back into their types.
+
+    Args:
+        value (Any): The key value.
+
+    Returns:
+        Any: The storable value.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    elif hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def column_name(columns: List[str], column: str) -> str:
+    """
+    Find a column in the column names of a result set, ignoring case and any table qualifier.
+
+    Args:
+        columns (List[str]): The column names of the result set.
+        column (str): The column to find.
+
+    Returns:
+        str: The matching column name.
+
+    Raises:
+        ValueError: If the column is not in the result set.
+    """
+    wanted = column.split(".")[-1].strip('"`[]').lower()
+    for name in columns:
+        if name.lower() == wanted:
+            return name
+    raise ValueError(f"Column {column} is not in the result set")
+
+
+def select_query(
+    table: str,
+    columns: Optional[str] = None,
+    where: Optional[str] = None,
+    limit: Optional[int] = None,
+    dialect: str = "limit",
+) -> str:
+    """
+    Build the query reading a table, with the projection, filter and row limit pushed down to the database.
+
+    Args:
+        table (str): The table to read.
+        columns (Optional[str]): Comma-separated list of the columns to read. Defaults to all columns.
+        where (Optional[str]): A filter the rows are restricted to, e.g. "country = 'US'". Defaults to all rows.
+        limit (Optional[int]): The largest number of rows to read. Defaults to no limit.
+        dialect (str): How the database limits rows: "limit" (LIMIT n), "fetch_first" (FETCH FIRST n ROWS ONLY) or
+            "top" (SELECT TOP n). Defaults to "limit".
+
+    Returns:
+        str: The query.
+
+    Raises:
+        ValueError: If the dialect is not supported.
+    """
+    if dialect not in ("limit", "fetch_first", "top"):
+        raise ValueError(f"Invalid dialect: {dialect}")
+
+    query = f"SELECT {columns or '*'} FROM {table}"
+    if limit is not None and dialect == "top":
+        query = f"SELECT TOP {int(limit)} {columns or '*'} FROM {table}"
+    if where:
+        query += f" WHERE {where}"
+    if limit is not None and dialect == "limit":
+        query += f" LIMIT {int(limit)}"
+    elif limit is not None and dialect == "fetch_first":
+        query += f" FETCH FIRST {int(limit)} ROWS ONLY"
+    return query
+
+
+def keyset_query(
+    query: str,
+    order_column: str,
+    paramstyle: str,
+    page_size: int,
+    after: Any = None,
+    dialect: str = "limit",
+) -> Tuple[str, Any]:
+    """
+    Build the query for one keyset page: the rows of `query` with `order_column` after a key, in key order.
+
+    Args:
+        query (str): The query to page through.
+        order_column (str): The unique column to order and page by, a table qualifier is ignored.
+        paramstyle (str): The DB-API paramstyle of the driver.
+        page_size (int): The number of rows per page.
+        after (Any): The last key of the previous page, None for the first page. Defaults to None.
+        dialect (str): How the database limits rows: "limit" (LIMIT n), "fetch_first" (FETCH FIRST n ROWS ONLY),
+            "offset_fetch" (OFFSET 0 ROWS FETCH NEXT n ROWS ONLY) or "top" (SELECT TOP n). Defaults to "limit".
+
+    Returns:
+        Tuple[str, Any]: The statement and its parameters.
+
+    Raises:
+        ValueError: If the dialect is not supported.
+    """
+    # The outer query only sees the bare column name
+    order_column = order_column.split(".")[-1]
+
+    # Drivers with format paramstyles apply %-formatting whenever parameters are passed, even empty ones
+    if paramstyle in ("format", "pyformat"):
+        query = query.replace("%", "%%")
+
+    params: Any = ()
+    where = ""
+    if after is not None:
+        placeholders, params = bind(paramstyle, [after])
+        where = f" WHERE {order_column} > {placeholders[0]}"
+
+    if dialect == "limit":
+        return f"SELECT * FROM ({query}) keyset_q{where} ORDER BY {order_column} LIMIT {page_size}", params
+    elif dialect == "fetch_first":
+        return (
+            f"SELECT * FROM ({query}) keyset_q{where} ORDER BY {order_column} FETCH FIRST {page_size} ROWS ONLY",
+            params,
+        )
+    elif dialect == "offset_fetch":
+        return (
+            f"SELECT * FROM ({query}) keyset_q{where} ORDER BY {order_column} "
+            f"OFFSET 0 ROWS FETCH NEXT {page_size} ROWS ONLY",
+            params,
+        )
+    elif dialect == "top":
+        return f"SELECT TOP {page_size} * FROM ({query}) keyset_q{where} ORDER BY {order_column}", params
+    else:
+        raise ValueError(f"Invalid dialect: {dialect}")
+
+
+def extract_keyset(
+    spec: ConnectSpec,
+    query: str,
+    order_column: str,
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    state: State,
+    key: str,
+    page_size: int = 1000,
+    dialect: str = "limit",
+) -> int:
+    """
+    Read a query in keyset pages, checkpointing the last key of every written file and resuming after it.
+
+    The checkpoint only moves when a file is written, so a rerun after a failure reads again exactly the rows that
+    had not reached the output yet. It is cleared once the whole query has been read.
+
+    Args:
+        spec (ConnectSpec): How to open the connection.
+        query (str): The query to read.
+        order_column (str): The unique column to order and page by.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        state (State): The state the checkpoint is kept in.
+        key (str): The state key of the checkpoint.
+        page_size (int): The number of rows per page. Defaults to 1000.
+        dialect (str): How the database limits rows, see `keyset_query`. Defaults to "limit".
+
+    Returns:
+        int: The number of rows read in this run.
+    """
+    paramstyle = importlib.import_module(spec[0]).paramstyle
+    checkpoint = state.get_state(key) or {}
+    after = restore(checkpoint.get("watermark"), checkpoint.get("temporal", False))
+    if after is not None:
+        log.info(f"Resuming after {order_column} = {after}")
+
+    name = None
+
+    def save(filename: str, row: Dict[str, Any]) -> None:
+        value = row[name]
+        state.set_state(
+            key,
+            {"watermark": serializable(value), "temporal": isinstance(value, (date, datetime)), "file": filename},
+        )
+
+    connection = connect(spec)
+    buffer = BufferedOutput.from_arguments(output, buffer_arguments, on_flush=save)
+    processed_rows = 0
+
+    try:
+        cursor = connection.cursor()
+        while True:
+            statement, params = keyset_query(query, order_column, paramstyle, page_size, after, dialect)
+            cursor.execute(statement, params)
+            columns = [column[0] for column in cursor.description]
+            name = column_name(columns, order_column)
+
+            rows = cursor.fetchall()
+            if not rows:
+                break
+
+            buffer.extend(dict(zip(columns, row)) for row in rows)
+            after = rows[-1][columns.index(name)]
+
+            processed_rows += len(rows)
+            log.info(f"Total rows processed: {processed_rows}")
+
+        buffer.flush()
+        cursor.close()
+
+        # The whole query has been read, the next run starts from the beginning
+        state.set_state(key, {"watermark": None})
+        return processed_rows
+
+    finally:
+        connection.close()
+
+
+def restore(value: Any, temporal: bool, decimal: bool = False) -> Any:
+    """
+    Convert a stored key value back into what the driver binds as a parameter.
+
+    Args:
+        value (Any): The stored value.
+        temporal (bool): Whether the value was a date or a timestamp.
+        decimal (bool): Whether the value was a decimal. Defaults to False.
+
+    Returns:
+        Any: The value to bind.
+    """
+    if temporal and isinstance(value, str):
+        # Dates are stored as YYYY-MM-DD, timestamps always carry a time
+        return date.fromisoformat(value) if len(value) == 10 else datetime.fromisoformat(value)
+    elif decimal and isinstance(value, str):
+        return Decimal(value)
+    return value
+
+
+def shift(value: Any, lookback: float) -> Any:
+    """
+    Move a high-water mark back by a lookback window.
+
+    Args:
+        value (Any): The high-water mark, a number, a date or a timestamp.
+        lookback (float): The window, in seconds for dates and timestamps and in column units for numbers.
+
+    Returns:
+        Any: The moved high-water mark.
+
+    Raises:
+        ValueError: If the high-water mark cannot be moved.
+    """
+    if not lookback:
+        return value
+    elif isinstance(value, (date, datetime)):
+        return value - timedelta(seconds=lookback)
+    elif isinstance(value, Decimal):
+        return value - Decimal(str(lookback))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value - lookback
+    raise ValueError(f"Cannot apply a lookback to a high-water mark of type {type(value).__name__}")
+
+
+def row_digest(row: Sequence[Any]) -> str:
+    """
+    Hash a row to recognize it when it is read again.
+
+    Args:
+        row (Sequence[Any]): The column values of the row.
+
+    Returns:
+        str: The digest of the row.
+    """
+    return hashlib.sha1(json.dumps([serializable(value) for value in row]).encode()).hexdigest()
+
+
+def incremental_query(query: str, column: str, paramstyle: str, low: Any, high: Any) -> Tuple[str, Any]:
+    """
+    Build the query for the rows of `query` with `column` in `[low, high]`.
+
+    Args:
+        query (str): The query to read.
+        column (str): The change-tracking column, a table qualifier is ignored.
+        paramstyle (str): The DB-API paramstyle of the driver.
+        low (Any): The inclusive lower bound, None to read from the beginning.
+        high (Any): The inclusive upper bound.
+
+    Returns:
+        Tuple[str, Any]: The statement and its parameters.
+    """
+    column = column.split(".")[-1]
+    if paramstyle in ("format", "pyformat"):
+        query = query.replace("%", "%%")
+
+    if low is None:
+        placeholders, params = bind(paramstyle, [high])
+        where = f"{column} <= {placeholders[0]}"
+    else:
+        placeholders, params = bind(paramstyle, [low, high])
+        where = f"{column} >= {placeholders[0]} AND {column} <= {placeholders[1]}"
+    return f"SELECT * FROM ({query}) incremental_q WHERE {where}", params
+
+
+def extract_incremental(
+    spec: ConnectSpec,
+    query: str,
+    column: str,
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    state: State,
+    key: str,
+    lookback: float = 0,
+    page_size: int = 1000,
+) -> int:
+    """
+    Read the rows of a query that changed since the last run, tracked by the high-water mark of a column.
+
+    Every run reads the rows from the stored high-water mark up to and including the current maximum of the column,
+    and then stores that maximum as the new high-water mark, so the latest rows are delivered even when no newer row
+    follows, and rows committed later with the same value as the maximum are not lost. A `lookback` window moves the
+    lower bound back to also catch rows that are committed late with an older value.
+
+    The bounds overlap between runs, so the checkpoint also keeps a digest of every row read in the overlap of the
+    next run, and rows that were already delivered unchanged are skipped. An updated row is delivered again. Rows
+    that are exact duplicates of each other are only delivered by the run that first reads them.
+
+    The high-water mark is only stored once all rows have been written, so a failed run is read again by the next
+    one. Rows with a NULL change-tracking column are never read.
+
+    Args:
+        spec (ConnectSpec): How to open the connection.
+        query (str): The query to read.
+        column (str): The change-tracking column, e.g. an updated_at timestamp or a sequence number.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        state (State): The state the high-water mark is kept in.
+        key (str): The state key of the high-water mark.
+        lookback (float): How far to move the lower bound back, in seconds for dates and timestamps and in column
+            units for numbers. Defaults to 0.
+        page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+    Returns:
+        int: The number of rows read in this run.
+    """
+    paramstyle = importlib.import_module(spec[0]).paramstyle
+    checkpoint = state.get_state(key) or {}
+    low = restore(checkpoint.get("watermark"), checkpoint.get("temporal", False), checkpoint.get("decimal", False))
+    if low is not None:
+        low = shift(low, lookback)
+        log.info(f"Reading rows with {column} >= {low}")
+    seen = set(checkpoint.get("seen", []))
+
+    bare = column.split(".")[-1]
+    connection = connect(spec)
+    buffer = BufferedOutput.from_arguments(output, buffer_arguments)
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT MAX({bare}) FROM ({query}) incremental_q")
+        (high,) = cursor.fetchone()
+        if high is None:
+            log.info("The query returned no rows")
+            return 0
+
+        statement, params = incremental_query(query, column, paramstyle, low, high)
+        cursor.execute(statement, params)
+        columns = [column[0] for column in cursor.description]
+        index = columns.index(column_name(columns, column))
+
+        # The rows the next run reads again, from its lower bound up to the high-water mark
+        overlap = shift(high, lookback)
+        overlap_seen = []
+
+        while True:
+            rows = cursor.fetchmany(page_size)
+            if not rows:
+                break
+            for row in rows:
+                digest = row_digest(row)
+                if row[index] >= overlap:
+                    overlap_seen.append(digest)
+                if digest not in seen:
+                    buffer.add(dict(zip(columns, row)))
+            log.info(f"Total rows processed: {buffer.rows_written + len(buffer)}")
+
+        buffer.flush()
+        cursor.close()
+
+        # The next run reads the rows from the high-water mark
+        state.set_state(
+            key,
+            {
+                "watermark": serializable(high),
+                "temporal": isinstance(high, (date, datetime)),
+                "decimal": isinstance(high, Decimal),
+                "seen": overlap_seen,
+            },
+        )
+        return buffer.rows_written
+
+    finally:
+        connection.close()
@@ -13,9 +13,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import Optional
+
 from geniusrise import BatchOutput, Spout, State
 from pymongo import MongoClient
 
+from geniusrise_databases.buffered_output import BufferedOutput
+from geniusrise_databases.mongodb import export_raw, parse_query
+
 
 class DocumentDB(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -96,18 +101,24 @@ class DocumentDB(Spout):
         db = connection[database]
         coll = db[collection]
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             cursor = coll.find(eval(query)).limit(page_size)
             processed_docs = 0
 
             for doc in cursor:
-                # Save the fetched document to a file
-                self.output.save([doc])
+                # Buffer the fetched document
+                buffer.add(doc)
 
                 # Update the number of processed documents
                 processed_docs += 1
                 self.log.info(f"Total documents processed: {processed_docs}")
 
+            # Flush the remaining buffered rows
+            buffer.flush()
+
             # Update the state
             current_state = self.state.get_state(self.id) or {
                 "success_count": 0,
@@ -135,3 +146,84 @@ class DocumentDB(Spout):
 
         finally:
             connection.close()
+
+    def fetch_raw(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        collection: str,
+        query: Optional[str] = None,
+        fields: Optional[str] = None,
+        raw_format: str = "bson",
+        file_size: int = 256 * 1024 * 1024,
+        page_size: int = 1000,
+    ):
+        """
+        📦 Export a DocumentDB collection as raw BSON files.
+
+        The documents are written as the BSON bytes received from the server, without being decoded into Python
+        objects and encoded again.
+
+        Args:
+            host (str): The DocumentDB host.
+            port (int): The DocumentDB port.
+            user (str): The DocumentDB user.
+            password (str): The DocumentDB password.
+            database (str): The DocumentDB database name.
+            collection (str): The DocumentDB collection name.
+            query (Optional[str]): A filter as MongoDB Extended JSON. Defaults to all documents.
+            fields (Optional[str]): Comma-separated list of the fields to export, projected on the server. Defaults
+                to all fields.
+            raw_format (str): "bson" for concatenated documents, like mongodump, or "length_prefixed" for documents
+                preceded by their 4-byte big-endian size. Defaults to "bson".
+            file_size (int): The size after which a new file is started. Defaults to 256 MiB.
+            page_size (int): The number of documents to fetch per page. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the DocumentDB server or execute the query.
+        """
+        # Initialize DocumentDB connection
+        connection = MongoClient(host, port, username=user, password=password)
+        coll = connection[database][collection]
+
+        try:
+            processed_docs, bytes_written = export_raw(
+                coll,
+                parse_query(query),
+                self.output,
+                fields=fields,
+                raw_format=raw_format,
+                file_size=file_size,
+                batch_size=page_size,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_docs": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_docs"] = processed_docs
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of documents processed
+            self.log.info(f"Total documents processed: {processed_docs} ({bytes_written} bytes)")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from DocumentDB: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_docs": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+        finally:
+            connection.close()
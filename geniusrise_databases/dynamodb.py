@@ -13,11 +13,872 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Dict
+import base64
+import gzip
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import boto3
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.config import Config
+from botocore.exceptions import ClientError, HTTPClientError
+from botocore.exceptions import ConnectionError as BotoConnectionError
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+from geniusrise_databases.dbapi import checkpoint_key
+
+log = logging.getLogger(__name__)
+
+# DynamoDB recommends one scan segment per 2 GB of table data
+SEGMENT_BYTES = 2 * 1024 * 1024 * 1024
+
+# Errors after which a governed scan backs off and retries the request
+THROTTLING_ERRORS = {
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+    "InternalServerError",
+    "ServiceUnavailable",
+}
+
+# Network errors after which a governed scan retries the request, botocore does not retry them for governed clients
+TRANSIENT_ERRORS = (BotoConnectionError, HTTPClientError)
+
+
+def number(value: str) -> Any:
+    """
+    Convert a DynamoDB number into an int, or a float if it has a fraction or an exponent.
+
+    Args:
+        value (str): The number as sent by DynamoDB.
+
+    Returns:
+        Any: The number.
+    """
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def binary(value: bytes) -> str:
+    """
+    Convert a DynamoDB binary value into base64, as it is sent by DynamoDB.
+
+    Args:
+        value (bytes): The binary value.
+
+    Returns:
+        str: The value in base64.
+    """
+    return base64.b64encode(value).decode()
+
+
+_DESERIALIZERS: Dict[str, Callable[[Any], Any]] = {
+    "S": lambda value: value,
+    "N": number,
+    "B": binary,
+    "BOOL": lambda value: value,
+    "NULL": lambda value: None,
+    "SS": list,
+    "NS": lambda value: [number(v) for v in value],
+    "BS": lambda value: [binary(v) for v in value],
+    "M": lambda value: {name: deserialize(attribute) for name, attribute in value.items()},
+    "L": lambda value: [deserialize(attribute) for attribute in value],
+}
+
+
+def deserialize(attribute: Dict[str, Any]) -> Any:
+    """
+    Convert a DynamoDB attribute value into a plain JSON value.
+
+    Unlike boto3's `TypeDeserializer`, numbers become ints and floats instead of Decimals, binary values become
+    base64 strings, and sets become lists.
+
+    Args:
+        attribute (Dict[str, Any]): The attribute value, e.g. {"N": "42"}.
+
+    Returns:
+        Any: The value.
+    """
+    ((kind, value),) = attribute.items()
+    return _DESERIALIZERS[kind](value)
+
+
+def item_converter(item_format: str = "native") -> Callable[[Dict[str, Any]], Any]:
+    """
+    Select how the items returned by the low-level client are converted before they are saved.
+
+    Args:
+        item_format (str): "native" to convert items like the boto3 resource API, with Decimal numbers, "plain" to
+            convert them with the faster `deserialize`, or "raw" to save the DynamoDB JSON as it was received.
+            Defaults to "native".
+
+    Returns:
+        Callable[[Dict[str, Any]], Any]: The converter.
+
+    Raises:
+        ValueError: If the item format is not supported.
+    """
+    if item_format == "native":
+        deserializer = TypeDeserializer()
+        return lambda item: {name: deserializer.deserialize(attribute) for name, attribute in item.items()}
+    elif item_format == "plain":
+        return lambda item: {name: deserialize(attribute) for name, attribute in item.items()}
+    elif item_format == "raw":
+        return lambda item: item
+    else:
+        raise ValueError(f"Invalid item format: {item_format}")
+
+
+def projection_arguments(projection: Optional[str], key_names: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Build the `ProjectionExpression` of a scan from a list of attributes.
+
+    Every attribute name is passed as an expression attribute name, so that reserved words can be projected.
+
+    Args:
+        projection (Optional[str]): Comma-separated list of attributes or nested paths, e.g. "id,title,info.rating".
+        key_names (Optional[List[str]]): Attributes that are always projected, e.g. the key of the table.
+
+    Returns:
+        Dict[str, Any]: The scan arguments, empty to return all attributes.
+    """
+    if not projection:
+        return {}
+
+    paths = [path.strip() for path in projection.split(",") if path.strip()]
+    paths += [name for name in key_names or [] if name not in paths]
+
+    names: Dict[str, str] = {}
+    expressions = []
+    for path in paths:
+        parts = []
+        for part in path.split("."):
+            placeholder = next((p for p, n in names.items() if n == part), f"#p{len(names)}")
+            names[placeholder] = part
+            parts.append(placeholder)
+        expressions.append(".".join(parts))
+    return {"ProjectionExpression": ", ".join(expressions), "ExpressionAttributeNames": names}
+
+
+class ThroughputGovernor:
+    """
+    Paces the scan requests of an export to a target rate of consumed read capacity units.
+
+    The capacity consumed by every request, as reported by DynamoDB, is paid from a token bucket refilled at the
+    target rate, and requests wait while the bucket is empty. The `Limit` of every request is sized from the measured
+    cost of an item so that one request does not overdraw the bucket. The number of concurrent requests is halved
+    whenever DynamoDB throttles, and grown back by one after a run of unthrottled requests.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        max_limit: int = 1000,
+        max_concurrency: int = 1,
+        burst_seconds: float = 1.0,
+        max_attempts: int = 10,
+    ) -> None:
+        """
+        Initialize a new throughput governor.
+
+        Args:
+            rate (float): The target rate in read capacity units per second.
+            max_limit (int): The largest `Limit` of a request. Defaults to 1000.
+            max_concurrency (int): The largest number of concurrent requests. Defaults to 1.
+            burst_seconds (float): How many seconds of capacity can be used at once. Defaults to 1.
+            max_attempts (int): How often a throttled request is tried before failing. Defaults to 10.
+        """
+        self.rate = rate
+        self.capacity = rate * burst_seconds
+        self.max_limit = max_limit
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+
+        self.tokens = self.capacity
+        self.concurrency = max_concurrency
+        self.active = 0
+        self.successes = 0
+        self.rcu_per_item: Optional[float] = None
+
+        self._condition = threading.Condition()
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def limit(self) -> int:
+        """
+        Size the `Limit` of the next request from the measured cost of an item.
+
+        Returns:
+            int: The number of items the next request may evaluate.
+        """
+        budget = max(self.capacity / self.concurrency, 0.5)
+        # Until an item has been measured, assume the cheapest read, an eventually consistent read of up to 4 KB
+        per_item = self.rcu_per_item or 0.5
+        return max(1, min(self.max_limit, int(budget / per_item)))
+
+    def acquire(self) -> int:
+        """
+        Wait until a request may be sent, i.e. the bucket has tokens and fewer requests than allowed are running.
+
+        Returns:
+            int: The `Limit` of the request.
+        """
+        with self._condition:
+            while True:
+                self._refill()
+                if self.tokens > 0 and self.active < self.concurrency:
+                    self.active += 1
+                    return self.limit()
+                self._condition.wait(max(-self.tokens / self.rate, 0.001) if self.tokens <= 0 else None)
+
+    def release(self, consumed: float, scanned: int) -> None:
+        """
+        Pay for a completed request.
+
+        Args:
+            consumed (float): The read capacity units the request consumed.
+            scanned (int): The number of items the request evaluated.
+        """
+        with self._condition:
+            self.active -= 1
+            self._refill()
+            self.tokens -= consumed
+
+            if scanned:
+                cost = consumed / scanned
+                self.rcu_per_item = cost if self.rcu_per_item is None else 0.8 * self.rcu_per_item + 0.2 * cost
+
+            self.successes += 1
+            if self.concurrency < self.max_concurrency and self.successes >= 10 * self.concurrency:
+                self.concurrency += 1
+                self.successes = 0
+                log.info(f"Raised the scan concurrency to {self.concurrency}")
+
+            self._condition.notify_all()
+
+    def cancel(self) -> None:
+        """
+        Give up the slot of a request that failed without consuming capacity.
+        """
+        with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+    def throttled(self) -> None:
+        """
+        Back off after a throttled request, by halving the concurrency and emptying the bucket for a burst.
+        """
+        with self._condition:
+            self.active -= 1
+            self.concurrency = max(1, self.concurrency // 2)
+            self.successes = 0
+            self._refill()
+            self.tokens = min(self.tokens, 0.0) - self.capacity
+            log.warning(f"Throttled by DynamoDB, lowered the scan concurrency to {self.concurrency}")
+
+            self._condition.notify_all()
+
+    def scan(self, client: Any, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Send a scan request at the governed pace, retrying it when it is throttled or the connection fails.
+
+        Connection failures are retried with an exponential backoff with jitter. The slot of the request is given back
+        however the request ends.
+
+        Args:
+            client (Any): The DynamoDB client.
+            **kwargs: The scan arguments.
+
+        Returns:
+            Dict[str, Any]: The scan response.
+
+        Raises:
+            ClientError: If the request fails, or is still throttled after `max_attempts` attempts.
+            BotoCoreError: If the connection still fails after `max_attempts` attempts.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            limit = min(self.acquire(), kwargs.get("Limit", self.max_limit))
+            response = None
+            throttled = False
+            try:
+                response = client.scan(**dict(kwargs, Limit=limit, ReturnConsumedCapacity="TOTAL"))
+                return response
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") not in THROTTLING_ERRORS or attempt >= self.max_attempts:
+                    raise
+                throttled = True
+            except TRANSIENT_ERRORS as e:
+                if attempt >= self.max_attempts:
+                    raise
+                log.warning(f"Scan request failed, retrying: {e}")
+            finally:
+                if response is not None:
+                    self.release(
+                        response.get("ConsumedCapacity", {}).get("CapacityUnits", 0), response.get("ScannedCount", 0)
+                    )
+                elif throttled:
+                    self.throttled()
+                else:
+                    self.cancel()
+
+            if not throttled:
+                time.sleep(random.uniform(0, min(20.0, 0.1 * 2**attempt)))
+
+
+def make_governor(
+    description: Dict[str, Any],
+    read_fraction: Optional[float] = None,
+    max_rcu: Optional[float] = None,
+    page_size: int = 1000,
+    workers: int = 1,
+) -> Optional[ThroughputGovernor]:
+    """
+    Create the throughput governor of a scan, if it is limited.
+
+    Args:
+        description (Dict[str, Any]): The table description, as returned by `describe_table`.
+        read_fraction (Optional[float]): The fraction of the provisioned read capacity of the table to use.
+        max_rcu (Optional[float]): The largest number of read capacity units per second to use.
+        page_size (int): The largest `Limit` of a request. Defaults to 1000.
+        workers (int): The largest number of concurrent requests. Defaults to 1.
+
+    Returns:
+        Optional[ThroughputGovernor]: The governor, or None if the scan is not limited.
+
+    Raises:
+        ValueError: If a fraction is requested of a table without provisioned read capacity.
+    """
+    rates = []
+    if read_fraction:
+        provisioned = description.get("ProvisionedThroughput", {}).get("ReadCapacityUnits", 0)
+        if not provisioned:
+            raise ValueError("The table has no provisioned read capacity, use max_rcu to limit the scan")
+        rates.append(read_fraction * provisioned)
+    if max_rcu:
+        rates.append(max_rcu)
+    if not rates:
+        return None
+
+    log.info(f"Limiting the scan to {min(rates)} read capacity units per second")
+    return ThroughputGovernor(min(rates), max_limit=page_size, max_concurrency=workers)
+
+
+def scan_client(governor: Optional[ThroughputGovernor] = None, workers: int = 1) -> Any:
+    """
+    Create a DynamoDB client for a scan.
+
+    Args:
+        governor (Optional[ThroughputGovernor]): The governor of the scan. Governed clients leave retrying throttled
+            requests to the governor, instead of retrying them blindly. Defaults to None.
+        workers (int): The number of threads sharing the client. Defaults to 1.
+
+    Returns:
+        Any: The client.
+    """
+    config = Config(max_pool_connections=max(workers, 10))
+    if governor is not None:
+        config = config.merge(Config(retries={"total_max_attempts": 1}))
+    return boto3.client("dynamodb", config=config)
+
+
+def scan_pages(
+    client: Any,
+    governor: Optional[ThroughputGovernor] = None,
+    **kwargs: Any,
+) -> Iterator[Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    """
+    Page through a scan with the low-level client.
+
+    Args:
+        client (Any): The DynamoDB client.
+        governor (Optional[ThroughputGovernor]): Paces the requests, if the scan is limited. Defaults to None.
+        **kwargs: The scan arguments, e.g. TableName, Limit, Segment and ExclusiveStartKey.
+
+    Yields:
+        Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]: The items of every page, and the key to continue
+            after it, None after the last page.
+    """
+    while True:
+        response = client.scan(**kwargs) if governor is None else governor.scan(client, **kwargs)
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        yield response.get("Items", []), last_evaluated_key
+
+        if not last_evaluated_key:
+            break
+        kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+
+def dump_key(key: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a DynamoDB key into JSON that every state backend can store.
+
+    Args:
+        key (Dict[str, Any]): The key, as returned by the low-level client.
+
+    Returns:
+        Dict[str, Any]: The key in DynamoDB JSON, with binary values encoded as base64.
+    """
+    return {name: {"B": binary(attribute["B"])} if "B" in attribute else attribute for name, attribute in key.items()}
+
+
+def load_key(key: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a key stored by `dump_key` back into a key for the low-level client.
+
+    Args:
+        key (Dict[str, Any]): The stored key.
+
+    Returns:
+        Dict[str, Any]: The key.
+    """
+    return {
+        name: {"B": base64.b64decode(attribute["B"])} if "B" in attribute else attribute
+        for name, attribute in key.items()
+    }
+
+
+class SegmentCheckpoints:
+    """
+    Keeps the progress of the segments of a parallel scan in the state, under a single key.
+
+    Each segment is stored as the key of the last item it wrote to the output, or as done, along with the number of
+    segments the table was split into, which a resumed scan has to reuse.
+    """
+
+    def __init__(self, state: State, key: str) -> None:
+        """
+        Load the checkpoints of a parallel scan.
+
+        Args:
+            state (State): The state the checkpoints are kept in.
+            key (str): The state key of the checkpoints.
+        """
+        self.state = state
+        self.key = key
+        self.lock = threading.Lock()
+        stored = state.get_state(key) or {}
+        self.segments: Dict[str, Any] = dict(stored.get("segments") or {})
+        self.total_segments: Optional[int] = stored.get("total_segments") if self.segments else None
+
+    def get(self, segment: int) -> Dict[str, Any]:
+        """
+        Get the checkpoint of a segment.
+
+        Args:
+            segment (int): The segment.
+
+        Returns:
+            Dict[str, Any]: The checkpoint, with "done" and "last_key", empty if the segment was not started.
+        """
+        with self.lock:
+            return dict(self.segments.get(str(segment)) or {})
+
+    def set(self, segment: int, checkpoint: Dict[str, Any]) -> None:
+        """
+        Store the checkpoint of a segment.
+
+        Args:
+            segment (int): The segment.
+            checkpoint (Dict[str, Any]): The checkpoint.
+        """
+        with self.lock:
+            self.segments[str(segment)] = checkpoint
+            self.state.set_state(self.key, {"total_segments": self.total_segments, "segments": self.segments})
+
+    def clear(self) -> None:
+        """
+        Forget all checkpoints, once the whole scan has been read.
+        """
+        with self.lock:
+            self.segments = {}
+            self.total_segments = None
+            self.state.set_state(self.key, {"total_segments": None, "segments": None})
+
+
+def scan_segment(
+    client: Any,
+    table_name: str,
+    key_names: List[str],
+    segment: int,
+    total_segments: int,
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    checkpoints: SegmentCheckpoints,
+    stop: threading.Event,
+    page_size: int = 1000,
+    item_format: str = "native",
+    projection: Optional[str] = None,
+    governor: Optional[ThroughputGovernor] = None,
+) -> int:
+    """
+    Scan one segment of a table, checkpointing the key of the last item of every written file.
+
+    Args:
+        client (Any): The DynamoDB client, shared by all segments.
+        table_name (str): The DynamoDB table name.
+        key_names (List[str]): The key attributes of the table.
+        segment (int): The segment to scan.
+        total_segments (int): The number of segments.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        checkpoints (SegmentCheckpoints): The checkpoints of the scan.
+        stop (threading.Event): Set when the scan fails, to stop reading.
+        page_size (int): The number of items to evaluate per request. Defaults to 1000.
+        item_format (str): How items are converted, see `item_converter`. Defaults to "native".
+        projection (Optional[str]): Comma-separated list of attributes to fetch, the key is always fetched.
+            Defaults to all attributes.
+        governor (Optional[ThroughputGovernor]): Paces the requests of all segments, if the scan is limited.
+            Defaults to None.
+
+    Returns:
+        int: The number of items read in this run.
+    """
+    checkpoint = checkpoints.get(segment)
+    if checkpoint.get("done"):
+        return 0
+
+    convert = item_converter(item_format)
+    last_key: Dict[str, Any] = {}
+
+    def save(filename: str, item: Any) -> None:
+        # Items are added one at a time, so the last flushed item is the last one added
+        checkpoints.set(segment, {"done": False, "last_key": dump_key(last_key)})
+
+    buffer = BufferedOutput.from_arguments(output, buffer_arguments, on_flush=save)
+    kwargs: Dict[str, Any] = {"TableName": table_name, "Segment": segment, "TotalSegments": total_segments}
+    kwargs.update(Limit=page_size, **projection_arguments(projection, key_names))
+    if checkpoint.get("last_key"):
+        kwargs["ExclusiveStartKey"] = load_key(checkpoint["last_key"])
+
+    for items, last_evaluated_key in scan_pages(client, governor, **kwargs):
+        for item in items:
+            last_key = {name: item[name] for name in key_names}
+            buffer.add(convert(item))
+
+        if last_evaluated_key is None:
+            buffer.flush()
+            checkpoints.set(segment, {"done": True})
+        elif stop.is_set():
+            break
+
+    return buffer.rows_written
+
+
+def parallel_scan(
+    table_name: str,
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    state: State,
+    total_segments: Optional[int] = None,
+    workers: Optional[int] = None,
+    page_size: int = 1000,
+    item_format: str = "native",
+    projection: Optional[str] = None,
+    read_fraction: Optional[float] = None,
+    max_rcu: Optional[float] = None,
+) -> int:
+    """
+    Scan a table as concurrent segments on a thread pool, every segment writing its own output files.
+
+    The progress of every segment is checkpointed in the state, so that a rerun of an unfinished scan of the table
+    skips the finished segments and resumes the others after the last item they wrote. A resumed scan keeps the
+    number of segments it was started with, whatever `total_segments` is passed.
+
+    Args:
+        table_name (str): The DynamoDB table name.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        state (State): The state the checkpoints are kept in.
+        total_segments (Optional[int]): The number of segments. Defaults to one per 2 GB of table data, and at least
+            the number of workers.
+        workers (Optional[int]): The number of threads. Defaults to the number of segments, at most 32.
+        page_size (int): The number of items to evaluate per request. Defaults to 1000.
+        item_format (str): How items are converted, see `item_converter`. Defaults to "native".
+        projection (Optional[str]): Comma-separated list of attributes to fetch, the key is always fetched.
+            Defaults to all attributes.
+        read_fraction (Optional[float]): The fraction of the provisioned read capacity of the table to use, e.g.
+            0.5. Defaults to no limit.
+        max_rcu (Optional[float]): The largest number of read capacity units per second to use. Defaults to no limit.
+
+    Returns:
+        int: The number of items read in this run.
+    """
+    item_converter(item_format)
+
+    description = boto3.client("dynamodb").describe_table(TableName=table_name)["Table"]
+    key_names = [key["AttributeName"] for key in description["KeySchema"]]
+    checkpoints = SegmentCheckpoints(state, checkpoint_key("DynamoDB", table_name))
+    if checkpoints.total_segments:
+        # The segments of another split of the table cover other items, the scan is resumed with its own split
+        if total_segments and total_segments != checkpoints.total_segments:
+            log.warning(f"Resuming the scan of {table_name} with its {checkpoints.total_segments} segments")
+        total_segments = checkpoints.total_segments
+    elif not total_segments:
+        table_size = description.get("TableSizeBytes", 0)
+        total_segments = max(math.ceil(table_size / SEGMENT_BYTES), workers or 4 * (os.cpu_count() or 1))
+    checkpoints.total_segments = total_segments
+    workers = workers or min(total_segments, 32)
+    log.info(f"Scanning {table_name} as {total_segments} segments with {workers} threads")
+
+    # Clients are thread safe, one client with a connection per thread is shared by all segments
+    governor = make_governor(description, read_fraction, max_rcu, page_size, workers)
+    client = scan_client(governor, workers)
+    stop = threading.Event()
+    processed_rows = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                scan_segment,
+                client,
+                table_name,
+                key_names,
+                i,
+                total_segments,
+                output,
+                buffer_arguments,
+                checkpoints,
+                stop,
+                page_size,
+                item_format,
+                projection,
+                governor,
+            )
+            for i in range(total_segments)
+        ]
+        try:
+            for future in as_completed(futures):
+                processed_rows += future.result()
+                log.info(f"Total rows processed: {processed_rows}")
+        except BaseException:
+            stop.set()
+            executor.shutdown(cancel_futures=True)
+            raise
+
+    # The whole table has been read, the next run starts from the beginning
+    checkpoints.clear()
+    return processed_rows
+
+
+def from_export(attribute: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert an attribute value of an export file into the form the low-level client returns.
+
+    Exports hold binary values as base64 strings, while the client decodes them into bytes.
+
+    Args:
+        attribute (Dict[str, Any]): The attribute value, e.g. {"B": "AAE="}.
+
+    Returns:
+        Dict[str, Any]: The attribute value, e.g. {"B": b"\\x00\\x01"}.
+    """
+    ((kind, value),) = attribute.items()
+    if kind == "B":
+        return {"B": base64.b64decode(value)}
+    elif kind == "BS":
+        return {"BS": [base64.b64decode(v) for v in value]}
+    elif kind == "M":
+        return {"M": {name: from_export(v) for name, v in value.items()}}
+    elif kind == "L":
+        return {"L": [from_export(v) for v in value]}
+    return attribute
+
+
+def wait_for_export(
+    client: Any,
+    export_arn: str,
+    poll_interval: float = 10.0,
+    max_poll_interval: float = 300.0,
+    timeout: float = 24 * 3600.0,
+) -> Dict[str, Any]:
+    """
+    Wait for a table export to finish, polling with an exponential backoff.
+
+    Args:
+        client (Any): The DynamoDB client.
+        export_arn (str): The ARN of the export.
+        poll_interval (float): The first interval between two polls in seconds. Defaults to 10.
+        max_poll_interval (float): The longest interval between two polls in seconds. Defaults to 300.
+        timeout (float): How long to wait in seconds. Defaults to 24 hours.
+
+    Returns:
+        Dict[str, Any]: The description of the completed export.
+
+    Raises:
+        RuntimeError: If the export failed or did not finish in time.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        description = client.describe_export(ExportArn=export_arn)["ExportDescription"]
+        status = description["ExportStatus"]
+        if status == "COMPLETED":
+            return description
+        elif status == "FAILED":
+            raise RuntimeError(f"Export {export_arn} failed: {description.get('FailureMessage')}")
+        elif time.monotonic() + poll_interval > deadline:
+            raise RuntimeError(f"Export {export_arn} did not finish in time")
+
+        log.info(f"Export {export_arn} is {status.lower()}, polling again in {poll_interval:.0f}s")
+        time.sleep(poll_interval)
+        poll_interval = min(poll_interval * 2, max_poll_interval)
+
+
+def export_data_files(s3: Any, bucket: str, manifest: str) -> List[str]:
+    """
+    List the data files of a completed export.
+
+    Args:
+        s3 (Any): The S3 client.
+        bucket (str): The bucket the export was written to.
+        manifest (str): The key of the manifest summary of the export.
+
+    Returns:
+        List[str]: The keys of the data files.
+    """
+    summary = json.load(s3.get_object(Bucket=bucket, Key=manifest)["Body"])
+    files = s3.get_object(Bucket=bucket, Key=summary["manifestFilesS3Key"])["Body"]
+    return [json.loads(line)["dataFileS3Key"] for line in files.iter_lines() if line.strip()]
+
+
+def read_export_file(
+    s3: Any,
+    bucket: str,
+    key: str,
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    stop: threading.Event,
+    item_format: str = "native",
+) -> int:
+    """
+    Stream one gzipped DynamoDB JSON file of an export into its own output files.
+
+    Args:
+        s3 (Any): The S3 client.
+        bucket (str): The bucket the export was written to.
+        key (str): The key of the data file.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        stop (threading.Event): Set when the ingestion fails, to stop reading.
+        item_format (str): How items are converted, see `item_converter`. Defaults to "native".
+
+    Returns:
+        int: The number of items read.
+    """
+    convert = item_converter(item_format)
+    # Raw items keep binary values in base64, as in the export and as the scans save them
+    restore = (
+        (lambda item: item) if item_format == "raw" else (lambda item: {n: from_export(v) for n, v in item.items()})
+    )
+    buffer = BufferedOutput.from_arguments(output, buffer_arguments)
+
+    body = s3.get_object(Bucket=bucket, Key=key)["Body"]
+    with gzip.GzipFile(fileobj=body) as lines:
+        for line in lines:
+            if stop.is_set():
+                return buffer.rows_written
+            if line.strip():
+                buffer.add(convert(restore(json.loads(line)["Item"])))
+
+    buffer.flush()
+    return buffer.rows_written
+
+
+def ingest_export(
+    client: Any,
+    s3: Any,
+    table_name: str,
+    bucket: str,
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    state: State,
+    prefix: Optional[str] = None,
+    export_arn: Optional[str] = None,
+    workers: int = 8,
+    item_format: str = "native",
+    poll_interval: float = 10.0,
+    timeout: float = 24 * 3600.0,
+) -> int:
+    """
+    Export a table to S3 and stream the exported items into output files.
+
+    The ARN of a started export is kept in the state, so that a rerun reuses it, e.g. after the ingestion failed,
+    instead of exporting the table again. It is cleared once the export has been ingested.
+
+    Args:
+        client (Any): The DynamoDB client.
+        s3 (Any): The S3 client.
+        table_name (str): The DynamoDB table name.
+        bucket (str): The bucket to export to.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        state (State): The state the export ARN is kept in.
+        prefix (Optional[str]): The key prefix to export to. Defaults to the root of the bucket.
+        export_arn (Optional[str]): An existing export of the table to ingest instead. Defaults to None.
+        workers (int): The number of data files read concurrently. Defaults to 8.
+        item_format (str): How items are converted, see `item_converter`. Defaults to "native".
+        poll_interval (float): The first interval between two polls of the export in seconds. Defaults to 10.
+        timeout (float): How long to wait for the export in seconds. Defaults to 24 hours.
+
+    Returns:
+        int: The number of items read.
+    """
+    item_converter(item_format)
+    key = checkpoint_key("DynamoDB", "export", table_name, bucket, prefix)
+
+    export_arn = export_arn or (state.get_state(key) or {}).get("export_arn")
+    if export_arn:
+        log.info(f"Reusing export {export_arn}")
+    else:
+        table_arn = client.describe_table(TableName=table_name)["Table"]["TableArn"]
+        arguments = {"TableArn": table_arn, "S3Bucket": bucket, "ExportFormat": "DYNAMODB_JSON"}
+        if prefix:
+            arguments["S3Prefix"] = prefix
+        export_arn = client.export_table_to_point_in_time(**arguments)["ExportDescription"]["ExportArn"]
+        log.info(f"Started export {export_arn}")
+    state.set_state(key, {"export_arn": export_arn})
+
+    description = wait_for_export(client, export_arn, poll_interval=poll_interval, timeout=timeout)
+    # A reused export may have been written to another bucket
+    bucket = description.get("S3Bucket", bucket)
+    files = export_data_files(s3, bucket, description["ExportManifest"])
+    log.info(f"Reading {len(files)} export files with {workers} threads")
+
+    stop = threading.Event()
+    processed_rows = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(read_export_file, s3, bucket, f, output, buffer_arguments, stop, item_format) for f in files
+        ]
+        try:
+            for future in as_completed(futures):
+                processed_rows += future.result()
+                log.info(f"Total rows processed: {processed_rows}")
+        except BaseException:
+            stop.set()
+            executor.shutdown(cancel_futures=True)
+            raise
+
+    # The export has been ingested, the next run exports the table again
+    state.set_state(key, {"export_arn": None})
+    return processed_rows
+
 
 class DynamoDB(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs: Any) -> None:
@@ -60,46 +921,224 @@ class DynamoDB(Spout):
         super().__init__(output, state)
         self.top_level_arguments = kwargs
 
-    def fetch(self, table_name: str, page_size: int = 100) -> None:
+    def fetch(
+        self,
+        table_name: str,
+        page_size: int = 100,
+        item_format: str = "native",
+        projection: Optional[str] = None,
+        read_fraction: Optional[float] = None,
+        max_rcu: Optional[float] = None,
+    ) -> None:
         """
         📖 Fetch data from a DynamoDB table and save it in batch.
 
         Args:
             table_name (str): The DynamoDB table name.
             page_size (int): The number of rows to fetch per page. Defaults to 100.
+            item_format (str): "native" to save items as the boto3 resource API returns them, "plain" to convert
+                numbers to ints and floats and binary values to base64 with a faster deserializer, or "raw" to save
+                the DynamoDB JSON as received, without deserializing it. Defaults to "native".
+            projection (Optional[str]): Comma-separated list of attributes or nested paths to fetch, so that other
+                attributes are never read from the table. Defaults to all attributes.
+            read_fraction (Optional[float]): The fraction of the provisioned read capacity of the table to use, e.g.
+                0.5 to leave half of it to production traffic. Defaults to no limit.
+            max_rcu (Optional[float]): The largest number of read capacity units per second to use, e.g. for
+                on-demand tables. Defaults to no limit.
 
         Raises:
             Exception: If unable to connect to the DynamoDB or fetch the data.
         """
-        # Initialize DynamoDB client
-        dynamodb = boto3.resource("dynamodb")
-        table = dynamodb.Table(table_name)
+        # Initialize DynamoDB client, paced by a governor if the scan is limited
+        governor = None
+        if read_fraction or max_rcu:
+            description = boto3.client("dynamodb").describe_table(TableName=table_name)["Table"]
+            governor = make_governor(description, read_fraction, max_rcu, page_size)
+        client = scan_client(governor)
 
         # Initialize variables
         processed_rows = 0
-        last_evaluated_key = None
 
-        try:
-            while True:
-                if last_evaluated_key:
-                    response = table.scan(Limit=page_size, ExclusiveStartKey=last_evaluated_key)
-                else:
-                    response = table.scan(Limit=page_size)
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
 
-                items = response.get("Items", [])
-                if not items:
-                    break
+        try:
+            convert = item_converter(item_format)
+            scan_arguments = projection_arguments(projection)
 
-                # Save the fetched rows to a file
-                self.output.save(items)
+            for items, _ in scan_pages(client, governor, TableName=table_name, Limit=page_size, **scan_arguments):
+                # Buffer the fetched rows
+                buffer.extend(convert(item) for item in items)
 
                 # Update the number of processed rows
                 processed_rows += len(items)
                 self.log.info(f"Total rows processed: {processed_rows}")
 
-                last_evaluated_key = response.get("LastEvaluatedKey")
-                if not last_evaluated_key:
-                    break
+            # Flush the remaining buffered rows
+            buffer.flush()
+
+            # Update the state
+            current_state: Dict[str, Any] = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from DynamoDB: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+    def fetch_segmented(
+        self,
+        table_name: str,
+        total_segments: Optional[int] = None,
+        workers: Optional[int] = None,
+        page_size: int = 1000,
+        item_format: str = "native",
+        projection: Optional[str] = None,
+        read_fraction: Optional[float] = None,
+        max_rcu: Optional[float] = None,
+    ) -> None:
+        """
+        🧩 Fetch a DynamoDB table as a parallel scan of concurrent segments and save it in batch.
+
+        The table is scanned as `total_segments` segments on a thread pool, each segment writing its own output
+        files. The progress of every segment is checkpointed in the state, so a crashed scan is resumed segment by
+        segment, with the segments it was started with, when it is run again. With a read limit, the requests of all segments are
+        paced to it, and their page size and concurrency adapt to the measured item cost and to throttling.
+
+        Args:
+            table_name (str): The DynamoDB table name.
+            total_segments (Optional[int]): The number of segments. Defaults to one per 2 GB of table data, and at
+                least the number of workers.
+            workers (Optional[int]): The number of threads. Defaults to the number of segments, at most 32.
+            page_size (int): The number of items to evaluate per request. Defaults to 1000.
+            item_format (str): "native" to save items as the boto3 resource API returns them, "plain" to convert
+                numbers to ints and floats and binary values to base64 with a faster deserializer, or "raw" to save
+                the DynamoDB JSON as received, without deserializing it. Defaults to "native".
+            projection (Optional[str]): Comma-separated list of attributes or nested paths to fetch. The key of the
+                table is always fetched, for the checkpoints. Defaults to all attributes.
+            read_fraction (Optional[float]): The fraction of the provisioned read capacity of the table to use, e.g.
+                0.5 to leave half of it to production traffic. Defaults to no limit.
+            max_rcu (Optional[float]): The largest number of read capacity units per second to use, e.g. for
+                on-demand tables. Defaults to no limit.
+
+        Raises:
+            Exception: If unable to connect to the DynamoDB or fetch the data.
+        """
+        try:
+            processed_rows = parallel_scan(
+                table_name,
+                self.output,
+                self.top_level_arguments,
+                self.state,
+                total_segments=total_segments,
+                workers=workers,
+                page_size=page_size,
+                item_format=item_format,
+                projection=projection,
+                read_fraction=read_fraction,
+                max_rcu=max_rcu,
+            )
+
+            # Update the state
+            current_state: Dict[str, Any] = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from DynamoDB: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+    def fetch_export(
+        self,
+        table_name: str,
+        s3_bucket: str,
+        s3_prefix: Optional[str] = None,
+        export_arn: Optional[str] = None,
+        workers: int = 8,
+        item_format: str = "native",
+        poll_interval: float = 10.0,
+        timeout: float = 24 * 3600.0,
+        endpoint_url: Optional[str] = None,
+        s3_endpoint_url: Optional[str] = None,
+    ) -> None:
+        """
+        📦 Fetch a DynamoDB table through a point-in-time export to S3 and save it in batch.
+
+        A native table export is started, or reused, and polled until it completes. Its gzipped DynamoDB JSON files
+        are then streamed from S3 in parallel, and their items are saved in the same shape as by `fetch`. Exports
+        do not consume the read capacity of the table, but need point-in-time recovery to be enabled on it.
+
+        Args:
+            table_name (str): The DynamoDB table name.
+            s3_bucket (str): The S3 bucket to export to.
+            s3_prefix (Optional[str]): The S3 key prefix to export to. Defaults to the root of the bucket.
+            export_arn (Optional[str]): The ARN of an existing export of the table to ingest instead of starting
+                one. Defaults to the export started by a previous, failed run, if any.
+            workers (int): The number of export files read concurrently. Defaults to 8.
+            item_format (str): "native", "plain" or "raw", as for `fetch`. Defaults to "native".
+            poll_interval (float): The first interval between two polls of the export in seconds, doubled after
+                every poll up to 5 minutes. Defaults to 10.
+            timeout (float): How long to wait for the export in seconds. Defaults to 24 hours.
+            endpoint_url (Optional[str]): The endpoint of a DynamoDB compatible service to export from, e.g. a local
+                stand-in. Defaults to AWS DynamoDB.
+            s3_endpoint_url (Optional[str]): The endpoint of an S3 compatible store to read the export from, e.g.
+                a local stand-in. Defaults to AWS S3.
+
+        Raises:
+            Exception: If unable to connect to the DynamoDB, export the table or read the export.
+        """
+        # Initialize DynamoDB and S3 clients
+        client = boto3.client("dynamodb", endpoint_url=endpoint_url)
+        s3 = boto3.client("s3", endpoint_url=s3_endpoint_url, config=Config(max_pool_connections=max(workers, 10)))
+
+        try:
+            processed_rows = ingest_export(
+                client,
+                s3,
+                table_name,
+                s3_bucket,
+                self.output,
+                self.top_level_arguments,
+                self.state,
+                prefix=s3_prefix,
+                export_arn=export_arn,
+                workers=workers,
+                item_format=item_format,
+                poll_interval=poll_interval,
+                timeout=timeout,
+            )
 
             # Update the state
             current_state: Dict[str, Any] = self.state.get_state(self.id) or {
@@ -13,11 +13,308 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Dict
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional
 
+from elasticsearch import ApiError
 from elasticsearch import Elasticsearch as ES
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
+log = logging.getLogger(__name__)
+
+
+def search_body(query: str, page_size: int, source: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the body of a paged search request from a JSON query.
+
+    Args:
+        query (str): The Elasticsearch query in JSON format, e.g. '{"query": {"match_all": {}}}'.
+        page_size (int): The number of documents per page.
+        source (Optional[str]): Comma-separated list of `_source` fields to return. Defaults to all fields.
+
+    Returns:
+        Dict[str, Any]: The request body.
+    """
+    body: Dict[str, Any] = json.loads(query) if query else {}
+    body["size"] = page_size
+    if source:
+        body["_source"] = [field.strip() for field in source.split(",")]
+    return body
+
+
+def pit_pages(
+    es: ES,
+    index: str,
+    body: Dict[str, Any],
+    keep_alive: str = "5m",
+    pit_id: Optional[str] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Page through all the hits of a search with a point in time and `search_after`.
+
+    The point in time gives every page the same consistent view of the index, and `search_after` makes every page
+    as cheap as the first. A point in time opened here is closed when the generator is exhausted or closed.
+
+    Args:
+        es (ES): The Elasticsearch client.
+        index (str): The index to search.
+        body (Dict[str, Any]): The search request body, including the page size.
+        keep_alive (str): How long the point in time is kept between two pages. Defaults to "5m".
+        pit_id (Optional[str]): A point in time shared with other searches, left open. Defaults to opening one.
+
+    Yields:
+        List[Dict[str, Any]]: The hits of every page.
+
+    Raises:
+        ApiError: If the cluster cannot open a point in time, e.g. before Elasticsearch 7.10.
+    """
+    shared = pit_id is not None
+    if pit_id is None:
+        pit_id = es.open_point_in_time(index=index, keep_alive=keep_alive)["id"]
+    body = dict(body)
+    # Point in time searches are tie-broken on _shard_doc, the cheapest sort when no order is requested
+    body.setdefault("sort", [{"_shard_doc": "asc"}])
+    body["track_total_hits"] = False
+
+    try:
+        while True:
+            body["pit"] = {"id": pit_id, "keep_alive": keep_alive}
+            response = es.search(body=body)
+            pit_id = response.get("pit_id", pit_id)
+
+            hits = response["hits"]["hits"]
+            if not hits:
+                break
+            yield hits
+
+            body["search_after"] = hits[-1]["sort"]
+
+    finally:
+        if not shared:
+            es.close_point_in_time(id=pit_id)
+
+
+def scroll_pages(es: ES, index: str, body: Dict[str, Any], keep_alive: str = "5m") -> Iterator[List[Dict[str, Any]]]:
+    """
+    Page through all the hits of a search with the scroll API.
+
+    The scroll context is cleared when the generator is exhausted or closed.
+
+    Args:
+        es (ES): The Elasticsearch client.
+        index (str): The index to search.
+        body (Dict[str, Any]): The search request body, including the page size.
+        keep_alive (str): How long the scroll context is kept between two pages. Defaults to "5m".
+
+    Yields:
+        List[Dict[str, Any]]: The hits of every page.
+    """
+    body = dict(body)
+    # Scrolls are fastest in index order when no order is requested
+    body.setdefault("sort", ["_doc"])
+
+    response = es.search(index=index, body=body, scroll=keep_alive)
+    scroll_id = response.get("_scroll_id")
+
+    try:
+        while True:
+            hits = response["hits"]["hits"]
+            if not hits:
+                break
+            yield hits
+
+            response = es.scroll(scroll_id=scroll_id, scroll=keep_alive)
+            scroll_id = response.get("_scroll_id", scroll_id)
+
+    finally:
+        if scroll_id:
+            es.clear_scroll(scroll_id=scroll_id)
+
+
+def search_pages(
+    es: ES,
+    index: str,
+    body: Dict[str, Any],
+    pagination: str = "pit",
+    keep_alive: str = "5m",
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Page through the hits of a search.
+
+    Args:
+        es (ES): The Elasticsearch client.
+        index (str): The index to search.
+        body (Dict[str, Any]): The search request body, including the page size.
+        pagination (str): "pit" for a point in time with `search_after`, falling back to a scroll if the cluster
+            does not support it, "scroll" for a scroll, or "none" for the first page only. Defaults to "pit".
+        keep_alive (str): How long the point in time or scroll is kept between two pages. Defaults to "5m".
+
+    Returns:
+        Iterator[List[Dict[str, Any]]]: The hits of every page.
+
+    Raises:
+        ValueError: If the pagination is not supported.
+    """
+    if pagination == "pit":
+        try:
+            # Open the point in time eagerly, so that the fallback happens before any page is read
+            pages = pit_pages(es, index, body, keep_alive)
+            first = next(pages, None)
+        except ApiError as e:
+            log.warning(f"Point in time is not available, falling back to scroll: {e}")
+            return scroll_pages(es, index, body, keep_alive)
+        return chain([first] if first else [], pages)
+    elif pagination == "scroll":
+        return scroll_pages(es, index, body, keep_alive)
+    elif pagination == "none":
+        return iter([es.search(index=index, body=body)["hits"]["hits"]])
+    else:
+        raise ValueError(f"Invalid pagination: {pagination}")
+
+
+def primary_shards(es: ES, index: str) -> int:
+    """
+    Count the primary shards of the indices matched by an index name or pattern.
+
+    Args:
+        es (ES): The Elasticsearch client.
+        index (str): The index name, alias or pattern.
+
+    Returns:
+        int: The number of primary shards.
+    """
+    settings = es.indices.get_settings(index=index, name="index.number_of_shards")
+    return sum(int(value["settings"]["index"]["number_of_shards"]) for value in settings.values())
+
+
+def drain_slice(
+    es: ES,
+    index: str,
+    body: Dict[str, Any],
+    slice_id: int,
+    slices: int,
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    stop: threading.Event,
+    keep_alive: str = "5m",
+    pit_id: Optional[str] = None,
+) -> int:
+    """
+    Read one slice of a search and write it to its own output files.
+
+    Args:
+        es (ES): The Elasticsearch client.
+        index (str): The index to search.
+        body (Dict[str, Any]): The search request body, including the page size.
+        slice_id (int): The slice to read.
+        slices (int): The number of slices.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        stop (threading.Event): Set when the export fails, to stop reading.
+        keep_alive (str): How long the point in time or scroll is kept between two pages. Defaults to "5m".
+        pit_id (Optional[str]): The shared point in time, or None to read the slice with a scroll. Defaults to None.
+
+    Returns:
+        int: The number of documents read.
+    """
+    body = dict(body)
+    if slices > 1:
+        body["slice"] = {"id": slice_id, "max": slices}
+
+    pages = pit_pages(es, index, body, keep_alive, pit_id) if pit_id else scroll_pages(es, index, body, keep_alive)
+    buffer = BufferedOutput.from_arguments(output, buffer_arguments)
+
+    try:
+        for hits in pages:
+            buffer.extend(hit.get("_source", {}) for hit in hits)
+            if stop.is_set():
+                break
+
+        buffer.flush()
+        return buffer.rows_written
+
+    finally:
+        pages.close()
+
+
+def search_sliced(
+    es: ES,
+    index: str,
+    body: Dict[str, Any],
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    slices: Optional[int] = None,
+    workers: Optional[int] = None,
+    pagination: str = "pit",
+    keep_alive: str = "5m",
+) -> int:
+    """
+    Read a search as concurrent slices on a thread pool, every slice writing its own output files.
+
+    Args:
+        es (ES): The Elasticsearch client.
+        index (str): The index to search.
+        body (Dict[str, Any]): The search request body, including the page size.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        slices (Optional[int]): The number of slices. Defaults to the number of primary shards.
+        workers (Optional[int]): The number of threads. Defaults to the number of slices.
+        pagination (str): "pit" for slices of one shared point in time, falling back to sliced scrolls if the cluster
+            does not support it, or "scroll" for sliced scrolls. Defaults to "pit".
+        keep_alive (str): How long the point in time or scrolls are kept between two pages. Defaults to "5m".
+
+    Returns:
+        int: The number of documents read.
+
+    Raises:
+        ValueError: If the pagination is not supported.
+    """
+    if pagination not in ("pit", "scroll"):
+        raise ValueError(f"Invalid pagination: {pagination}")
+
+    slices = slices or primary_shards(es, index)
+    workers = workers or slices
+    log.info(f"Reading {index} as {slices} slices with {workers} threads")
+
+    pit_id = None
+    if pagination == "pit":
+        try:
+            pit_id = es.open_point_in_time(index=index, keep_alive=keep_alive)["id"]
+        except ApiError as e:
+            log.warning(f"Point in time is not available, falling back to scroll: {e}")
+
+    stop = threading.Event()
+    processed_docs = 0
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    drain_slice, es, index, body, i, slices, output, buffer_arguments, stop, keep_alive, pit_id
+                )
+                for i in range(slices)
+            ]
+            try:
+                for future in as_completed(futures):
+                    processed_docs += future.result()
+                    log.info(f"Total documents processed: {processed_docs}")
+            except BaseException:
+                stop.set()
+                executor.shutdown(cancel_futures=True)
+                raise
+
+        return processed_docs
+
+    finally:
+        if pit_id is not None:
+            es.close_point_in_time(id=pit_id)
+
 
 class Elasticsearch(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs: Any) -> None:
@@ -37,7 +334,7 @@ class Elasticsearch(Spout):
                 --output_s3_folder s3/folder \
             none \
             fetch \
-                --args hosts=localhost:9200 index=my_index query='{"query": {"match_all": {}}}' page_size=100
+                --args hosts=localhost:9200 index=my_index query='{"query": {"match_all": {}}}' page_size=1000 source=title,body
         ```
 
         ## Using geniusrise to invoke via YAML file
@@ -51,7 +348,8 @@ class Elasticsearch(Spout):
                     hosts: "localhost:9200"
                     index: "my_index"
                     query: '{"query": {"match_all": {}}}'
-                    page_size: 100
+                    page_size: 1000
+                    source: "title,body"
                 output:
                     type: "batch"
                     args:
@@ -68,15 +366,25 @@ class Elasticsearch(Spout):
         index: str,
         query: str,
         page_size: int = 100,
+        source: Optional[str] = None,
+        pagination: str = "pit",
+        keep_alive: str = "5m",
     ) -> None:
         """
-        📖 Fetch data from an Elasticsearch index and save it in batch.
+        📖 Fetch all matching documents from an Elasticsearch index and save them in batch.
+
+        The index is read page by page with a point in time and `search_after`, which keeps every page cheap and
+        consistent however deep the export goes. Clusters without point in time support are read with a scroll.
 
         Args:
             hosts (str): Comma-separated list of Elasticsearch hosts.
             index (str): The Elasticsearch index to query.
             query (str): The Elasticsearch query in JSON format.
             page_size (int): The number of documents to fetch per page. Defaults to 100.
+            source (Optional[str]): Comma-separated list of `_source` fields to fetch. Defaults to all fields.
+            pagination (str): "pit" for a point in time with `search_after`, falling back to a scroll, "scroll" for
+                a scroll, or "none" for the first page only. Defaults to "pit".
+            keep_alive (str): How long the point in time or scroll is kept between two pages. Defaults to "5m".
 
         Raises:
             Exception: If unable to connect to the Elasticsearch cluster or execute the query.
@@ -84,19 +392,98 @@ class Elasticsearch(Spout):
         # Initialize Elasticsearch connection
         es = ES(hosts.split(","))
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             # Execute the query
-            response = es.search(index=index, body=query, size=page_size)
-            hits = response["hits"]["hits"]
+            body = search_body(query, page_size, source)
             processed_docs = 0
 
-            for hit in hits:
-                # Save the fetched document to a file
-                self.output.save(hit["_source"])
+            for hits in search_pages(es, index, body, pagination, keep_alive):
+                # Buffer the fetched documents
+                buffer.extend(hit.get("_source", {}) for hit in hits)
 
                 # Update the number of processed documents
-                processed_docs += 1
-                self.log.debug(f"Processed document {processed_docs}")
+                processed_docs += len(hits)
+                self.log.info(f"Total documents processed: {processed_docs}")
+
+            # Flush the remaining buffered rows
+            buffer.flush()
+
+            # Update the state
+            current_state: Dict[str, Any] = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_docs": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_docs"] = processed_docs
+            self.state.set_state(self.id, current_state)
+
+            self.log.info(f"Total documents processed: {processed_docs}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from Elasticsearch: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_docs": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+    def fetch_sliced(
+        self,
+        hosts: str,
+        index: str,
+        query: str,
+        page_size: int = 1000,
+        source: Optional[str] = None,
+        slices: Optional[int] = None,
+        workers: Optional[int] = None,
+        pagination: str = "pit",
+        keep_alive: str = "5m",
+    ) -> None:
+        """
+        🧩 Fetch all matching documents from an Elasticsearch index as concurrent slices and save them in batch.
+
+        The search is split into slices that are read in parallel on a thread pool, each slice writing its own
+        output files. The slices share one point in time, or are read as sliced scrolls on clusters without point in
+        time support.
+
+        Args:
+            hosts (str): Comma-separated list of Elasticsearch hosts.
+            index (str): The Elasticsearch index to query.
+            query (str): The Elasticsearch query in JSON format.
+            page_size (int): The number of documents to fetch per page and slice. Defaults to 1000.
+            source (Optional[str]): Comma-separated list of `_source` fields to fetch. Defaults to all fields.
+            slices (Optional[int]): The number of slices. Defaults to the number of primary shards of the index.
+            workers (Optional[int]): The number of threads. Defaults to the number of slices.
+            pagination (str): "pit" for slices of a point in time, falling back to sliced scrolls, or "scroll" for
+                sliced scrolls. Defaults to "pit".
+            keep_alive (str): How long the point in time or scrolls are kept between two pages. Defaults to "5m".
+
+        Raises:
+            Exception: If unable to connect to the Elasticsearch cluster or execute the query.
+        """
+        # Initialize Elasticsearch connection
+        es = ES(hosts.split(","))
+
+        try:
+            processed_docs = search_sliced(
+                es,
+                index,
+                search_body(query, page_size, source),
+                self.output,
+                self.top_level_arguments,
+                slices=slices,
+                workers=workers,
+                pagination=pagination,
+                keep_alive=keep_alive,
+            )
 
             # Update the state
             current_state: Dict[str, Any] = self.state.get_state(self.id) or {
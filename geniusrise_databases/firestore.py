@@ -16,6 +16,8 @@
 import google.cloud.firestore_v1
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class Firestore(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -76,6 +78,9 @@ class Firestore(Spout):
         # Initialize Firestore client
         client = google.cloud.firestore_v1.Client(project=project_id)
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             # Connect to the collection
             collection = client.collection(collection_id)
@@ -95,13 +100,16 @@ class Firestore(Spout):
                 if not batch:
                     break
 
-                # Save the batch of documents to a file
-                self.output.save(batch)
+                # Buffer the batch of documents
+                buffer.extend(batch)
 
                 # Update the number of processed documents
                 processed_documents += len(batch)
                 self.log.info(f"Total documents processed: {processed_documents}/{document_count}")
 
+            # Flush the remaining buffered rows
+            buffer.flush()
+
             # Update the state
             current_state = self.state.get_state(self.id) or {
                 "success_count": 0,
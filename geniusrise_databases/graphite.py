@@ -16,6 +16,8 @@
 import requests
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class Graphite(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -89,14 +91,20 @@ class Graphite(Spout):
             "until": until,
         }
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             response = requests.get(f"{url}/render", params=params)
             response.raise_for_status()
 
             data = response.json()
 
-            # Save the fetched data to a file
-            self.output.save(data)
+            # Buffer the fetched data
+            buffer.extend(data)
+
+            # Flush the remaining buffered rows
+            buffer.flush()
 
             # Update the state
             current_state = self.state.get_state(self.id) or {
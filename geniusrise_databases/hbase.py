@@ -13,9 +13,106 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
 import happybase
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
+log = logging.getLogger(__name__)
+
+
+def region_ranges(
+    regions: List[Dict[str, Any]],
+    row_start: Optional[bytes] = None,
+    row_stop: Optional[bytes] = None,
+) -> List[Tuple[bytes, bytes]]:
+    """
+    Get the row ranges of the regions of a table, clipped to the rows to scan.
+
+    Args:
+        regions (List[Dict[str, Any]]): The regions of the table, as returned by `Table.regions`.
+        row_start (Optional[bytes]): The first row key to scan. Defaults to the start of the table.
+        row_stop (Optional[bytes]): The row key to stop scanning at. Defaults to the end of the table.
+
+    Returns:
+        List[Tuple[bytes, bytes]]: The start key, inclusive, and stop key, exclusive, of every region that holds
+            rows to scan, an empty key standing for the start or end of the table.
+    """
+    ranges = []
+    for region in sorted(regions, key=lambda region: region["start_key"]):
+        start, end = region["start_key"], region["end_key"]
+        if row_start and (not start or start < row_start):
+            start = row_start
+        if row_stop and (not end or end > row_stop):
+            end = row_stop
+        if end and start >= end:
+            continue
+        ranges.append((start, end))
+    return ranges or [(row_start or b"", row_stop or b"")]
+
+
+def to_text(value: bytes) -> str:
+    """
+    Decode a row key or column name, escaping the bytes that are not UTF-8.
+
+    Args:
+        value (bytes): The row key or column name.
+
+    Returns:
+        str: The decoded value.
+    """
+    return value.decode("utf-8", "backslashreplace")
+
+
+def scan_region(
+    pool: happybase.ConnectionPool,
+    table: str,
+    row_start: bytes,
+    row_stop: bytes,
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    stop: threading.Event,
+    **scan_arguments: Any,
+) -> int:
+    """
+    Scan one region on its own connection from the pool and write it to its own output files.
+
+    Args:
+        pool (happybase.ConnectionPool): The pool of Thrift connections.
+        table (str): The HBase table name.
+        row_start (bytes): The first row key of the region, empty for the start of the table.
+        row_stop (bytes): The row key after the region, empty for the end of the table.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        stop (threading.Event): Set when another region fails, to stop scanning.
+        **scan_arguments: The columns, filter and caching arguments of `Table.scan`.
+
+    Returns:
+        int: The number of rows read.
+    """
+    buffer = BufferedOutput.from_arguments(output, buffer_arguments)
+
+    with pool.connection() as connection:
+        scanner = connection.table(table).scan(row_start=row_start or None, row_stop=row_stop or None, **scan_arguments)
+        try:
+            for row_key, data in scanner:
+                if stop.is_set():
+                    return buffer.rows_written
+                buffer.add(
+                    {"row_key": to_text(row_key), "columns": {to_text(column): value for column, value in data.items()}}
+                )
+        finally:
+            # Closes the scanner on the server when the scan is stopped early
+            scanner.close()
+
+    buffer.flush()
+    return buffer.rows_written
+
 
 class HBase(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -86,17 +183,22 @@ class HBase(Spout):
         connection = happybase.Connection(host)
         hbase_table = connection.table(table)
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             processed_rows = 0
             for row_key, data in hbase_table.scan(row_start=row_start, row_stop=row_stop, batch_size=batch_size):
-                rows = [(row_key, data)]
-
-                # Save the fetched rows to a file
-                self.output.save(rows)
+                # Buffer the fetched row
+                buffer.add(
+                    {"row_key": to_text(row_key), "columns": {to_text(column): value for column, value in data.items()}}
+                )
 
                 # Update the number of processed rows
                 processed_rows += 1
-                self.log.info(f"Total rows processed: {processed_rows}")
+
+            # Flush the remaining buffered rows
+            buffer.flush()
 
             # Update the state
             current_state = self.state.get_state(self.id) or {
@@ -125,3 +227,112 @@ class HBase(Spout):
 
         finally:
             connection.close()
+
+    def fetch_regions(
+        self,
+        host: str,
+        table: str,
+        port: int = 9090,
+        row_start: Optional[str] = None,
+        row_stop: Optional[str] = None,
+        columns: Optional[str] = None,
+        filter: Optional[str] = None,
+        batch_size: int = 1000,
+        scan_batching: Optional[int] = None,
+        workers: int = 8,
+    ):
+        """
+        🧩 Fetch data from an HBase table as concurrent region scans and save it in batch.
+
+        The regions of the table are scanned concurrently on a thread pool, each on its own Thrift connection from a
+        connection pool, and every region writes its own output files. The columns and filter are applied by the
+        region servers.
+
+        Args:
+            host (str): The HBase Thrift server host.
+            table (str): The HBase table name.
+            port (int): The HBase Thrift server port. Defaults to 9090.
+            row_start (Optional[str]): The row key to start scanning from. Defaults to the start of the table.
+            row_stop (Optional[str]): The row key to stop scanning at. Defaults to the end of the table.
+            columns (Optional[str]): Comma-separated list of the column families or "family:qualifier" columns to
+                read. Defaults to all columns.
+            filter (Optional[str]): An HBase filter string, e.g. "SingleColumnValueFilter('cf', 'q', =, 'binary:v')".
+                Defaults to none.
+            batch_size (int): The scanner caching, i.e. the number of rows fetched per Thrift call. Defaults to 1000.
+            scan_batching (Optional[int]): The largest number of columns returned per call for wide rows. Defaults to
+                all columns of a row at once.
+            workers (int): The number of concurrent region scans and Thrift connections. Defaults to 8.
+
+        Raises:
+            Exception: If unable to connect to the HBase server or execute the scan.
+        """
+        # Initialize the HBase connection pool
+        pool = happybase.ConnectionPool(workers, host=host, port=port)
+
+        try:
+            with pool.connection() as connection:
+                regions = connection.table(table).regions()
+            ranges = region_ranges(
+                regions,
+                row_start.encode() if row_start else None,
+                row_stop.encode() if row_stop else None,
+            )
+            self.log.info(f"Scanning {table} as {len(ranges)} regions with {workers} threads")
+
+            scan_arguments = {
+                "columns": [column.strip() for column in columns.split(",")] if columns else None,
+                "filter": filter,
+                "batch_size": batch_size,
+                "scan_batching": scan_batching,
+            }
+            stop = threading.Event()
+            processed_rows = 0
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        scan_region,
+                        pool,
+                        table,
+                        start,
+                        end,
+                        self.output,
+                        self.top_level_arguments,
+                        stop,
+                        **scan_arguments,
+                    )
+                    for start, end in ranges
+                ]
+                try:
+                    for future in as_completed(futures):
+                        processed_rows += future.result()
+                        self.log.info(f"Total rows processed: {processed_rows}")
+                except BaseException:
+                    stop.set()
+                    executor.shutdown(cancel_futures=True)
+                    raise
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from HBase: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
@@ -16,6 +16,8 @@
 import influxdb
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class InfluxDB(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -85,6 +87,9 @@ class InfluxDB(Spout):
         # Initialize InfluxDB client
         client = influxdb.InfluxDBClient(host, port, username, password, database)
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             # Connect to the database
             with client:
@@ -103,13 +108,16 @@ class InfluxDB(Spout):
                     if not batch:
                         break
 
-                    # Save the batch of measurements to a file
-                    self.output.save(batch)
+                    # Buffer the batch of measurements
+                    buffer.extend(batch)
 
                     # Update the number of processed measurements
                     processed_measurements += len(batch)
                     self.log.info(f"Total measurements processed: {processed_measurements}/{measurement_count}")
 
+                # Flush the remaining buffered rows
+                buffer.flush()
+
                 # Update the state
                 current_state = self.state.get_state(self.id) or {
                     "success_count": 0,
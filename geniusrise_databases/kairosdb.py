@@ -16,6 +16,8 @@
 import requests
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class KairosDB(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -73,13 +75,19 @@ class KairosDB(Spout):
         Raises:
             Exception: If unable to connect to the KairosDB server or execute the query.
         """
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         # Perform the KairosDB operation
         try:
             response = requests.get(url, params={"query": query})
             data = response.json()["results"]
 
-            # Save the query results to a file
-            self.output.save(data)
+            # Buffer the query results
+            buffer.extend(data)
+
+            # Flush the remaining buffered rows
+            buffer.flush()
 
             # Update the state
             current_state = self.state.get_state(self.id) or {
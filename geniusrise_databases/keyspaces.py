@@ -13,9 +13,68 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+
+import ssl
+from typing import Any, Dict, Optional, Tuple
+
 import boto3
+from cassandra.auth import PlainTextAuthProvider
+from cassandra.cluster import Cluster, Session
+from cassandra.query import SimpleStatement, dict_factory, tuple_factory
+from cassandra_sigv4.auth import SigV4AuthProvider
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+from geniusrise_databases.cassandra import PrefetchingPager, cluster_token_ranges, convert_rows, scan_token_ranges
+from geniusrise_databases.dbapi import checkpoint_key, select_query
+
+# Keyspaces serves CQL over TLS only, on this port
+KEYSPACES_PORT = 9142
+
+# Keyspaces exposes every endpoint as several peers, each served over its own connection. Keeping a few requests in
+# flight per connection keeps the connections busy, far below the per-connection request rate limit.
+REQUESTS_PER_CONNECTION = 8
+
+
+def connect(
+    region_name: str,
+    keyspace: str,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+    ca_certs: Optional[str] = None,
+    endpoint: Optional[str] = None,
+) -> Tuple[Cluster, Session]:
+    """
+    Connect to Amazon Keyspaces over TLS.
+
+    Args:
+        region_name (str): The AWS region name.
+        keyspace (str): The keyspace to use.
+        username (Optional[str]): The username of service-specific credentials. Defaults to SigV4 authentication with
+            the AWS credentials of the environment.
+        password (Optional[str]): The password of service-specific credentials.
+        ca_certs (Optional[str]): A file of CA certificates to verify the endpoint with. Defaults to the system CAs.
+        endpoint (Optional[str]): The CQL endpoint. Defaults to the endpoint of the region.
+
+    Returns:
+        Tuple[Cluster, Session]: The cluster and the session.
+    """
+    endpoint = endpoint or f"cassandra.{region_name}.amazonaws.com"
+    if username:
+        auth_provider: Any = PlainTextAuthProvider(username=username, password=password)
+    else:
+        auth_provider = SigV4AuthProvider(boto3.Session(region_name=region_name))
+
+    ssl_context = ssl.create_default_context(cafile=ca_certs)
+    cluster = Cluster(
+        contact_points=[endpoint],
+        port=KEYSPACES_PORT,
+        auth_provider=auth_provider,
+        ssl_context=ssl_context,
+        ssl_options={"server_hostname": endpoint},
+    )
+    return cluster, cluster.connect(keyspace)
+
 
 class AWSKeyspaces(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -35,7 +94,7 @@ class AWSKeyspaces(Spout):
                 --output_s3_folder s3/folder \
             none \
             fetch \
-                --args region_name=us-east-1 cluster_name=mycluster table_name=mytable
+                --args region_name=us-east-1 keyspace=mykeyspace query="SELECT * FROM mytable"
         ```
 
         ## Using geniusrise to invoke via YAML file
@@ -47,8 +106,8 @@ class AWSKeyspaces(Spout):
                 method: "fetch"
                 args:
                     region_name: "us-east-1"
-                    cluster_name: "mycluster"
-                    table_name: "mytable"
+                    keyspace: "mykeyspace"
+                    query: "SELECT * FROM mytable"
                 output:
                     type: "batch"
                     args:
@@ -62,42 +121,185 @@ class AWSKeyspaces(Spout):
     def fetch(
         self,
         region_name: str,
-        cluster_name: str,
-        table_name: str,
+        keyspace: str,
+        query: Optional[str] = None,
+        page_size: int = 1000,
+        prefetch: int = 2,
+        row_format: str = "dict",
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        ca_certs: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        table_name: Optional[str] = None,
+        columns: Optional[str] = None,
+        where: Optional[str] = None,
+        limit: Optional[int] = None,
+        allow_filtering: bool = False,
     ):
         """
         📖 Fetch data from an AWS Keyspaces table and save it in batch.
 
+        The query runs over the CQL protocol, and its pages are streamed, the next pages being fetched while the
+        previous ones are saved. Instead of a query, a table can be given with the columns, filter and limit to read,
+        which are then built into the CQL query.
+
         Args:
             region_name (str): The AWS region name.
-            cluster_name (str): The AWS Keyspaces cluster name.
-            table_name (str): The name of the AWS Keyspaces table.
+            keyspace (str): The AWS Keyspaces keyspace name.
+            query (Optional[str]): The CQL query to execute. Defaults to a query built from table_name.
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+            prefetch (int): The number of pages fetched ahead while the previous pages are saved. Defaults to 2.
+            row_format (str): "dict" to save each row as a dict, or "tuple" to save it as a list of column values.
+                Defaults to "dict".
+            username (Optional[str]): The username of service-specific credentials. Defaults to SigV4 authentication
+                with the AWS credentials of the environment.
+            password (Optional[str]): The password of service-specific credentials.
+            ca_certs (Optional[str]): A file of CA certificates to verify the endpoint with. Defaults to the system CAs.
+            endpoint (Optional[str]): The CQL endpoint. Defaults to the endpoint of the region.
+            table_name (Optional[str]): The table to read when no query is given.
+            columns (Optional[str]): Comma-separated list of the columns to read. Defaults to all columns.
+            where (Optional[str]): A CQL filter the rows are restricted to, e.g. "pk = 'a'". Defaults to all rows.
+            limit (Optional[int]): The largest number of rows to read. Defaults to no limit.
+            allow_filtering (bool): Whether to allow a filter on columns that are not part of the primary key, which
+                reads and discards the rows that do not match on the server. Defaults to False.
 
         Raises:
+            ValueError: If neither or both of a query and a table are given.
             Exception: If unable to connect to the AWS Keyspaces cluster or execute the query.
         """
-        # Initialize AWS Keyspaces client
-        client = boto3.client("keyspaces", region_name=region_name)
+        if (query is None) == (table_name is None):
+            raise ValueError("Either a query or a table_name is required")
+        if query is None:
+            query = select_query(table_name, columns, where, limit)  # type: ignore
+            if allow_filtering:
+                query += " ALLOW FILTERING"
+
+        # Initialize AWS Keyspaces connection
+        cluster, session = connect(region_name, keyspace, username, password, ca_certs, endpoint)
+        session.row_factory = tuple_factory
+
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
 
         # Perform the AWS Keyspaces operation
         try:
-            response = client.query(
-                ClusterName=cluster_name,
-                Cql="SELECT * FROM {}".format(table_name),
-            )
-            data = response["Rows"]
+            # Validate the row format before querying
+            convert_rows([], [], row_format)
+            statement = SimpleStatement(query, fetch_size=page_size)
+            processed_rows = 0
+
+            for column_names, rows in PrefetchingPager(session, statement, depth=prefetch):
+                # Buffer the query results
+                buffer.extend(convert_rows(column_names, rows, row_format))
+
+                # Update the number of processed rows
+                processed_rows += len(rows)
+                self.log.info(f"Total rows processed: {processed_rows}")
+
+            # Flush the remaining buffered rows
+            buffer.flush()
+
+            # Update the state
+            current_state: Dict[str, Any] = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
 
-            # Save the query results to a file
-            self.output.save(data)
+        except Exception as e:
+            self.log.error(f"Error fetching data from AWS Keyspaces: {e}")
 
             # Update the state
             current_state = self.state.get_state(self.id) or {
                 "success_count": 0,
                 "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+        finally:
+            session.shutdown()
+            cluster.shutdown()
+
+    def fetch_token_ranges(
+        self,
+        region_name: str,
+        keyspace: str,
+        table_name: str,
+        columns: str = "*",
+        page_size: int = 1000,
+        ranges: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        ca_certs: Optional[str] = None,
+        endpoint: Optional[str] = None,
+    ):
+        """
+        🧩 Fetch a whole AWS Keyspaces table as concurrent token range queries and save it in batch.
+
+        The token ring is split into ranges that are read concurrently, and ranges whose rows have been written are
+        checkpointed in the state, so a rerun with the same arguments only reads the remaining ones.
+
+        Args:
+            region_name (str): The AWS region name.
+            keyspace (str): The AWS Keyspaces keyspace name.
+            table_name (str): The name of the AWS Keyspaces table.
+            columns (str): The select list. Defaults to "*".
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+            ranges (Optional[int]): The smallest number of token ranges. Defaults to 4 per concurrent query.
+            concurrency (Optional[int]): The largest number of ranges queried at once. Defaults to 8 per connection.
+            username (Optional[str]): The username of service-specific credentials. Defaults to SigV4 authentication
+                with the AWS credentials of the environment.
+            password (Optional[str]): The password of service-specific credentials.
+            ca_certs (Optional[str]): A file of CA certificates to verify the endpoint with. Defaults to the system CAs.
+            endpoint (Optional[str]): The CQL endpoint. Defaults to the endpoint of the region.
+
+        Raises:
+            Exception: If unable to connect to the AWS Keyspaces cluster or execute the query.
+        """
+        # Initialize AWS Keyspaces connection
+        cluster, session = connect(region_name, keyspace, username, password, ca_certs, endpoint)
+        session.row_factory = dict_factory
+
+        try:
+            metadata = cluster.metadata
+            partition_key = [column.name for column in metadata.keyspaces[keyspace].tables[table_name].partition_key]
+
+            # Size the concurrency to the connections, one per peer the endpoint advertises
+            concurrency = concurrency or REQUESTS_PER_CONNECTION * max(len(metadata.all_hosts()), 1)
+            token_range_list = cluster_token_ranges(session, ranges or 4 * concurrency)
+
+            processed_rows = scan_token_ranges(
+                session,
+                table_name,
+                partition_key,
+                token_range_list,
+                self.output,
+                self.top_level_arguments,
+                self.state,
+                checkpoint_key("AWSKeyspaces", region_name, keyspace, table_name, columns, len(token_range_list)),
+                columns=columns,
+                page_size=page_size,
+                concurrency=concurrency,
+            )
+
+            # Update the state
+            current_state: Dict[str, Any] = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
             }
             current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
             self.state.set_state(self.id, current_state)
 
+            self.log.info(f"Total rows processed: {processed_rows}")
+
         except Exception as e:
             self.log.error(f"Error fetching data from AWS Keyspaces: {e}")
 
@@ -105,6 +307,11 @@ class AWSKeyspaces(Spout):
             current_state = self.state.get_state(self.id) or {
                 "success_count": 0,
                 "failure_count": 0,
+                "processed_rows": 0,
             }
             current_state["failure_count"] += 1
             self.state.set_state(self.id, current_state)
+
+        finally:
+            session.shutdown()
+            cluster.shutdown()
@@ -16,6 +16,8 @@
 import ldap
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class LDAP(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -100,8 +102,10 @@ class LDAP(Spout):
             self.log.error(f"Error searching LDAP server: {e}")
             return
 
-        # Save the search results to a file
-        self.output.save(search_result)
+        # Buffer the search results
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+        buffer.extend(search_result)
+        buffer.flush()
 
         # Update the state
         current_state = self.state.get_state(self.id) or {
@@ -13,9 +13,393 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
+import os
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 import pymongo
+from bson import Binary, Decimal128, ObjectId, json_util
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput, RollingFileOutput
+from geniusrise_databases.dbapi import checkpoint_key
+
+log = logging.getLogger(__name__)
+
+# The $type aliases of the _id types a collection can be split on, bools and other types are never split
+_ID_TYPES = [
+    (bool, None),
+    (ObjectId, "objectId"),
+    (str, "string"),
+    ((int, float, Decimal128), "number"),
+    (datetime, "date"),
+    (Binary, "binData"),
+]
+
+
+# The extensions of the files raw documents are exported to
+RAW_EXTENSIONS = {"bson": ".bson", "length_prefixed": ".bin"}
+
+# The modes of MongoDB Extended JSON documents are saved in
+_JSON_OPTIONS = {"relaxed": json_util.RELAXED_JSON_OPTIONS, "canonical": json_util.CANONICAL_JSON_OPTIONS}
+
+
+def extended_json(mode: str = "relaxed") -> Callable[[Any], str]:
+    """
+    Select how documents are serialized, as MongoDB Extended JSON so that BSON types such as ObjectId, dates,
+    timestamps, decimals and binary values can be told apart and decoded with `bson.json_util.loads`.
+
+    Args:
+        mode (str): "relaxed" to keep numbers and dates readable, or "canonical" to keep every numeric type.
+            Defaults to "relaxed".
+
+    Returns:
+        Callable[[Any], str]: The serializer of a document.
+
+    Raises:
+        ValueError: If the mode is not supported.
+    """
+    if mode not in _JSON_OPTIONS:
+        raise ValueError(f"Invalid Extended JSON mode: {mode}")
+    options = _JSON_OPTIONS[mode]
+    return lambda document: json_util.dumps(document, json_options=options)
+
+
+def buffered_output(
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    on_flush: Optional[Callable[[str, Any], None]] = None,
+) -> BufferedOutput:
+    """
+    Create the buffered output of a read, serializing documents as Extended JSON in the mode of the spout.
+
+    Args:
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The keyword arguments of the spout, with `extended_json`.
+        on_flush (Optional[Callable[[str, Any], None]]): Called with the name of each written file and the last
+            document in it. Defaults to None.
+
+    Returns:
+        BufferedOutput: The buffered output.
+    """
+    encode = extended_json(buffer_arguments.get("extended_json", "relaxed"))
+    return BufferedOutput.from_arguments(output, buffer_arguments, on_flush=on_flush, encode=encode)
+
+
+def id_type(value: Any) -> Optional[str]:
+    """
+    Get the $type alias of an _id, the types that compare with each other in range queries sharing an alias.
+
+    Args:
+        value (Any): The _id.
+
+    Returns:
+        Optional[str]: The $type alias, or None if ranges of the type are not supported.
+    """
+    for types, alias in _ID_TYPES:
+        if isinstance(value, types):
+            return alias
+    return None
+
+
+def split_ids(collection: Any, partitions: int, samples_per_partition: int = 100) -> List[Any]:
+    """
+    Find the _id values that split a collection into ranges with about the same number of documents.
+
+    The _ids of a random sample of the documents are grouped into `partitions` buckets of equal size with
+    `$bucketAuto`, and the lower bound of every bucket but the first is a split point.
+
+    Args:
+        collection (Any): The pymongo collection.
+        partitions (int): The number of ranges.
+        samples_per_partition (int): The number of documents sampled per range. Defaults to 100.
+
+    Returns:
+        List[Any]: The split points in ascending order, empty if the collection cannot be split.
+    """
+    if partitions < 2:
+        return []
+
+    pipeline = [
+        {"$sample": {"size": partitions * samples_per_partition}},
+        {"$project": {"_id": 1}},
+        {"$bucketAuto": {"groupBy": "$_id", "buckets": partitions}},
+    ]
+    buckets = list(collection.aggregate(pipeline, allowDiskUse=True))
+    points = [bucket["_id"]["min"] for bucket in buckets[1:]]
+
+    # Range queries only match values of the same type, mixed _id types are read as a single range
+    types = {id_type(point) for point in points}
+    if len(types) != 1 or None in types:
+        return []
+    return points
+
+
+def id_range_filters(points: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Build the filters of the _id ranges between split points.
+
+    Args:
+        points (List[Any]): The split points in ascending order, all of the same type.
+
+    Returns:
+        List[Dict[str, Any]]: The filters, covering every document exactly once: the ranges, and the documents whose
+            _id is of another type than the split points.
+    """
+    if not points:
+        return [{}]
+
+    filters: List[Dict[str, Any]] = [{"_id": {"$lt": points[0]}}]
+    for low, high in zip(points, points[1:]):
+        filters.append({"_id": {"$gte": low, "$lt": high}})
+    filters.append({"_id": {"$gte": points[-1]}})
+    filters.append({"_id": {"$not": {"$type": id_type(points[0])}}})
+    return filters
+
+
+def read_range(
+    collection: Any,
+    query: Dict[str, Any],
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    batch_size: int,
+    stop: threading.Event,
+) -> int:
+    """
+    Read the documents matching a filter with their own cursor and write them to their own output files.
+
+    Args:
+        collection (Any): The pymongo collection.
+        query (Dict[str, Any]): The filter of the range.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        batch_size (int): The number of documents fetched per round trip.
+        stop (threading.Event): Set when another range fails, to stop reading.
+
+    Returns:
+        int: The number of documents read.
+    """
+    buffer = buffered_output(output, buffer_arguments)
+
+    with collection.find(query, batch_size=batch_size) as cursor:
+        for document in cursor:
+            if stop.is_set():
+                return buffer.rows_written
+            buffer.add(document)
+
+    buffer.flush()
+    return buffer.rows_written
+
+
+def parse_query(query: Optional[str]) -> Dict[str, Any]:
+    """
+    Parse a filter written as MongoDB Extended JSON, e.g. '{"created": {"$gte": {"$date": "2023-01-01T00:00:00Z"}}}'.
+
+    Args:
+        query (Optional[str]): The filter. Defaults to all documents.
+
+    Returns:
+        Dict[str, Any]: The filter.
+    """
+    return json_util.loads(query) if query else {}
+
+
+def export_raw(
+    collection: Any,
+    query: Dict[str, Any],
+    output: BatchOutput,
+    fields: Optional[str] = None,
+    raw_format: str = "bson",
+    file_size: int = 256 * 1024 * 1024,
+    batch_size: int = 1000,
+) -> Tuple[int, int]:
+    """
+    Export the documents matching a filter as raw BSON, without decoding them.
+
+    The documents are received as raw batches of BSON bytes and written as they are to rolled files in the output
+    folder, a file never splitting a document. With "bson", a file is the concatenation of its documents, like the
+    files of mongodump. With "length_prefixed", every document is preceded by its size as a 4-byte big-endian
+    unsigned integer.
+
+    Args:
+        collection (Any): The pymongo collection.
+        query (Dict[str, Any]): The filter.
+        output (BatchOutput): The output whose folder the files are written to.
+        fields (Optional[str]): Comma-separated list of the fields to export, projected on the server. Defaults to
+            all fields.
+        raw_format (str): "bson" or "length_prefixed". Defaults to "bson".
+        file_size (int): The size after which a new file is started. Defaults to 256 MiB.
+        batch_size (int): The number of documents fetched per round trip. Defaults to 1000.
+
+    Returns:
+        Tuple[int, int]: The number of documents and of bytes written.
+
+    Raises:
+        ValueError: If the raw format is not supported.
+    """
+    if raw_format not in RAW_EXTENSIONS:
+        raise ValueError(f"Invalid raw format: {raw_format}")
+
+    projection = {field.strip(): 1 for field in fields.split(",")} if fields else None
+    documents = 0
+
+    with RollingFileOutput(output, extension=RAW_EXTENSIONS[raw_format], max_bytes=file_size) as writer:
+        with collection.find_raw_batches(query, projection, batch_size=batch_size) as cursor:
+            for batch in cursor:
+                # Every BSON document starts with its size as a little-endian int32
+                sizes = []
+                offset = 0
+                while offset < len(batch):
+                    (size,) = struct.unpack_from("<i", batch, offset)
+                    sizes.append(size)
+                    offset += size
+
+                if raw_format == "bson":
+                    writer.write(batch)
+                else:
+                    framed = bytearray()
+                    offset = 0
+                    for size in sizes:
+                        framed += struct.pack(">I", size)
+                        framed += batch[offset : offset + size]
+                        offset += size
+                    writer.write(bytes(framed))
+                documents += len(sizes)
+
+    return documents, writer.bytes_written
+
+
+def snapshot_collection(collection: Any, output: BatchOutput, buffer_arguments: Dict[str, Any], batch_size: int) -> int:
+    """
+    Read every document of a collection as a "snapshot" change event, shaped like the events of a change stream.
+
+    Args:
+        collection (Any): The pymongo collection.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        batch_size (int): The number of documents fetched per round trip.
+
+    Returns:
+        int: The number of documents read.
+    """
+    buffer = buffered_output(output, buffer_arguments)
+    namespace = {"db": collection.database.name, "coll": collection.name}
+
+    with collection.find({}, batch_size=batch_size) as cursor:
+        for document in cursor:
+            buffer.add(
+                {
+                    "operationType": "snapshot",
+                    "ns": namespace,
+                    "documentKey": {"_id": document["_id"]},
+                    "fullDocument": document,
+                }
+            )
+            if len(buffer) == 0:
+                log.info(f"Total documents in the snapshot: {buffer.rows_written}")
+
+    buffer.flush()
+    return buffer.rows_written
+
+
+def stream_changes(
+    collection: Any,
+    output: BatchOutput,
+    buffer_arguments: Dict[str, Any],
+    state: State,
+    key: str,
+    pipeline: Optional[List[Dict[str, Any]]] = None,
+    full_document: str = "updateLookup",
+    snapshot: bool = False,
+    duration: Optional[float] = None,
+    batch_size: int = 1000,
+    max_await_time_ms: int = 1000,
+) -> int:
+    """
+    Tail the change stream of a collection, resuming after the resume token kept in the state.
+
+    The events are buffered into output files by count and age using the `buffer_*` thresholds, and the buffer is
+    also flushed while the stream is idle. The resume token of the last event of every file is stored once the file
+    is written, and the token of the stream is stored while it is idle, so a rerun resumes where the last one
+    stopped, reading the unsaved events again.
+
+    Without a stored resume token, a snapshot of the collection can be read first: the stream is opened before the
+    snapshot to get its starting point, and is resumed from that point once the snapshot is written, so changes made
+    during the snapshot are read afterwards as events. Consumers should apply the events by document key.
+
+    Args:
+        collection (Any): The pymongo collection.
+        output (BatchOutput): The output whose folder the files are written to.
+        buffer_arguments (Dict[str, Any]): The `buffer_*` keyword arguments of the spout.
+        state (State): The state the resume token is kept in.
+        key (str): The state key of the resume token.
+        pipeline (Optional[List[Dict[str, Any]]]): Aggregation stages applied to the events. Defaults to none.
+        full_document (str): "updateLookup" to include the current document in update events, or "default" for
+            the changed fields only. Defaults to "updateLookup".
+        snapshot (bool): Whether to read a snapshot of the collection first when there is no resume token.
+            Defaults to False.
+        duration (Optional[float]): How long to tail the stream in seconds. Defaults to forever.
+        batch_size (int): The number of events or documents fetched per round trip. Defaults to 1000.
+        max_await_time_ms (int): How long the server waits for new events before returning an empty batch.
+            Defaults to 1000.
+
+    Returns:
+        int: The number of events and snapshot documents read in this run.
+    """
+    checkpoint = state.get_state(key) or {}
+    resume_token = checkpoint.get("resume_token")
+    processed_rows = 0
+
+    if resume_token is None and snapshot:
+        # Open the stream first so that no change made during the snapshot is missed
+        with collection.watch(pipeline, full_document=full_document) as stream:
+            resume_token = stream.resume_token
+        if resume_token is None:
+            raise ValueError("The change stream has no starting point, snapshots need MongoDB 4.0.7 or later")
+        log.info(f"Reading a snapshot of {collection.full_name}")
+        processed_rows += snapshot_collection(collection, output, buffer_arguments, batch_size)
+        state.set_state(key, {"resume_token": resume_token})
+
+    def save(filename: str, last_event: Any) -> None:
+        state.set_state(key, {"resume_token": last_event["_id"]})
+
+    buffer = buffered_output(output, buffer_arguments, on_flush=save)
+    deadline = time.monotonic() + duration if duration else None
+    log.info(f"Tailing the change stream of {collection.full_name}, resuming after {resume_token}")
+
+    with collection.watch(
+        pipeline,
+        full_document=full_document,
+        resume_after=resume_token,
+        batch_size=batch_size,
+        max_await_time_ms=max_await_time_ms,
+    ) as stream:
+        while stream.alive and (deadline is None or time.monotonic() < deadline):
+            event = stream.try_next()
+            if event is not None:
+                buffer.add(event)
+                processed_rows += 1
+                continue
+
+            # The stream is idle, write the buffered events that are due or move the resume token forward
+            if buffer.is_due():
+                buffer.flush()
+            elif not len(buffer) and stream.resume_token is not None and stream.resume_token != resume_token:
+                resume_token = stream.resume_token
+                state.set_state(key, {"resume_token": resume_token})
+            log.debug(f"Total events processed: {processed_rows}")
+
+        buffer.flush()
+        if stream.resume_token is not None:
+            state.set_state(key, {"resume_token": stream.resume_token})
+
+    return processed_rows
+
 
 class MongoDB(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -25,7 +409,9 @@ class MongoDB(Spout):
         Args:
             output (BatchOutput): An instance of the BatchOutput class for saving the data.
             state (State): An instance of the State class for maintaining the state.
-            **kwargs: Additional keyword arguments.
+            **kwargs: Additional keyword arguments, e.g. the `buffer_*` thresholds, `output_format`, and
+                `extended_json`, "relaxed" or "canonical", the mode of the MongoDB Extended JSON the documents are
+                saved in. Defaults to "relaxed".
 
         ## Using geniusrise to invoke via command line
         ```bash
@@ -70,10 +456,13 @@ class MongoDB(Spout):
         password: str,
         database: str,
         collection: str,
+        batch_size: int = 1000,
     ):
         """
         📖 Fetch data from a MongoDB database and save it in batch.
 
+        The documents are streamed from the cursor, one batch per round trip, and buffered into output files.
+
         Args:
             host (str): The MongoDB host.
             port (int): The MongoDB port.
@@ -81,6 +470,7 @@ class MongoDB(Spout):
             password (str): The MongoDB password.
             database (str): The MongoDB database name.
             collection (str): The MongoDB collection name.
+            batch_size (int): The number of documents fetched per round trip. Defaults to 1000.
 
         Raises:
             Exception: If unable to connect to the MongoDB server or execute the query.
@@ -88,32 +478,132 @@ class MongoDB(Spout):
         # Initialize MongoDB client
         client = pymongo.MongoClient(host=host, port=port)  # type: ignore
 
+        # Initialize the output buffer
+        buffer = buffered_output(self.output, self.top_level_arguments)
+
         try:
             # Connect to the database
             db = client[database]
             collection = db[collection]  # type: ignore
 
-            # Get the number of documents in the collection
-            count = collection.count_documents({})  # type: ignore
+            # Estimate the number of documents in the collection from its metadata
+            count = collection.estimated_document_count()  # type: ignore
 
             # Iterate through each document in the collection
-            cursor = collection.find({})  # type: ignore
             processed_rows = 0
+            with collection.find({}, batch_size=batch_size) as cursor:  # type: ignore
+                for document in cursor:
+                    # Buffer the document
+                    buffer.add(document)
+
+                    # Update the number of processed rows
+                    processed_rows += 1
+                    if processed_rows % batch_size == 0:
+                        self.log.info(f"Total rows processed: {processed_rows}/{count}")
+
+            # Flush the remaining buffered rows
+            buffer.flush()
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}/{count}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from MongoDB: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+        finally:
+            # Close the MongoDB client
+            client.close()
+
+    def fetch_parallel(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        database: str,
+        collection: str,
+        partitions: Optional[int] = None,
+        workers: Optional[int] = None,
+        batch_size: int = 1000,
+    ):
+        """
+        🧩 Fetch a MongoDB collection as concurrent _id ranges and save it in batch.
+
+        The collection is split into _id ranges of about the same number of documents, found with `$bucketAuto` over
+        a random sample of the _ids. The ranges are read concurrently on a thread pool, each with its own cursor on
+        the _id index, and every range writes its own output files.
+
+        Args:
+            host (str): The MongoDB host.
+            port (int): The MongoDB port.
+            username (str): The MongoDB username.
+            password (str): The MongoDB password.
+            database (str): The MongoDB database name.
+            collection (str): The MongoDB collection name.
+            partitions (Optional[int]): The number of _id ranges. Defaults to 4 per CPU.
+            workers (Optional[int]): The number of threads. Defaults to the number of ranges, at most 32.
+            batch_size (int): The number of documents fetched per round trip. Defaults to 1000.
 
-            while True:
-                # Get a batch of documents
-                batch = list(cursor.batch_size(100))  # type: ignore
+        Raises:
+            Exception: If unable to connect to the MongoDB server or execute the query.
+        """
+        partitions = partitions or 4 * (os.cpu_count() or 1)
+        workers = workers or min(partitions, 32)
 
-                # Check if there are any documents in the batch
-                if not batch:
-                    break
+        # Initialize MongoDB client, with a connection per thread
+        client = pymongo.MongoClient(host=host, port=port, maxPoolSize=max(workers, 100))  # type: ignore
 
-                # Save the batch of documents to a file
-                self.output.save(batch)
+        try:
+            coll = client[database][collection]
 
-                # Update the number of processed rows
-                processed_rows += len(batch)
-                self.log.info(f"Total rows processed: {processed_rows}/{count}")
+            # Split the collection on the _id index
+            count = coll.estimated_document_count()
+            filters = id_range_filters(split_ids(coll, partitions) if count > partitions else [])
+            self.log.info(f"Reading about {count} documents as {len(filters)} _id ranges with {workers} threads")
+
+            stop = threading.Event()
+            processed_rows = 0
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        read_range,
+                        coll,
+                        query,
+                        self.output,
+                        self.top_level_arguments,
+                        batch_size,
+                        stop,
+                    )
+                    for query in filters
+                ]
+                try:
+                    for future in as_completed(futures):
+                        processed_rows += future.result()
+                        self.log.info(f"Total rows processed: {processed_rows}/{count}")
+                except BaseException:
+                    stop.set()
+                    executor.shutdown(cancel_futures=True)
+                    raise
 
             # Update the state
             current_state = self.state.get_state(self.id) or {
@@ -143,3 +633,180 @@ class MongoDB(Spout):
         finally:
             # Close the MongoDB client
             client.close()
+
+    def fetch_raw(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        database: str,
+        collection: str,
+        query: Optional[str] = None,
+        fields: Optional[str] = None,
+        raw_format: str = "bson",
+        file_size: int = 256 * 1024 * 1024,
+        batch_size: int = 1000,
+    ):
+        """
+        📦 Export a MongoDB collection as raw BSON files.
+
+        The documents are written as the BSON bytes received from the server, without being decoded into Python
+        objects and encoded again, see `export_raw`.
+
+        Args:
+            host (str): The MongoDB host.
+            port (int): The MongoDB port.
+            username (str): The MongoDB username.
+            password (str): The MongoDB password.
+            database (str): The MongoDB database name.
+            collection (str): The MongoDB collection name.
+            query (Optional[str]): A filter as MongoDB Extended JSON. Defaults to all documents.
+            fields (Optional[str]): Comma-separated list of the fields to export, projected on the server. Defaults
+                to all fields.
+            raw_format (str): "bson" for concatenated documents, like mongodump, or "length_prefixed" for documents
+                preceded by their 4-byte big-endian size. Defaults to "bson".
+            file_size (int): The size after which a new file is started. Defaults to 256 MiB.
+            batch_size (int): The number of documents fetched per round trip. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the MongoDB server or execute the query.
+        """
+        # Initialize MongoDB client
+        client = pymongo.MongoClient(host=host, port=port)  # type: ignore
+
+        try:
+            coll = client[database][collection]
+            processed_rows, bytes_written = export_raw(
+                coll,
+                parse_query(query),
+                self.output,
+                fields=fields,
+                raw_format=raw_format,
+                file_size=file_size,
+                batch_size=batch_size,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows} ({bytes_written} bytes)")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from MongoDB: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+        finally:
+            # Close the MongoDB client
+            client.close()
+
+    def fetch_changes(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        database: str,
+        collection: str,
+        operation_types: Optional[str] = None,
+        full_document: str = "updateLookup",
+        snapshot: bool = False,
+        duration: Optional[float] = None,
+        batch_size: int = 1000,
+    ):
+        """
+        🌊 Tail the inserts, updates and deletes of a MongoDB collection from its change stream and save them in batch.
+
+        The events are buffered into output files by count and age, set with `buffer_rows` and `buffer_seconds`. The
+        resume token of the last saved event is kept in the state, so every run continues where the previous one
+        stopped. With `snapshot`, the first run reads every document of the collection before handing off to the
+        stream without missing the changes made in between, see `stream_changes`. Change streams need a replica set
+        or a sharded cluster.
+
+        Args:
+            host (str): The MongoDB host.
+            port (int): The MongoDB port.
+            username (str): The MongoDB username.
+            password (str): The MongoDB password.
+            database (str): The MongoDB database name.
+            collection (str): The MongoDB collection name.
+            operation_types (Optional[str]): Comma-separated list of the operation types to save, e.g.
+                "insert,update,replace,delete". Defaults to all events.
+            full_document (str): "updateLookup" to include the current document in update events, or "default" for
+                the changed fields only. Defaults to "updateLookup".
+            snapshot (bool): Whether to read every document of the collection first, when there is no resume token
+                yet. Defaults to False.
+            duration (Optional[float]): How long to tail the stream in seconds. Defaults to forever.
+            batch_size (int): The number of events or documents fetched per round trip. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the MongoDB server or open the change stream.
+        """
+        # Initialize MongoDB client
+        client = pymongo.MongoClient(host=host, port=port)  # type: ignore
+
+        try:
+            coll = client[database][collection]
+            pipeline = None
+            if operation_types:
+                types = [operation_type.strip() for operation_type in operation_types.split(",")]
+                pipeline = [{"$match": {"operationType": {"$in": types}}}]
+
+            key = checkpoint_key(self.__class__.__name__, "changes", host, port, database, collection, operation_types)
+            processed_rows = stream_changes(
+                coll,
+                self.output,
+                self.top_level_arguments,
+                self.state,
+                key,
+                pipeline=pipeline,
+                full_document=full_document,
+                snapshot=snapshot,
+                duration=duration,
+                batch_size=batch_size,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from MongoDB: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+        finally:
+            # Close the MongoDB client
+            client.close()
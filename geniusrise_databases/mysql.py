@@ -13,9 +13,39 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import Optional
+
 import pymysql  # type: ignore
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+from geniusrise_databases.dbapi import checkpoint_key, extract_incremental, extract_keyset, extract_partitioned
+
+
+def cursor_class(streaming: bool = False, row_format: str = "dict") -> type:
+    """
+    Select the pymysql cursor class for a fetch mode.
+
+    Buffered cursors read the whole result set into client memory during `execute`, while the unbuffered
+    `SS*` cursors read rows from the socket as they are fetched.
+
+    Args:
+        streaming (bool): Whether to use an unbuffered server-side cursor. Defaults to False.
+        row_format (str): "dict" for a dict per row or "tuple" for a tuple per row. Defaults to "dict".
+
+    Returns:
+        type: The pymysql cursor class.
+
+    Raises:
+        ValueError: If the row format is not supported.
+    """
+    if row_format == "dict":
+        return pymysql.cursors.SSDictCursor if streaming else pymysql.cursors.DictCursor
+    elif row_format == "tuple":
+        return pymysql.cursors.SSCursor if streaming else pymysql.cursors.Cursor
+    else:
+        raise ValueError(f"Invalid row format: {row_format}")
+
 
 class MySQL(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -72,6 +102,8 @@ class MySQL(Spout):
         database: str,
         query: str,
         page_size: int = 100,
+        streaming: bool = False,
+        row_format: str = "dict",
     ):
         """
         📖 Fetch data from a MySQL database and save it in batch.
@@ -84,6 +116,10 @@ class MySQL(Spout):
             database (str): The MySQL database name.
             query (str): The SQL query to execute.
             page_size (int): The number of rows to fetch per page. Defaults to 100.
+            streaming (bool): Whether to stream rows with an unbuffered server-side cursor, so that memory is bounded
+                by page_size instead of the size of the result set. Defaults to False.
+            row_format (str): "dict" to save each row as a dict, or "tuple" to save it as a list of column values.
+                Defaults to "dict".
 
         Raises:
             Exception: If unable to connect to the MySQL server or execute the query.
@@ -95,13 +131,16 @@ class MySQL(Spout):
             user=user,
             password=password,
             database=database,
-            cursorclass=pymysql.cursors.DictCursor,
+            cursorclass=cursor_class(streaming, row_format),
         )
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             with connection.cursor() as cursor:
                 cursor.execute(query)
-                total_rows = cursor.rowcount
+                total_rows = "?" if streaming else cursor.rowcount
                 processed_rows = 0
 
                 while True:
@@ -109,13 +148,16 @@ class MySQL(Spout):
                     if not rows:
                         break
 
-                    # Save the fetched rows to a file
-                    self.output.save(rows)
+                    # Buffer the fetched rows
+                    buffer.extend(rows)
 
                     # Update the number of processed rows
                     processed_rows += len(rows)
                     self.log.info(f"Total rows processed: {processed_rows}/{total_rows}")
 
+                # Flush the remaining buffered rows
+                buffer.flush()
+
                 # Update the state
                 current_state = self.state.get_state(self.id) or {
                     "success_count": 0,
@@ -143,3 +185,232 @@ class MySQL(Spout):
 
         finally:
             connection.close()
+
+    def fetch_partitioned(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        table: str,
+        split_column: str,
+        partitions: Optional[int] = None,
+        workers: Optional[int] = None,
+        split: str = "minmax",
+        page_size: int = 1000,
+    ) -> None:
+        """
+        🧩 Fetch a MySQL table as concurrent ranges of a split column and save it in batch.
+
+        The table is split into ranges of `split_column`, and each range is read on its own connection in a
+        separate worker process that writes its own output files.
+
+        Args:
+            host (str): The MySQL host.
+            port (int): The MySQL port.
+            user (str): The MySQL user.
+            password (str): The MySQL password.
+            database (str): The MySQL database name.
+            table (str): The table to read.
+            split_column (str): The column to split the table on, ideally an indexed primary key.
+            partitions (Optional[int]): The number of ranges. Defaults to the number of CPUs.
+            workers (Optional[int]): The number of worker processes. Defaults to the number of ranges.
+            split (str): "minmax" to split the interval of a numeric or date column evenly, or "ntile" to split the
+                rows into equally sized buckets. Defaults to "minmax".
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the MySQL server or execute the query.
+        """
+        # Describe how each worker connects to MySQL
+        spec = ("pymysql", [], {"host": host, "port": port, "user": user, "password": password, "database": database})
+
+        try:
+            processed_rows = extract_partitioned(
+                spec,
+                table,
+                split_column,
+                self.output,
+                self.top_level_arguments,
+                partitions=partitions,
+                workers=workers,
+                split=split,
+                page_size=page_size,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from MySQL: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+    def fetch_keyset(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        query: str,
+        order_column: str,
+        page_size: int = 1000,
+    ) -> None:
+        """
+        🔖 Fetch data from a MySQL database in keyset pages, resuming where a previous run stopped.
+
+        Rows are read in pages ordered by `order_column`, and the last key of every written output file is
+        checkpointed in the state. A rerun with the same arguments resumes after that key instead of starting over.
+
+        Args:
+            host (str): The MySQL host.
+            port (int): The MySQL port.
+            user (str): The MySQL user.
+            password (str): The MySQL password.
+            database (str): The MySQL database name.
+            query (str): The SQL query to execute.
+            order_column (str): A unique column of the query result to order and page by, ideally indexed.
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the MySQL server or execute the query.
+        """
+        # Describe how to connect to MySQL
+        spec = ("pymysql", [], {"host": host, "port": port, "user": user, "password": password, "database": database})
+
+        # The checkpoint is keyed by what is extracted, so that it is found again by a new run
+        key = checkpoint_key(self.__class__.__name__, host, port, database, query, order_column)
+
+        try:
+            processed_rows = extract_keyset(
+                spec,
+                query,
+                order_column,
+                self.output,
+                self.top_level_arguments,
+                self.state,
+                key,
+                page_size=page_size,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from MySQL: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+    def fetch_incremental(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        query: str,
+        watermark_column: str,
+        lookback: float = 0,
+        page_size: int = 1000,
+    ) -> None:
+        """
+        🌊 Fetch the rows of a MySQL query that changed since the last run and save them in batch.
+
+        The high-water mark of `watermark_column` is kept in the state, and every run reads the rows from it up to and
+        including the current maximum. Rows that are committed late with an older value can be caught with a `lookback`
+        window. Rows that were already delivered unchanged are skipped when they are read again.
+
+        Args:
+            host (str): The MySQL host.
+            port (int): The MySQL port.
+            user (str): The MySQL user.
+            password (str): The MySQL password.
+            database (str): The MySQL database name.
+            query (str): The SQL query to execute.
+            watermark_column (str): The change-tracking column of the query result, e.g. updated_at, ideally indexed.
+            lookback (float): How far before the high-water mark to start reading, in seconds for dates and
+                timestamps and in column units for numbers. Defaults to 0.
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the MySQL server or execute the query.
+        """
+        # Describe how to connect to MySQL
+        spec = ("pymysql", [], {"host": host, "port": port, "user": user, "password": password, "database": database})
+
+        # The high-water mark is keyed by what is extracted, so that it is found again by the next run
+        key = checkpoint_key(self.__class__.__name__, "incremental", host, port, database, query, watermark_column)
+
+        try:
+            processed_rows = extract_incremental(
+                spec,
+                query,
+                watermark_column,
+                self.output,
+                self.top_level_arguments,
+                self.state,
+                key,
+                lookback=lookback,
+                page_size=page_size,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from MySQL: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
@@ -16,6 +16,8 @@
 import neo4j
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class Neo4j(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -82,6 +84,9 @@ class Neo4j(Spout):
         # Initialize Neo4j client
         client = neo4j.GraphDatabase.driver(f"bolt://{host}:{port}", auth=(username, password))
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             # Connect to the database
             with client.session() as session:
@@ -102,8 +107,8 @@ class Neo4j(Spout):
                     if not batch:
                         break
 
-                    # Save the batch of nodes and relationships to a file
-                    self.output.save(batch)
+                    # Buffer the batch of nodes and relationships
+                    buffer.extend(batch)
 
                     # Update the number of processed nodes and relationships
                     processed_nodes += len([n for n, _, _ in batch])
@@ -112,6 +117,9 @@ class Neo4j(Spout):
                         f"Total nodes processed: {processed_nodes}/{node_count}, total relationships processed: {processed_relationships}/{relationship_count}"
                     )
 
+                # Flush the remaining buffered rows
+                buffer.flush()
+
                 # Update the state
                 current_state = self.state.get_state(self.id) or {
                     "success_count": 0,
@@ -16,6 +16,8 @@
 import opentsdb
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class OpenTSDB(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -73,6 +75,9 @@ class OpenTSDB(Spout):
         # Initialize OpenTSDB client
         client = opentsdb.Client(host)
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             # Connect to the database
             with client:
@@ -91,13 +96,16 @@ class OpenTSDB(Spout):
                     if not batch:
                         break
 
-                    # Save the batch of metrics to a file
-                    self.output.save(batch)
+                    # Buffer the batch of metrics
+                    buffer.extend(batch)
 
                     # Update the number of processed metrics
                     processed_metrics += len(batch)
                     self.log.info(f"Total metrics processed: {processed_metrics}/{metric_count}")
 
+                # Flush the remaining buffered rows
+                buffer.flush()
+
                 # Update the state
                 current_state = self.state.get_state(self.id) or {
                     "success_count": 0,
@@ -13,9 +13,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import Optional
+
 import cx_Oracle
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+from geniusrise_databases.dbapi import checkpoint_key, extract_incremental, extract_keyset, extract_partitioned
+
 
 class Oracle(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -88,6 +93,9 @@ class Oracle(Spout):
         connection_string = f"oracle://{user}/{password}@{server}:{port}/{service_name}"
         connection = cx_Oracle.connect(connection_string)
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             with connection.cursor() as cursor:
                 cursor.execute(query)
@@ -99,13 +107,16 @@ class Oracle(Spout):
                     if not rows:
                         break
 
-                    # Save the fetched rows to a file
-                    self.output.save(rows)
+                    # Buffer the fetched rows
+                    buffer.extend(rows)
 
                     # Update the number of processed rows
                     processed_rows += len(rows)
                     self.log.info(f"Total rows processed: {processed_rows}/{total_rows}")
 
+                # Flush the remaining buffered rows
+                buffer.flush()
+
                 # Update the state
                 current_state = self.state.get_state(self.id) or {
                     "success_count": 0,
@@ -133,3 +144,235 @@ class Oracle(Spout):
 
         finally:
             connection.close()
+
+    def fetch_partitioned(
+        self,
+        server: str,
+        port: int,
+        service_name: str,
+        user: str,
+        password: str,
+        table: str,
+        split_column: str,
+        partitions: Optional[int] = None,
+        workers: Optional[int] = None,
+        split: str = "minmax",
+        page_size: int = 1000,
+    ) -> None:
+        """
+        🧩 Fetch a Oracle SQL table as concurrent ranges of a split column and save it in batch.
+
+        The table is split into ranges of `split_column`, and each range is read on its own connection in a
+        separate worker process that writes its own output files.
+
+        Args:
+            server (str): The Oracle SQL server.
+            port (int): The Oracle SQL port.
+            service_name (str): The Oracle service name.
+            user (str): The Oracle user.
+            password (str): The Oracle password.
+            table (str): The table to read.
+            split_column (str): The column to split the table on, ideally an indexed primary key.
+            partitions (Optional[int]): The number of ranges. Defaults to the number of CPUs.
+            workers (Optional[int]): The number of worker processes. Defaults to the number of ranges.
+            split (str): "minmax" to split the interval of a numeric or date column evenly, or "ntile" to split the
+                rows into equally sized buckets. Defaults to "minmax".
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the Oracle SQL server or execute the query.
+        """
+        # Describe how each worker connects to Oracle
+        spec = ("cx_Oracle", [], {"user": user, "password": password, "dsn": f"{server}:{port}/{service_name}"})
+
+        try:
+            processed_rows = extract_partitioned(
+                spec,
+                table,
+                split_column,
+                self.output,
+                self.top_level_arguments,
+                partitions=partitions,
+                workers=workers,
+                split=split,
+                page_size=page_size,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from Oracle SQL: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+    def fetch_keyset(
+        self,
+        server: str,
+        port: int,
+        service_name: str,
+        user: str,
+        password: str,
+        query: str,
+        order_column: str,
+        page_size: int = 1000,
+    ) -> None:
+        """
+        🔖 Fetch data from a Oracle SQL database in keyset pages, resuming where a previous run stopped.
+
+        Rows are read in pages ordered by `order_column`, and the last key of every written output file is
+        checkpointed in the state. A rerun with the same arguments resumes after that key instead of starting over.
+
+        Args:
+            server (str): The Oracle SQL server.
+            port (int): The Oracle SQL port.
+            service_name (str): The Oracle service name.
+            user (str): The Oracle user.
+            password (str): The Oracle password.
+            query (str): The SQL query to execute.
+            order_column (str): A unique column of the query result to order and page by, ideally indexed.
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the Oracle SQL server or execute the query.
+        """
+        # Describe how to connect to Oracle
+        spec = ("cx_Oracle", [], {"user": user, "password": password, "dsn": f"{server}:{port}/{service_name}"})
+
+        # The checkpoint is keyed by what is extracted, so that it is found again by a new run
+        key = checkpoint_key(self.__class__.__name__, server, port, service_name, query, order_column)
+
+        try:
+            processed_rows = extract_keyset(
+                spec,
+                query,
+                order_column,
+                self.output,
+                self.top_level_arguments,
+                self.state,
+                key,
+                page_size=page_size,
+                dialect="fetch_first",
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from Oracle SQL: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+    def fetch_incremental(
+        self,
+        server: str,
+        port: int,
+        service_name: str,
+        user: str,
+        password: str,
+        query: str,
+        watermark_column: str,
+        lookback: float = 0,
+        page_size: int = 1000,
+    ) -> None:
+        """
+        🌊 Fetch the rows of an Oracle SQL query that changed since the last run and save them in batch.
+
+        The high-water mark of `watermark_column` is kept in the state, and every run reads the rows from it up to and
+        including the current maximum. Rows that are committed late with an older value can be caught with a `lookback`
+        window. Rows that were already delivered unchanged are skipped when they are read again.
+
+        Args:
+            server (str): The Oracle SQL server.
+            port (int): The Oracle SQL port.
+            service_name (str): The Oracle service name.
+            user (str): The Oracle user.
+            password (str): The Oracle password.
+            query (str): The SQL query to execute.
+            watermark_column (str): The change-tracking column of the query result, e.g. updated_at, ideally indexed.
+            lookback (float): How far before the high-water mark to start reading, in seconds for dates and
+                timestamps and in column units for numbers. Defaults to 0.
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the Oracle SQL server or execute the query.
+        """
+        # Describe how to connect to Oracle
+        spec = ("cx_Oracle", [], {"user": user, "password": password, "dsn": f"{server}:{port}/{service_name}"})
+
+        # The high-water mark is keyed by what is extracted, so that it is found again by the next run
+        key = checkpoint_key(
+            self.__class__.__name__, "incremental", server, port, service_name, query, watermark_column
+        )
+
+        try:
+            processed_rows = extract_incremental(
+                spec,
+                query,
+                watermark_column,
+                self.output,
+                self.top_level_arguments,
+                self.state,
+                key,
+                lookback=lookback,
+                page_size=page_size,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from Oracle SQL: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
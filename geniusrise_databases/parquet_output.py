@@ -0,0 +1,364 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import shortuuid
+from geniusrise import BatchOutput
+
+from geniusrise_databases.buffered_output import BufferedOutput, to_json
+
+
+def to_record(row: Any) -> Dict[str, Any]:
+    """
+    Convert a fetched row into a mapping of column names to values.
+
+    Args:
+        row (Any): A dict, a mapping-like row such as a psycopg2 DictRow, or a sequence of column values.
+
+    Returns:
+        Dict[str, Any]: The row as a dict. Sequences get positional column names, e.g. "column_0".
+    """
+    if isinstance(row, dict):
+        return row
+    elif hasattr(row, "keys"):
+        return {key: row[key] for key in row.keys()}
+    elif isinstance(row, (list, tuple)):
+        return {f"column_{i}": value for i, value in enumerate(row)}
+    return {"value": row}
+
+
+def is_writable(data_type: pa.DataType) -> bool:
+    """
+    Check whether Parquet can store a type, which it cannot for structs without fields, at any nesting level.
+
+    Args:
+        data_type (pa.DataType): The type of a column.
+
+    Returns:
+        bool: True if the type can be written.
+    """
+    if pa.types.is_struct(data_type):
+        return data_type.num_fields > 0 and all(
+            is_writable(data_type.field(i).type) for i in range(data_type.num_fields)
+        )
+    elif pa.types.is_list(data_type) or pa.types.is_large_list(data_type) or pa.types.is_fixed_size_list(data_type):
+        return is_writable(data_type.value_type)
+    elif pa.types.is_map(data_type):
+        return is_writable(data_type.key_type) and is_writable(data_type.item_type)
+    return True
+
+
+def to_strings(values: List[Any]) -> pa.Array:
+    """
+    Convert the values of a column into a string array, encoding documents and lists as JSON.
+
+    Args:
+        values (List[Any]): The values of the column.
+
+    Returns:
+        pa.Array: The column.
+    """
+    return pa.array(
+        [
+            None
+            if value is None
+            else value
+            if isinstance(value, str)
+            else json.dumps(value, default=to_json)
+            if isinstance(value, (dict, list, tuple))
+            else str(value)
+            for value in values
+        ],
+        type=pa.string(),
+    )
+
+
+def to_array(values: List[Any], data_type: Optional[pa.DataType] = None) -> pa.Array:
+    """
+    Convert the values of a column into an Arrow array, inferring its type or converting them to a given one.
+
+    Nested documents become structs and lists become list arrays. Columns whose values have no common Arrow type,
+    e.g. mixed strings and numbers, integers beyond 64 bits or driver-specific objects such as ObjectIds, and
+    columns Parquet cannot store, e.g. empty documents, are stored as strings, with documents and lists encoded as
+    JSON.
+
+    Args:
+        values (List[Any]): The values of the column.
+        data_type (Optional[pa.DataType]): The type of the column. Defaults to the type inferred from the values.
+
+    Returns:
+        pa.Array: The column.
+
+    Raises:
+        ValueError: If the values cannot be converted to the given type.
+    """
+    if data_type is not None and pa.types.is_string(data_type):
+        return to_strings(values)
+
+    try:
+        array = pa.array(values, from_pandas=False)
+        # Parquet cannot store a struct without fields, i.e. empty documents
+        if not is_writable(array.type):
+            array = to_strings(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, OverflowError):
+        array = to_strings(values)
+
+    if data_type is None or array.type == data_type:
+        return array
+    elif pa.types.is_null(array.type):
+        return pa.nulls(len(array), data_type)
+    try:
+        return array.cast(data_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+        raise ValueError(f"Cannot convert values of type {array.type} to {data_type}: {e}") from None
+
+
+def to_table(records: List[Dict[str, Any]], schema: Optional[pa.Schema] = None) -> pa.Table:
+    """
+    Convert rows into an Arrow table whose columns are the union of the columns of all rows.
+
+    With a schema, its columns come first and keep their types, and the columns that are not in it are appended.
+    Columns without any value in the rows and without a type in the schema are stored as strings.
+
+    Args:
+        records (List[Dict[str, Any]]): The rows.
+        schema (Optional[pa.Schema]): The schema of the previous files. Defaults to None.
+
+    Returns:
+        pa.Table: The table, with nulls where a row has no value for a column.
+
+    Raises:
+        ValueError: If the values of a column cannot be converted to its type in the schema.
+    """
+    types: Dict[str, pa.DataType] = {field.name: field.type for field in schema} if schema is not None else {}
+    columns: Dict[str, None] = dict.fromkeys(types)
+    for record in records:
+        for name in record:
+            columns.setdefault(str(name), None)
+
+    arrays = {}
+    for name in columns:
+        try:
+            array = to_array([record.get(name) for record in records], types.get(name))
+        except ValueError as e:
+            raise ValueError(f"Column {name} does not fit the schema of the previous files: {e}") from None
+        # The type of a column without values is unknown, and a null column cannot take values in later files
+        arrays[name] = pa.nulls(len(array), pa.string()) if pa.types.is_null(array.type) else array
+    return pa.table(arrays)
+
+
+class ParquetOutput(BufferedOutput):
+    r"""
+    🧱 ParquetOutput: Coalesces rows fetched by a spout into Parquet files.
+
+    A drop-in replacement for `BufferedOutput` that writes each flushed buffer as a columnar Parquet file instead
+    of a JSON array. The schema is inferred from the rows of the first file, so documents with varying fields map to
+    the union of their fields, and nested documents to structs. Later files keep the types of that schema, so that
+    all files can be read as one dataset, and add the columns they introduce at its end; the schema of the last file
+    covers all of them. Columns that have no value in the file that introduces them are stored as strings. A value
+    that does not fit the type of its column, e.g. an integer beyond 64 bits in an integer column, fails the flush.
+
+    It is used by every spout when it is initialized with `output_format="parquet"`, configured with:
+        - parquet_compression (str): The compression codec, e.g. "snappy", "zstd", "gzip" or "none".
+            Defaults to "snappy".
+        - parquet_row_group_size (int): The maximum number of rows per row group. Defaults to 100000.
+        - buffer_rows, buffer_bytes and buffer_seconds: As for `BufferedOutput`, with defaults of 1000000 rows and
+            256 MiB, since Parquet benefits from large files. The size of the buffered rows is estimated from a
+            sample of their JSON encoding.
+    """
+
+    def __init__(
+        self,
+        output: BatchOutput,
+        max_rows: int = 1000000,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_seconds: float = 60.0,
+        on_flush: Optional[Callable[[str, Any], None]] = None,
+        compression: str = "snappy",
+        row_group_size: int = 100000,
+        sample_every: int = 1000,
+    ) -> None:
+        """
+        Initialize a new Parquet output.
+
+        Args:
+            output (BatchOutput): The output the buffered rows are written to.
+            max_rows (int): Maximum number of rows per file. Defaults to 1000000.
+            max_bytes (int): Maximum estimated size of the buffered rows in bytes. Defaults to 256 MiB.
+            max_seconds (float): Maximum age of a buffered row in seconds. Defaults to 60.
+            on_flush (Optional[Callable[[str, Any], None]]): Called with the name of each written file and the
+                last row in it. Defaults to None.
+            compression (str): The compression codec. Defaults to "snappy".
+            row_group_size (int): The maximum number of rows per row group. Defaults to 100000.
+            sample_every (int): How often the size of a row is measured to estimate the buffer size. Defaults to 1000.
+        """
+        super().__init__(output, max_rows=max_rows, max_bytes=max_bytes, max_seconds=max_seconds, on_flush=on_flush)
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.sample_every = sample_every
+
+        self._records: List[Dict[str, Any]] = []
+        self._batches: List[pa.RecordBatch] = []
+        self._batch_rows = 0
+        self._row_bytes = 0
+        self.schema: Optional[pa.Schema] = None
+
+    @classmethod
+    def from_arguments(
+        cls,
+        output: BatchOutput,
+        arguments: Dict[str, Any],
+        on_flush: Optional[Callable[[str, Any], None]] = None,
+    ) -> "ParquetOutput":
+        """
+        Create a Parquet output using the `buffer_*` and `parquet_*` keyword arguments of a spout.
+
+        Args:
+            output (BatchOutput): The output the buffered rows are written to.
+            arguments (Dict[str, Any]): The keyword arguments the spout was initialized with.
+            on_flush (Optional[Callable[[str, Any], None]]): Called with the name of each written file and the
+                last row in it. Defaults to None.
+
+        Returns:
+            ParquetOutput: The Parquet output.
+        """
+        return cls(
+            output,
+            max_rows=int(arguments.get("buffer_rows", 1000000)),
+            max_bytes=int(arguments.get("buffer_bytes", 256 * 1024 * 1024)),
+            max_seconds=float(arguments.get("buffer_seconds", 60.0)),
+            on_flush=on_flush,
+            compression=str(arguments.get("parquet_compression", "snappy")),
+            row_group_size=int(arguments.get("parquet_row_group_size", 100000)),
+        )
+
+    def __len__(self) -> int:
+        return len(self._records) + self._batch_rows
+
+    def add(self, row: Any) -> None:
+        """
+        ➕ Add a single row to the buffer, flushing it if any threshold is reached.
+
+        Args:
+            row (Any): The row to add.
+        """
+        # Rows and record batches are written to separate files
+        if self._batches:
+            self.flush()
+
+        record = to_record(row)
+        if len(self._records) % self.sample_every == 0:
+            self._row_bytes = len(json.dumps(record, default=to_json)) + 2
+        if self._started is None:
+            self._started = time.monotonic()
+
+        self._records.append(record)
+        self._bytes += self._row_bytes
+        self._last_row = row
+
+        if self.is_due():
+            self.flush()
+
+    def add_batch(self, batch: pa.RecordBatch) -> None:
+        """
+        ➕ Add an Arrow record batch to the buffer as it is, flushing it if any threshold is reached.
+
+        The batch is written without being converted into Python rows, for sources that read Arrow data. All batches
+        of a file must have the same schema.
+
+        Args:
+            batch (pa.RecordBatch): The record batch to add.
+        """
+        if self._records:
+            self.flush()
+        if batch.num_rows == 0:
+            return
+        if self._started is None:
+            self._started = time.monotonic()
+
+        self._batches.append(batch)
+        self._batch_rows += batch.num_rows
+        self._bytes += batch.nbytes
+
+        if self.is_due():
+            self.flush()
+
+    def is_due(self) -> bool:
+        """
+        Check whether the buffer has reached any of its thresholds.
+
+        Returns:
+            bool: True if the buffer should be flushed.
+        """
+        if not len(self):
+            return False
+        return (
+            len(self) >= self.max_rows
+            or self._bytes >= self.max_bytes
+            or time.monotonic() - self._started >= self.max_seconds  # type: ignore
+        )
+
+    def flush(self) -> Optional[str]:
+        """
+        💾 Write the buffered rows to a new Parquet file in the output folder.
+
+        Returns:
+            Optional[str]: The name of the written file, or None if the buffer was empty.
+
+        Raises:
+            ValueError: If the values of a column do not fit its type in the schema of the previous files.
+        """
+        if not len(self):
+            return None
+
+        if self._batches:
+            table = pa.Table.from_batches(self._batches)
+            if self.schema is not None and table.schema.names == self.schema.names:
+                table = table.cast(self.schema)
+            if self.on_flush is not None:
+                self._last_row = self._batches[-1].slice(self._batches[-1].num_rows - 1).to_pylist()[0]
+        else:
+            table = to_table(self._records, self.schema)
+        self.schema = table.schema
+        filename = f"{shortuuid.uuid()}.parquet"
+        pq.write_table(
+            table,
+            os.path.join(self.output.output_folder, filename),
+            compression=self.compression,
+            row_group_size=self.row_group_size,
+        )
+
+        count = len(self)
+        self.rows_written += count
+        self.files_written += 1
+        self.log.debug(f"✅ Wrote {count} rows into {self.output.output_folder}/{filename}.")
+
+        last_row = self._last_row
+        self._records = []
+        self._batches = []
+        self._batch_rows = 0
+        self._bytes = 0
+        self._started = None
+        self._last_row = None
+
+        if self.on_flush is not None:
+            self.on_flush(filename, last_row)
+        return filename
@@ -13,10 +13,145 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import csv
+import io
+from itertools import islice
+from typing import Any, List, Optional
+
 import psycopg2
 from geniusrise import BatchOutput, Spout, State
 from psycopg2.extras import DictCursor
 
+from geniusrise_databases.buffered_output import BufferedOutput, RollingFileOutput
+
+COPY_EXTENSIONS = {"csv": ".csv", "text": ".txt", "binary": ".bin"}
+
+
+def cursor_factory(row_format: str = "dict") -> type:
+    """
+    Select the psycopg2 cursor class for a row format.
+
+    Args:
+        row_format (str): "dict" for DictRow rows or "tuple" for plain tuples. Defaults to "dict".
+
+    Returns:
+        type: The psycopg2 cursor class.
+
+    Raises:
+        ValueError: If the row format is not supported.
+    """
+    if row_format == "dict":
+        return DictCursor
+    elif row_format == "tuple":
+        return psycopg2.extensions.cursor
+    else:
+        raise ValueError(f"Invalid row format: {row_format}")
+
+
+def open_cursor(connection: Any, streaming: bool = False, itersize: int = 2000) -> Any:
+    """
+    Open a cursor on a psycopg2 connection.
+
+    A client-side cursor receives the whole result set into libpq memory when the query is executed. A named
+    cursor is declared on the server instead, and iterating over it transfers `itersize` rows per round trip.
+
+    Args:
+        connection (Any): The psycopg2 connection.
+        streaming (bool): Whether to open a named server-side cursor. Defaults to False.
+        itersize (int): The number of rows a named cursor transfers per round trip. Defaults to 2000.
+
+    Returns:
+        Any: The cursor.
+    """
+    if not streaming:
+        return connection.cursor()
+
+    cursor = connection.cursor(name="geniusrise_fetch")
+    cursor.itersize = itersize
+    return cursor
+
+
+class CopyRowParser:
+    """
+    A file-like target for `copy_expert` that parses `COPY ... (FORMAT csv)` rows into dicts and adds them
+    to a `BufferedOutput`.
+    """
+
+    def __init__(self, columns: List[str], buffer: BufferedOutput, encoding: str = "utf-8") -> None:
+        self.columns = columns
+        self.buffer = buffer
+        self.encoding = encoding
+        self.bytes_written = 0
+
+    def write(self, data: bytes) -> None:
+        self.bytes_written += len(data)
+        for values in csv.reader(io.StringIO(data.decode(self.encoding))):
+            self.buffer.add(dict(zip(self.columns, values)))
+
+
+def copy_to_output(
+    connection: Any,
+    query: str,
+    output: BatchOutput,
+    copy_format: str = "csv",
+    file_size: int = 256 * 1024 * 1024,
+    chunk_size: int = 8 * 1024 * 1024,
+    buffer: Optional[BufferedOutput] = None,
+) -> int:
+    """
+    Stream the result of a query out of the server with `COPY (query) TO STDOUT`.
+
+    Without a buffer, the raw COPY data is written straight into rolled files in the output folder. CSV files
+    start with a header line. Binary COPY data carries a single header and trailer for the whole stream, so it
+    is never rolled. With a buffer, CSV rows are parsed into dicts keyed by column name and added to it.
+
+    Args:
+        connection (Any): The psycopg2 connection.
+        query (str): The SQL query to export.
+        output (BatchOutput): The output whose folder the files are written to.
+        copy_format (str): "csv", "text" or "binary". Defaults to "csv".
+        file_size (int): The size after which a new file is started. Defaults to 256 MiB.
+        chunk_size (int): The size of the write buffer of each file. Defaults to 8 MiB.
+        buffer (Optional[BufferedOutput]): The buffer parsed rows are added to. Defaults to None.
+
+    Returns:
+        int: The number of bytes received from the server.
+
+    Raises:
+        ValueError: If the COPY format is not supported, or rows of a non-CSV format are to be parsed.
+    """
+    if copy_format not in COPY_EXTENSIONS:
+        raise ValueError(f"Invalid COPY format: {copy_format}")
+    if buffer is not None and copy_format != "csv":
+        raise ValueError("Only CSV COPY data can be parsed into rows")
+
+    with connection.cursor() as cursor:
+        # Describe the result without running the query to get the column names
+        cursor.execute(f"SELECT * FROM ({query}) AS q LIMIT 0")
+        columns = [column[0] for column in cursor.description]
+
+        statement = f"COPY ({query}) TO STDOUT WITH (FORMAT {copy_format})"
+        if buffer is not None:
+            parser = CopyRowParser(columns, buffer, psycopg2.extensions.encodings[connection.encoding])
+            cursor.copy_expert(statement, parser)
+            return parser.bytes_written
+
+        header = b""
+        if copy_format == "csv":
+            line = io.StringIO()
+            csv.writer(line, lineterminator="\n").writerow(columns)
+            header = line.getvalue().encode(psycopg2.extensions.encodings[connection.encoding])
+
+        with RollingFileOutput(
+            output,
+            extension=COPY_EXTENSIONS[copy_format],
+            max_bytes=0 if copy_format == "binary" else file_size,
+            header=header,
+            chunk_size=chunk_size,
+        ) as writer:
+            cursor.copy_expert(statement, writer)
+        return writer.bytes_written
+
 
 class PostgreSQL(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -39,6 +174,17 @@ class PostgreSQL(Spout):
                 --args host=localhost port=5432 user=postgres password=postgres database=mydb query="SELECT * FROM table" page_size=100
         ```
 
+        ## Bulk export with COPY via command line
+        ```bash
+        genius PostgreSQL rise \
+            batch \
+                --output_s3_bucket my_bucket \
+                --output_s3_folder s3/folder \
+            none \
+            copy \
+                --args host=localhost port=5432 user=postgres password=postgres database=mydb query="SELECT * FROM table" copy_format=csv
+        ```
+
         ## Using geniusrise to invoke via YAML file
         ```yaml
         version: "1"
@@ -73,6 +219,9 @@ class PostgreSQL(Spout):
         database: str,
         query: str,
         page_size: int = 100,
+        streaming: bool = False,
+        itersize: int = 2000,
+        row_format: str = "dict",
     ):
         """
         📖 Fetch data from a PostgreSQL database and save it in batch.
@@ -85,6 +234,11 @@ class PostgreSQL(Spout):
             database (str): The PostgreSQL database name.
             query (str): The SQL query to execute.
             page_size (int): The number of rows to fetch per page. Defaults to 100.
+            streaming (bool): Whether to read rows through a named server-side cursor, so that memory stays flat
+                regardless of the size of the result set. Defaults to False.
+            itersize (int): The number of rows a server-side cursor transfers per network round trip. Defaults to 2000.
+            row_format (str): "dict" to fetch rows as DictRow, or "tuple" to fetch them as plain tuples.
+                Defaults to "dict".
 
         Raises:
             Exception: If unable to connect to the PostgreSQL server or execute the query.
@@ -96,27 +250,33 @@ class PostgreSQL(Spout):
             user=user,
             password=password,
             dbname=database,
-            cursor_factory=DictCursor,
+            cursor_factory=cursor_factory(row_format),
         )
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
-            with connection.cursor() as cursor:
+            with open_cursor(connection, streaming=streaming, itersize=itersize) as cursor:
                 cursor.execute(query)
-                total_rows = cursor.rowcount
+                total_rows = "?" if streaming else cursor.rowcount
                 processed_rows = 0
 
                 while True:
-                    rows = cursor.fetchmany(page_size)
+                    rows = list(islice(cursor, page_size))
                     if not rows:
                         break
 
-                    # Save the fetched rows to a file
-                    self.output.save(rows)
+                    # Buffer the fetched rows
+                    buffer.extend(rows)
 
                     # Update the number of processed rows
                     processed_rows += len(rows)
                     self.log.info(f"Total rows processed: {processed_rows}/{total_rows}")
 
+                # Flush the remaining buffered rows
+                buffer.flush()
+
                 # Update the state
                 current_state = self.state.get_state(self.id) or {
                     "success_count": 0,
@@ -144,3 +304,326 @@ class PostgreSQL(Spout):
 
         finally:
             connection.close()
+
+    def copy(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        query: str,
+        copy_format: str = "csv",
+        file_size: int = 256 * 1024 * 1024,
+        chunk_size: int = 8 * 1024 * 1024,
+        transform: Optional[str] = None,
+    ):
+        """
+        📦 Export data from a PostgreSQL database with `COPY (query) TO STDOUT` and save it in batch.
+
+        The COPY data is written to the output folder as it arrives, without being parsed into Python objects,
+        which is much faster than fetching rows through a cursor for large extracts.
+
+        Args:
+            host (str): The PostgreSQL host.
+            port (int): The PostgreSQL port.
+            user (str): The PostgreSQL user.
+            password (str): The PostgreSQL password.
+            database (str): The PostgreSQL database name.
+            query (str): The SQL query to export.
+            copy_format (str): The COPY format, "csv", "text" or "binary". Defaults to "csv".
+            file_size (int): The size in bytes after which a new output file is started. Defaults to 256 MiB.
+            chunk_size (int): The size in bytes of the write buffer of each output file. Defaults to 8 MiB.
+            transform (Optional[str]): Set to "json" to parse CSV rows into dicts and save them like `fetch` does.
+                Defaults to None.
+
+        Raises:
+            Exception: If unable to connect to the PostgreSQL server or execute the query.
+        """
+        # Initialize the output buffer for parsed rows
+        buffer = None
+        if transform == "json":
+            buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+        elif transform is not None:
+            raise ValueError(f"Invalid transform: {transform}")
+
+        # Initialize PostgreSQL connection
+        connection = psycopg2.connect(
+            host=host,
+            port=port,
+            user=user,
+            password=password,
+            dbname=database,
+        )
+
+        try:
+            processed_bytes = copy_to_output(
+                connection,
+                query,
+                self.output,
+                copy_format=copy_format,
+                file_size=file_size,
+                chunk_size=chunk_size,
+                buffer=buffer,
+            )
+
+            # Flush the remaining buffered rows
+            if buffer is not None:
+                buffer.flush()
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_bytes": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_bytes"] = processed_bytes
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of bytes processed
+            self.log.info(f"Total bytes processed: {processed_bytes}")
+
+        except Exception as e:
+            self.log.error(f"Error copying data from PostgreSQL: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_bytes": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+        finally:
+            connection.close()
+
+    def fetch_partitioned(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        table: str,
+        split_column: str,
+        partitions: Optional[int] = None,
+        workers: Optional[int] = None,
+        split: str = "minmax",
+        page_size: int = 1000,
+    ) -> None:
+        """
+        🧩 Fetch a PostgreSQL table as concurrent ranges of a split column and save it in batch.
+
+        The table is split into ranges of `split_column`, and each range is read on its own connection in a
+        separate worker process that writes its own output files.
+
+        Args:
+            host (str): The PostgreSQL host.
+            port (int): The PostgreSQL port.
+            user (str): The PostgreSQL user.
+            password (str): The PostgreSQL password.
+            database (str): The PostgreSQL database name.
+            table (str): The table to read.
+            split_column (str): The column to split the table on, ideally an indexed primary key.
+            partitions (Optional[int]): The number of ranges. Defaults to the number of CPUs.
+            workers (Optional[int]): The number of worker processes. Defaults to the number of ranges.
+            split (str): "minmax" to split the interval of a numeric or date column evenly, or "ntile" to split the
+                rows into equally sized buckets. Defaults to "minmax".
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the PostgreSQL server or execute the query.
+        """
+        # Describe how each worker connects to PostgreSQL
+        spec = ("psycopg2", [], {"host": host, "port": port, "user": user, "password": password, "dbname": database})
+
+        try:
+            processed_rows = extract_partitioned(
+                spec,
+                table,
+                split_column,
+                self.output,
+                self.top_level_arguments,
+                partitions=partitions,
+                workers=workers,
+                split=split,
+                page_size=page_size,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from PostgreSQL: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+    def fetch_keyset(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        query: str,
+        order_column: str,
+        page_size: int = 1000,
+    ) -> None:
+        """
+        🔖 Fetch data from a PostgreSQL database in keyset pages, resuming where a previous run stopped.
+
+        Rows are read in pages ordered by `order_column`, and the last key of every written output file is
+        checkpointed in the state. A rerun with the same arguments resumes after that key instead of starting over.
+
+        Args:
+            host (str): The PostgreSQL host.
+            port (int): The PostgreSQL port.
+            user (str): The PostgreSQL user.
+            password (str): The PostgreSQL password.
+            database (str): The PostgreSQL database name.
+            query (str): The SQL query to execute.
+            order_column (str): A unique column of the query result to order and page by, ideally indexed.
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the PostgreSQL server or execute the query.
+        """
+        # Describe how to connect to PostgreSQL
+        spec = ("psycopg2", [], {"host": host, "port": port, "user": user, "password": password, "dbname": database})
+
+        # The checkpoint is keyed by what is extracted, so that it is found again by a new run
+        key = checkpoint_key(self.__class__.__name__, host, port, database, query, order_column)
+
+        try:
+            processed_rows = extract_keyset(
+                spec,
+                query,
+                order_column,
+                self.output,
+                self.top_level_arguments,
+                self.state,
+                key,
+                page_size=page_size,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from PostgreSQL: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+    def fetch_incremental(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        query: str,
+        watermark_column: str,
+        lookback: float = 0,
+        page_size: int = 1000,
+    ) -> None:
+        """
+        🌊 Fetch the rows of a PostgreSQL query that changed since the last run and save them in batch.
+
+        The high-water mark of `watermark_column` is kept in the state, and every run reads the rows from it up to and
+        including the current maximum. Rows that are committed late with an older value can be caught with a `lookback`
+        window. Rows that were already delivered unchanged are skipped when they are read again.
+
+        Args:
+            host (str): The PostgreSQL host.
+            port (int): The PostgreSQL port.
+            user (str): The PostgreSQL user.
+            password (str): The PostgreSQL password.
+            database (str): The PostgreSQL database name.
+            query (str): The SQL query to execute.
+            watermark_column (str): The change-tracking column of the query result, e.g. updated_at, ideally indexed.
+            lookback (float): How far before the high-water mark to start reading, in seconds for dates and
+                timestamps and in column units for numbers. Defaults to 0.
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the PostgreSQL server or execute the query.
+        """
+        # Describe how to connect to PostgreSQL
+        spec = ("psycopg2", [], {"host": host, "port": port, "user": user, "password": password, "dbname": database})
+
+        # The high-water mark is keyed by what is extracted, so that it is found again by the next run
+        key = checkpoint_key(self.__class__.__name__, "incremental", host, port, database, query, watermark_column)
+
+        try:
+            processed_rows = extract_incremental(
+                spec,
+                query,
+                watermark_column,
+                self.output,
+                self.top_level_arguments,
+                self.state,
+                key,
+                lookback=lookback,
+                page_size=page_size,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from PostgreSQL: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
@@ -13,9 +13,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import Optional
+
 import prestodb
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+from geniusrise_databases.dbapi import select_query
+
 
 class Presto(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -70,10 +75,15 @@ class Presto(Spout):
         catalog: str,
         schema: str,
         table: str,
+        columns: Optional[str] = None,
+        where: Optional[str] = None,
+        limit: Optional[int] = None,
     ):
         """
         📖 Fetch data from a Presto table and save it in batch.
 
+        The projection, filter and limit are part of the query, so Presto pushes them down to the connector.
+
         Args:
             host (str): The Presto host.
             username (str): The Presto username.
@@ -81,6 +91,9 @@ class Presto(Spout):
             catalog (str): The Presto catalog name.
             schema (str): The Presto schema name.
             table (str): The name of the Presto table.
+            columns (Optional[str]): Comma-separated list of the columns to read. Defaults to all columns.
+            where (Optional[str]): A filter the rows are restricted to, e.g. "country = 'US'". Defaults to all rows.
+            limit (Optional[int]): The largest number of rows to read. Defaults to no limit.
 
         Raises:
             Exception: If unable to connect to the Presto server or execute the command.
@@ -92,18 +105,24 @@ class Presto(Spout):
             self.log.error(f"Error connecting to Presto server: {e}")
             return
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         # Perform the Presto operation
         try:
             cursor = conn.cursor()
-            cursor.execute(f"SELECT * FROM {catalog}.{schema}.{table}")
+            cursor.execute(select_query(f"{catalog}.{schema}.{table}", columns, where, limit))
 
             while True:
                 row = cursor.fetchone()
                 if not row:
                     break
 
-                # Save the fetched row to a file
-                self.output.save(row)
+                # Buffer the fetched row
+                buffer.add(row)
+
+            # Flush the remaining buffered rows
+            buffer.flush()
 
             # Update the state
             current_state = self.state.get_state(self.id) or {
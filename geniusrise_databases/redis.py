@@ -16,6 +16,8 @@
 import redis  # type: ignore
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class Redis(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -87,6 +89,9 @@ class Redis(Spout):
             db=database,
         )
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             # Get the number of keys in the database
             count = connection.dbsize()
@@ -106,13 +111,16 @@ class Redis(Spout):
                 # Get the values for each key in the batch
                 values = connection.mget(batch)
 
-                # Save the batch of key-value pairs to a file
-                self.output.save(list(zip(batch, values)))
+                # Buffer the batch of key-value pairs
+                buffer.extend(zip(batch, values))
 
                 # Update the number of processed rows
                 processed_rows += len(batch)
                 self.log.info(f"Total rows processed: {processed_rows}/{count}")
 
+            # Flush the remaining buffered rows
+            buffer.flush()
+
             # Update the state
             current_state = self.state.get_state(self.id) or {
                 "success_count": 0,
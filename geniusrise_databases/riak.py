@@ -16,6 +16,8 @@
 import riak
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class Riak(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -76,6 +78,9 @@ class Riak(Spout):
         # Initialize Riak client
         client = riak.RiakClient(host=host, port=port)
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             # Connect to the database
             with client as bucket:
@@ -94,13 +99,16 @@ class Riak(Spout):
                     if not batch:
                         break
 
-                    # Save the batch of objects to a file
-                    self.output.save(batch)
+                    # Buffer the batch of objects
+                    buffer.extend(batch)
 
                     # Update the number of processed objects
                     processed_objects += len(batch)
                     self.log.info(f"Total objects processed: {processed_objects}/{count}")
 
+                # Flush the remaining buffered rows
+                buffer.flush()
+
                 # Update the state
                 current_state = self.state.get_state(self.id) or {
                     "success_count": 0,
@@ -13,9 +13,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import Optional
+
 import google.cloud.spanner
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+from geniusrise_databases.dbapi import select_query
+
 
 class Spanner(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -60,15 +65,29 @@ class Spanner(Spout):
         super().__init__(output, state)
         self.top_level_arguments = kwargs
 
-    def fetch(self, project_id: str, instance_id: str, database_id: str, table_id: str):
+    def fetch(
+        self,
+        project_id: str,
+        instance_id: str,
+        database_id: str,
+        table_id: str,
+        columns: Optional[str] = None,
+        where: Optional[str] = None,
+        limit: Optional[int] = None,
+    ):
         """
-        📖 Fetch data from a Spanner database and save it in batch.
+        📖 Fetch data from a Spanner table and save it in batch.
+
+        The table is read in a read-only snapshot, with the projection, filter and limit part of the query.
 
         Args:
             project_id (str): The Google Cloud project ID.
             instance_id (str): The Spanner instance ID.
             database_id (str): The Spanner database ID.
             table_id (str): The Spanner table ID.
+            columns (Optional[str]): Comma-separated list of the columns to read. Defaults to all columns.
+            where (Optional[str]): A filter the rows are restricted to, e.g. "country = 'US'". Defaults to all rows.
+            limit (Optional[int]): The largest number of rows to read. Defaults to no limit.
 
         Raises:
             Exception: If unable to connect to the Spanner database or execute the query.
@@ -76,10 +95,15 @@ class Spanner(Spout):
         # Initialize Spanner client
         client = google.cloud.spanner.Client(project=project_id)
 
-        # Execute the query and save the results to a file
-        with client.session(database=database_id) as session:
-            results = session.execute(f"SELECT * FROM {table_id}")
-            self.output.save(results)
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
+        # Execute the query and buffer the results
+        database = client.instance(instance_id).database(database_id)
+        with database.snapshot() as snapshot:
+            results = snapshot.execute_sql(select_query(table_id, columns, where, limit))
+            buffer.extend(results)
+            buffer.flush()
 
             # Update the state
             current_state = self.state.get_state(self.id) or {
@@ -88,5 +112,5 @@ class Spanner(Spout):
                 "processed_rows": 0,
             }
             current_state["success_count"] += 1
-            current_state["processed_rows"] = len(results)
+            current_state["processed_rows"] = buffer.rows_written
             self.state.set_state(self.id, current_state)
@@ -20,6 +20,8 @@ from typing import Any, Dict
 import boto3
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class SQLite(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs: Any) -> None:
@@ -86,6 +88,9 @@ class SQLite(Spout):
         connection = sqlite3.connect(local_path)
         connection.row_factory = sqlite3.Row  # To get dict-like rows
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             cursor = connection.cursor()
             cursor.execute(query)
@@ -99,13 +104,16 @@ class SQLite(Spout):
                 # Convert rows to dictionaries
                 rows = [dict(row) for row in rows]
 
-                # Save the fetched rows to a file
-                self.output.save(rows)
+                # Buffer the fetched rows
+                buffer.extend(rows)
 
                 # Update the number of processed rows
                 processed_rows += len(rows)
                 self.log.info(f"Processed rows: {processed_rows}")
 
+            # Flush the remaining buffered rows
+            buffer.flush()
+
             # Update the state
             current_state: Dict[str, Any] = self.state.get_state(self.id) or {
                 "success_count": 0,
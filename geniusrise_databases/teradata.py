@@ -13,9 +13,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import pyteradata
+from typing import Optional
+
+import teradatasql
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+from geniusrise_databases.dbapi import (
+    checkpoint_key,
+    extract_incremental,
+    extract_keyset,
+    extract_partitioned,
+    select_query,
+)
+
 
 class Teradata(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -35,7 +46,7 @@ class Teradata(Spout):
                 --output_s3_folder s3/folder \
             none \
             fetch \
-                --args host=myteradata.example.com username=myusername password=mypassword database=mydb
+                --args host=myteradata.example.com username=myusername password=mypassword database=mydb table=mytable
         ```
 
         ## Using geniusrise to invoke via YAML file
@@ -50,6 +61,7 @@ class Teradata(Spout):
                     username: "myusername"
                     password: "mypassword"
                     database: "mydb"
+                    table: "mytable"
                 output:
                     type: "batch"
                     args:
@@ -66,39 +78,52 @@ class Teradata(Spout):
         username: str,
         password: str,
         database: str,
+        table: str,
+        columns: Optional[str] = None,
+        where: Optional[str] = None,
+        limit: Optional[int] = None,
     ):
         """
-        📖 Fetch data from a Teradata database and save it in batch.
+        📖 Fetch data from a Teradata table and save it in batch.
 
         Args:
             host (str): The Teradata host.
             username (str): The Teradata username.
             password (str): The Teradata password.
             database (str): The Teradata database name.
+            table (str): The table to read.
+            columns (Optional[str]): Comma-separated list of the columns to read. Defaults to all columns.
+            where (Optional[str]): A filter the rows are restricted to, e.g. "country = 'US'". Defaults to all rows.
+            limit (Optional[int]): The largest number of rows to read. Defaults to no limit.
 
         Raises:
             Exception: If unable to connect to the Teradata server or execute the command.
         """
         # Initialize the Teradata connection
         try:
-            conn = pyteradata.connect(host=host, username=username, password=password)
-            conn.database = database
+            conn = teradatasql.connect(host=host, user=username, password=password, database=database)
         except Exception as e:
             self.log.error(f"Error connecting to Teradata server: {e}")
             return
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         # Perform the Teradata operation
         try:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM mytable")
+            cursor.execute(select_query(table, columns, where, limit, dialect="top"))
 
             while True:
                 row = cursor.fetchone()
                 if not row:
                     break
 
-                # Save the fetched row to a file
-                self.output.save(row)
+                # Buffer the fetched row
+                buffer.add(row)
+
+            # Flush the remaining buffered rows
+            buffer.flush()
 
             # Update the state
             current_state = self.state.get_state(self.id) or {
@@ -121,3 +146,227 @@ class Teradata(Spout):
 
         finally:
             conn.close()
+
+    def fetch_partitioned(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        database: str,
+        table: str,
+        split_column: str,
+        partitions: Optional[int] = None,
+        workers: Optional[int] = None,
+        split: str = "minmax",
+        page_size: int = 1000,
+    ) -> None:
+        """
+        🧩 Fetch a Teradata table as concurrent ranges of a split column and save it in batch.
+
+        The table is split into ranges of `split_column`, and each range is read on its own connection in a
+        separate worker process that writes its own output files.
+
+        Args:
+            host (str): The Teradata host.
+            username (str): The Teradata username.
+            password (str): The Teradata password.
+            database (str): The Teradata database name.
+            table (str): The table to read.
+            split_column (str): The column to split the table on, ideally an indexed primary key.
+            partitions (Optional[int]): The number of ranges. Defaults to the number of CPUs.
+            workers (Optional[int]): The number of worker processes. Defaults to the number of ranges.
+            split (str): "minmax" to split the interval of a numeric or date column evenly, or "ntile" to split the
+                rows into equally sized buckets. Defaults to "minmax".
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the Teradata server or execute the query.
+        """
+        # Describe how each worker connects to Teradata
+        spec = ("teradatasql", [], {"host": host, "user": username, "password": password, "database": database})
+
+        try:
+            processed_rows = extract_partitioned(
+                spec,
+                table,
+                split_column,
+                self.output,
+                self.top_level_arguments,
+                partitions=partitions,
+                workers=workers,
+                split=split,
+                page_size=page_size,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from Teradata: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+    def fetch_keyset(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        database: str,
+        query: str,
+        order_column: str,
+        page_size: int = 1000,
+    ) -> None:
+        """
+        🔖 Fetch data from a Teradata database in keyset pages, resuming where a previous run stopped.
+
+        Rows are read in pages ordered by `order_column`, and the last key of every written output file is
+        checkpointed in the state. A rerun with the same arguments resumes after that key instead of starting over.
+
+        Args:
+            host (str): The Teradata host.
+            username (str): The Teradata username.
+            password (str): The Teradata password.
+            database (str): The Teradata database name.
+            query (str): The SQL query to execute.
+            order_column (str): A unique column of the query result to order and page by, ideally indexed.
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the Teradata server or execute the query.
+        """
+        # Describe how to connect to Teradata
+        spec = ("teradatasql", [], {"host": host, "user": username, "password": password, "database": database})
+
+        # The checkpoint is keyed by what is extracted, so that it is found again by a new run
+        key = checkpoint_key(self.__class__.__name__, host, database, query, order_column)
+
+        try:
+            processed_rows = extract_keyset(
+                spec,
+                query,
+                order_column,
+                self.output,
+                self.top_level_arguments,
+                self.state,
+                key,
+                page_size=page_size,
+                dialect="top",
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from Teradata: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+    def fetch_incremental(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        database: str,
+        query: str,
+        watermark_column: str,
+        lookback: float = 0,
+        page_size: int = 1000,
+    ) -> None:
+        """
+        🌊 Fetch the rows of a Teradata query that changed since the last run and save them in batch.
+
+        The high-water mark of `watermark_column` is kept in the state, and every run reads the rows from it up to and
+        including the current maximum. Rows that are committed late with an older value can be caught with a `lookback`
+        window. Rows that were already delivered unchanged are skipped when they are read again.
+
+        Args:
+            host (str): The Teradata host.
+            username (str): The Teradata username.
+            password (str): The Teradata password.
+            database (str): The Teradata database name.
+            query (str): The SQL query to execute.
+            watermark_column (str): The change-tracking column of the query result, e.g. updated_at, ideally indexed.
+            lookback (float): How far before the high-water mark to start reading, in seconds for dates and
+                timestamps and in column units for numbers. Defaults to 0.
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the Teradata server or execute the query.
+        """
+        # Describe how to connect to Teradata
+        spec = ("teradatasql", [], {"host": host, "user": username, "password": password, "database": database})
+
+        # The high-water mark is keyed by what is extracted, so that it is found again by the next run
+        key = checkpoint_key(self.__class__.__name__, "incremental", host, database, query, watermark_column)
+
+        try:
+            processed_rows = extract_incremental(
+                spec,
+                query,
+                watermark_column,
+                self.output,
+                self.top_level_arguments,
+                self.state,
+                key,
+                lookback=lookback,
+                page_size=page_size,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from Teradata: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
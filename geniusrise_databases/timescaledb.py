@@ -13,11 +13,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Dict
+from itertools import islice
+from typing import Any, Dict, Optional
 
 import psycopg2
 from geniusrise import BatchOutput, Spout, State
-from psycopg2.extras import DictCursor
+
+from geniusrise_databases.buffered_output import BufferedOutput
+from geniusrise_databases.dbapi import checkpoint_key, extract_incremental, extract_keyset
+from geniusrise_databases.postgres import copy_to_output, cursor_factory, open_cursor
 
 
 class TimescaleDB(Spout):
@@ -75,6 +79,9 @@ class TimescaleDB(Spout):
         database: str,
         query: str,
         page_size: int = 100,
+        streaming: bool = False,
+        itersize: int = 2000,
+        row_format: str = "dict",
     ) -> None:
         """
         📖 Fetch data from a TimescaleDB hypertable and save it in batch.
@@ -87,6 +94,11 @@ class TimescaleDB(Spout):
             database (str): The TimescaleDB database name.
             query (str): The SQL query to execute.
             page_size (int): The number of rows to fetch per page. Defaults to 100.
+            streaming (bool): Whether to read rows through a named server-side cursor, so that memory stays flat
+                regardless of the size of the result set. Defaults to False.
+            itersize (int): The number of rows a server-side cursor transfers per network round trip. Defaults to 2000.
+            row_format (str): "dict" to fetch rows as DictRow, or "tuple" to fetch them as plain tuples.
+                Defaults to "dict".
 
         Raises:
             Exception: If unable to connect to the TimescaleDB server or execute the query.
@@ -98,27 +110,33 @@ class TimescaleDB(Spout):
             user=user,
             password=password,
             dbname=database,
-            cursor_factory=DictCursor,
+            cursor_factory=cursor_factory(row_format),
         )
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
-            with connection.cursor() as cursor:
+            with open_cursor(connection, streaming=streaming, itersize=itersize) as cursor:
                 cursor.execute(query)
-                total_rows = cursor.rowcount
+                total_rows = "?" if streaming else cursor.rowcount
                 processed_rows = 0
 
                 while True:
-                    rows = cursor.fetchmany(page_size)
+                    rows = list(islice(cursor, page_size))
                     if not rows:
                         break
 
-                    # Save the fetched rows to a file
-                    self.output.save(rows)
+                    # Buffer the fetched rows
+                    buffer.extend(rows)
 
                     # Update the number of processed rows
                     processed_rows += len(rows)
                     self.log.info(f"Total rows processed: {processed_rows}/{total_rows}")
 
+                # Flush the remaining buffered rows
+                buffer.flush()
+
                 # Update the state
                 current_state: Dict[str, Any] = self.state.get_state(self.id) or {
                     "success_count": 0,
@@ -146,3 +164,248 @@ class TimescaleDB(Spout):
 
         finally:
             connection.close()
+
+    def copy(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        query: str,
+        copy_format: str = "csv",
+        file_size: int = 256 * 1024 * 1024,
+        chunk_size: int = 8 * 1024 * 1024,
+        transform: Optional[str] = None,
+    ) -> None:
+        """
+        📦 Export data from a TimescaleDB hypertable with `COPY (query) TO STDOUT` and save it in batch.
+
+        The COPY data is written to the output folder as it arrives, without being parsed into Python objects,
+        which is much faster than fetching rows through a cursor for large extracts.
+
+        Args:
+            host (str): The TimescaleDB host.
+            port (int): The TimescaleDB port.
+            user (str): The TimescaleDB user.
+            password (str): The TimescaleDB password.
+            database (str): The TimescaleDB database name.
+            query (str): The SQL query to export.
+            copy_format (str): The COPY format, "csv", "text" or "binary". Defaults to "csv".
+            file_size (int): The size in bytes after which a new output file is started. Defaults to 256 MiB.
+            chunk_size (int): The size in bytes of the write buffer of each output file. Defaults to 8 MiB.
+            transform (Optional[str]): Set to "json" to parse CSV rows into dicts and save them like `fetch` does.
+                Defaults to None.
+
+        Raises:
+            Exception: If unable to connect to the TimescaleDB server or execute the query.
+        """
+        # Initialize the output buffer for parsed rows
+        buffer = None
+        if transform == "json":
+            buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+        elif transform is not None:
+            raise ValueError(f"Invalid transform: {transform}")
+
+        # Initialize TimescaleDB connection
+        connection = psycopg2.connect(
+            host=host,
+            port=port,
+            user=user,
+            password=password,
+            dbname=database,
+        )
+
+        try:
+            processed_bytes = copy_to_output(
+                connection,
+                query,
+                self.output,
+                copy_format=copy_format,
+                file_size=file_size,
+                chunk_size=chunk_size,
+                buffer=buffer,
+            )
+
+            # Flush the remaining buffered rows
+            if buffer is not None:
+                buffer.flush()
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_bytes": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_bytes"] = processed_bytes
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of bytes processed
+            self.log.info(f"Total bytes processed: {processed_bytes}")
+
+        except Exception as e:
+            self.log.error(f"Error copying data from TimescaleDB: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_bytes": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+        finally:
+            connection.close()
+
+    def fetch_keyset(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        query: str,
+        order_column: str,
+        page_size: int = 1000,
+    ) -> None:
+        """
+        🔖 Fetch data from a TimescaleDB database in keyset pages, resuming where a previous run stopped.
+
+        Rows are read in pages ordered by `order_column`, and the last key of every written output file is
+        checkpointed in the state. A rerun with the same arguments resumes after that key instead of starting over.
+
+        Args:
+            host (str): The TimescaleDB host.
+            port (int): The TimescaleDB port.
+            user (str): The TimescaleDB user.
+            password (str): The TimescaleDB password.
+            database (str): The TimescaleDB database name.
+            query (str): The SQL query to execute.
+            order_column (str): A unique column of the query result to order and page by, ideally indexed.
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the TimescaleDB server or execute the query.
+        """
+        # Describe how to connect to TimescaleDB
+        spec = ("psycopg2", [], {"host": host, "port": port, "user": user, "password": password, "dbname": database})
+
+        # The checkpoint is keyed by what is extracted, so that it is found again by a new run
+        key = checkpoint_key(self.__class__.__name__, host, port, database, query, order_column)
+
+        try:
+            processed_rows = extract_keyset(
+                spec,
+                query,
+                order_column,
+                self.output,
+                self.top_level_arguments,
+                self.state,
+                key,
+                page_size=page_size,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from TimescaleDB: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
+
+    def fetch_incremental(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        query: str,
+        watermark_column: str,
+        lookback: float = 0,
+        page_size: int = 1000,
+    ) -> None:
+        """
+        🌊 Fetch the rows of a TimescaleDB query that changed since the last run and save them in batch.
+
+        The high-water mark of `watermark_column` is kept in the state, and every run reads the rows from it up to and
+        including the current maximum. Rows that are committed late with an older value can be caught with a `lookback`
+        window. Rows that were already delivered unchanged are skipped when they are read again.
+
+        Args:
+            host (str): The TimescaleDB host.
+            port (int): The TimescaleDB port.
+            user (str): The TimescaleDB user.
+            password (str): The TimescaleDB password.
+            database (str): The TimescaleDB database name.
+            query (str): The SQL query to execute.
+            watermark_column (str): The change-tracking column of the query result, e.g. updated_at, ideally indexed.
+            lookback (float): How far before the high-water mark to start reading, in seconds for dates and
+                timestamps and in column units for numbers. Defaults to 0.
+            page_size (int): The number of rows to fetch per page. Defaults to 1000.
+
+        Raises:
+            Exception: If unable to connect to the TimescaleDB server or execute the query.
+        """
+        # Describe how to connect to TimescaleDB
+        spec = ("psycopg2", [], {"host": host, "port": port, "user": user, "password": password, "dbname": database})
+
+        # The high-water mark is keyed by what is extracted, so that it is found again by the next run
+        key = checkpoint_key(self.__class__.__name__, "incremental", host, port, database, query, watermark_column)
+
+        try:
+            processed_rows = extract_incremental(
+                spec,
+                query,
+                watermark_column,
+                self.output,
+                self.top_level_arguments,
+                self.state,
+                key,
+                lookback=lookback,
+                page_size=page_size,
+            )
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["success_count"] += 1
+            current_state["processed_rows"] = processed_rows
+            self.state.set_state(self.id, current_state)
+
+            # Log the total number of rows processed
+            self.log.info(f"Total rows processed: {processed_rows}")
+
+        except Exception as e:
+            self.log.error(f"Error fetching data from TimescaleDB: {e}")
+
+            # Update the state
+            current_state = self.state.get_state(self.id) or {
+                "success_count": 0,
+                "failure_count": 0,
+                "processed_rows": 0,
+            }
+            current_state["failure_count"] += 1
+            self.state.set_state(self.id, current_state)
@@ -16,6 +16,8 @@
 import voltdb
 from geniusrise import BatchOutput, Spout, State
 
+from geniusrise_databases.buffered_output import BufferedOutput
+
 
 class VoltDB(Spout):
     def __init__(self, output: BatchOutput, state: State, **kwargs):
@@ -82,6 +84,9 @@ class VoltDB(Spout):
         # Initialize VoltDB client
         client = voltdb.Client(host=host, port=port)
 
+        # Initialize the output buffer
+        buffer = BufferedOutput.from_arguments(self.output, self.top_level_arguments)
+
         try:
             # Connect to the database
             client.create_session(username, password)
@@ -101,13 +106,16 @@ class VoltDB(Spout):
                 if not batch:
                     break
 
-                # Save the batch of tables to a file
-                self.output.save(batch)
+                # Buffer the batch of tables
+                buffer.extend(batch)
 
                 # Update the number of processed tables
                 processed_tables += len(batch)
                 self.log.info(f"Total tables processed: {processed_tables}/{table_count}")
 
+            # Flush the remaining buffered rows
+            buffer.flush()
+
             # Update the state
             current_state = self.state.get_state(self.id) or {
                 "success_count": 0,
@@ -0,0 +1,265 @@
+import json
+import os
+import sqlite3
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+from geniusrise_databases.dbapi import extract_incremental, extract_keyset, restore, serializable, shift
+
+
+class DictState:
+    def __init__(self):
+        self.states = {}
+
+    def get_state(self, key):
+        return self.states.get(key)
+
+    def set_state(self, key, value):
+        self.states[key] = value
+
+
+def read_rows(folder):
+    rows = []
+    for filename in os.listdir(folder):
+        with open(os.path.join(folder, filename)) as f:
+            rows.extend(json.load(f))
+    return rows
+
+
+def create_events(path, count):
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, updated INTEGER)")
+    connection.executemany("INSERT INTO events VALUES (?, ?)", [(i, i) for i in range(1, count + 1)])
+    connection.commit()
+    connection.close()
+
+
+def test_incremental_reads_all_rows_on_first_run(tmp_path):
+    path = str(tmp_path / "db.sqlite")
+    create_events(path, 1000)
+    output = tmp_path / "output"
+    output.mkdir()
+    spec = ("sqlite3", [path], {})
+
+    state = DictState()
+    rows = extract_incremental(
+        spec, "SELECT * FROM events", "updated", SimpleNamespace(output_folder=str(output)), {}, state, "key"
+    )
+
+    assert rows == 1000
+    assert sorted(row["id"] for row in read_rows(output)) == list(range(1, 1001))
+    assert state.get_state("key")["watermark"] == 1000
+
+
+def test_incremental_rerun_reads_only_new_rows(tmp_path):
+    path = str(tmp_path / "db.sqlite")
+    create_events(path, 10)
+    spec = ("sqlite3", [path], {})
+    state = DictState()
+
+    first = tmp_path / "first"
+    first.mkdir()
+    extract_incremental(
+        spec, "SELECT * FROM events", "updated", SimpleNamespace(output_folder=str(first)), {}, state, "key"
+    )
+
+    second = tmp_path / "second"
+    second.mkdir()
+    assert (
+        extract_incremental(
+            spec, "SELECT * FROM events", "updated", SimpleNamespace(output_folder=str(second)), {}, state, "key"
+        )
+        == 0
+    )
+
+    connection = sqlite3.connect(path)
+    connection.execute("INSERT INTO events VALUES (11, 11)")
+    connection.commit()
+    connection.close()
+
+    third = tmp_path / "third"
+    third.mkdir()
+    extract_incremental(
+        spec, "SELECT * FROM events", "updated", SimpleNamespace(output_folder=str(third)), {}, state, "key"
+    )
+    assert [row["id"] for row in read_rows(third)] == [11]
+
+
+def test_incremental_reads_ties_and_late_rows_once(tmp_path):
+    path = str(tmp_path / "db.sqlite")
+    create_events(path, 10)
+    spec = ("sqlite3", [path], {})
+    state = DictState()
+
+    def run(name):
+        folder = tmp_path / name
+        folder.mkdir()
+        extract_incremental(
+            spec, "SELECT * FROM events", "updated", SimpleNamespace(output_folder=str(folder)), {}, state, "key", 2
+        )
+        return sorted(row["id"] for row in read_rows(folder))
+
+    assert run("first") == list(range(1, 11))
+
+    # A row sharing the high-water mark and a row committed late inside the lookback window
+    connection = sqlite3.connect(path)
+    connection.executemany("INSERT INTO events VALUES (?, ?)", [(11, 10), (12, 9)])
+    connection.commit()
+    connection.close()
+
+    assert run("second") == [11, 12]
+    assert run("third") == []
+
+
+def test_decimal_watermarks_are_restored_and_shifted():
+    stored = serializable(Decimal("10.50"))
+
+    assert stored == "10.50"
+    assert restore(stored, False, True) == Decimal("10.50")
+    assert shift(Decimal("10.50"), 0.25) == Decimal("10.25")
+
+
+class FailingCursor:
+    """A sqlite3 cursor that records the bound parameters and fails after a number of queries."""
+
+    def __init__(self, cursor, calls, fail_after):
+        self.cursor = cursor
+        self.calls = calls
+        self.fail_after = fail_after
+
+    @property
+    def description(self):
+        return self.cursor.description
+
+    def execute(self, statement, params=()):
+        if self.fail_after is not None and len(self.calls) >= self.fail_after:
+            raise RuntimeError("connection lost")
+        self.calls.append(params)
+        return self.cursor.execute(statement, params)
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def close(self):
+        self.cursor.close()
+
+
+@pytest.fixture
+def failing_sqlite(monkeypatch):
+    module = ModuleType("failing_sqlite")
+    module.paramstyle = "qmark"
+    module.calls = []
+    module.fail_after = None
+
+    def connect(path):
+        connection = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES)
+        return SimpleNamespace(
+            cursor=lambda: FailingCursor(connection.cursor(), module.calls, module.fail_after),
+            close=connection.close,
+        )
+
+    module.connect = connect
+    monkeypatch.setitem(sys.modules, "failing_sqlite", module)
+    return module
+
+
+def test_keyset_resumes_after_a_date_key(tmp_path, failing_sqlite):
+    path = str(tmp_path / "db.sqlite")
+    days = [date(2023, 1, 1) + timedelta(days=i) for i in range(10)]
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE days (day DATE PRIMARY KEY, value INTEGER)")
+    connection.executemany("INSERT INTO days VALUES (?, ?)", [(day.isoformat(), i) for i, day in enumerate(days)])
+    connection.commit()
+    connection.close()
+
+    spec = ("failing_sqlite", [path], {})
+    state = DictState()
+    arguments = {"buffer_rows": 3}
+
+    # The third page fails, after the first two pages have been written
+    first = tmp_path / "first"
+    first.mkdir()
+    failing_sqlite.fail_after = 2
+    with pytest.raises(RuntimeError):
+        extract_keyset(
+            spec, "SELECT * FROM days", "day", SimpleNamespace(output_folder=str(first)), arguments, state, "key", 3
+        )
+    assert state.get_state("key")["watermark"] == "2023-01-06"
+    assert state.get_state("key")["temporal"] is True
+
+    second = tmp_path / "second"
+    second.mkdir()
+    failing_sqlite.calls.clear()
+    failing_sqlite.fail_after = None
+    rows = extract_keyset(
+        spec, "SELECT * FROM days", "day", SimpleNamespace(output_folder=str(second)), arguments, state, "key", 3
+    )
+
+    assert rows == 4
+    assert failing_sqlite.calls[0] == (date(2023, 1, 6),)
+    assert len(read_rows(first)) + len(read_rows(second)) == 10
+
+
+class FormatCursor:
+    """A sqlite3 cursor with the format paramstyle, %-formatting statements like pymysql and psycopg2 do."""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    @property
+    def description(self):
+        return self.cursor.description
+
+    def execute(self, statement, params=None):
+        if params is not None:
+            statement = statement % tuple("?" for _ in params)
+        return self.cursor.execute(statement, params or ())
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def close(self):
+        self.cursor.close()
+
+
+@pytest.fixture
+def format_sqlite(monkeypatch):
+    module = ModuleType("format_sqlite")
+    module.paramstyle = "format"
+
+    def connect(path):
+        connection = sqlite3.connect(path)
+        return SimpleNamespace(cursor=lambda: FormatCursor(connection.cursor()), close=connection.close)
+
+    module.connect = connect
+    monkeypatch.setitem(sys.modules, "format_sqlite", module)
+    return module
+
+
+def test_keyset_escapes_percent_signs_on_every_page(tmp_path, format_sqlite):
+    path = str(tmp_path / "db.sqlite")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE names (id INTEGER PRIMARY KEY, name TEXT)")
+    connection.executemany("INSERT INTO names VALUES (?, ?)", [(i, f"a{i}" if i % 2 else f"b{i}") for i in range(10)])
+    connection.commit()
+    connection.close()
+
+    output = tmp_path / "output"
+    output.mkdir()
+    rows = extract_keyset(
+        ("format_sqlite", [path], {}),
+        "SELECT * FROM names WHERE name LIKE 'a%'",
+        "id",
+        SimpleNamespace(output_folder=str(output)),
+        {},
+        DictState(),
+        "key",
+        2,
+    )
+
+    assert rows == 5
+    assert sorted(row["id"] for row in read_rows(output)) == [1, 3, 5, 7, 9]
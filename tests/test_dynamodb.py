@@ -0,0 +1,224 @@
+import base64
+import gzip
+import json
+import os
+import threading
+from types import SimpleNamespace
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError, ReadTimeoutError
+from moto import mock_aws
+
+from geniusrise_databases import dynamodb
+from geniusrise_databases.dbapi import checkpoint_key
+from geniusrise_databases.dynamodb import (
+    SegmentCheckpoints,
+    ThroughputGovernor,
+    export_data_files,
+    ingest_export,
+    parallel_scan,
+    read_export_file,
+)
+
+
+class DictState:
+    def __init__(self):
+        self.states = {}
+
+    def get_state(self, key):
+        return self.states.get(key)
+
+    def set_state(self, key, value):
+        self.states[key] = value
+
+
+def read_rows(folder):
+    rows = []
+    for filename in os.listdir(folder):
+        with open(os.path.join(folder, filename)) as f:
+            rows.extend(json.load(f))
+    return rows
+
+
+class FlakyClient:
+    """A DynamoDB client whose scan requests raise the given errors before succeeding."""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def scan(self, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"Items": [], "ScannedCount": 2, "ConsumedCapacity": {"CapacityUnits": 1.0}}
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(dynamodb.time, "sleep", lambda seconds: None)
+
+
+def test_governed_scan_retries_connection_errors():
+    governor = ThroughputGovernor(rate=100, max_concurrency=2)
+    client = FlakyClient(
+        [EndpointConnectionError(endpoint_url="http://localhost"), ReadTimeoutError(endpoint_url="http://localhost")]
+    )
+
+    response = governor.scan(client, TableName="table")
+
+    assert response["ScannedCount"] == 2
+    assert client.calls == 3
+    assert governor.active == 0
+
+
+def test_governed_scan_releases_the_slot_when_it_fails():
+    governor = ThroughputGovernor(rate=100, max_concurrency=1, max_attempts=2)
+    error = ClientError({"Error": {"Code": "ValidationException", "Message": "bad"}}, "Scan")
+
+    with pytest.raises(ClientError):
+        governor.scan(FlakyClient([error]), TableName="table")
+    assert governor.active == 0
+
+    with pytest.raises(EndpointConnectionError):
+        governor.scan(FlakyClient([EndpointConnectionError(endpoint_url="http://localhost")] * 2), TableName="table")
+    assert governor.active == 0
+
+    # The slot is free for the next request
+    assert governor.scan(FlakyClient([]), TableName="table")["ScannedCount"] == 2
+
+
+EXPORT_ITEMS = [
+    {
+        "id": {"S": "a"},
+        "blob": {"B": "AAE="},
+        "tags": {"SS": ["x", "y"]},
+        "scores": {"NS": ["1", "2.5"]},
+        "nested": {"M": {"blobs": {"BS": ["AQI="]}, "list": {"L": [{"B": "Aw=="}, {"N": "7"}]}}},
+    },
+    {"id": {"S": "b"}, "count": {"N": "3"}, "flag": {"BOOL": True}, "empty": {"NULL": True}},
+]
+
+
+class ExportClient:
+    """A DynamoDB client with a completed export in the given bucket."""
+
+    def __init__(self, bucket, manifest):
+        self.bucket = bucket
+        self.manifest = manifest
+        self.started = 0
+
+    def describe_table(self, TableName):
+        return {"Table": {"TableArn": f"arn:aws:dynamodb:us-east-1:123456789012:table/{TableName}"}}
+
+    def export_table_to_point_in_time(self, **kwargs):
+        self.started += 1
+        return {"ExportDescription": {"ExportArn": f"{kwargs['TableArn']}/export/1"}}
+
+    def describe_export(self, ExportArn):
+        return {
+            "ExportDescription": {"ExportStatus": "COMPLETED", "S3Bucket": self.bucket, "ExportManifest": self.manifest}
+        }
+
+
+@pytest.fixture
+def export_bucket(monkeypatch):
+    """An S3 bucket holding a DynamoDB JSON export of `EXPORT_ITEMS` in two data files, as AWS writes it."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        s3 = boto3.client("s3")
+        s3.create_bucket(Bucket="exports")
+
+        prefix = "AWSDynamoDB/01234567890123-abcdefgh"
+        files = []
+        for i, item in enumerate(EXPORT_ITEMS):
+            key = f"{prefix}/data/file-{i}.json.gz"
+            s3.put_object(Bucket="exports", Key=key, Body=gzip.compress(json.dumps({"Item": item}).encode() + b"\n"))
+            files.append(json.dumps({"itemCount": 1, "dataFileS3Key": key}))
+        s3.put_object(Bucket="exports", Key=f"{prefix}/manifest-files.json", Body="\n".join(files).encode())
+        s3.put_object(
+            Bucket="exports",
+            Key=f"{prefix}/manifest-summary.json",
+            Body=json.dumps({"manifestFilesS3Key": f"{prefix}/manifest-files.json"}).encode(),
+        )
+        yield s3, f"{prefix}/manifest-summary.json"
+
+
+def test_export_data_files_lists_the_manifest(export_bucket):
+    s3, manifest = export_bucket
+
+    files = export_data_files(s3, "exports", manifest)
+
+    assert [f.rsplit("/", 1)[-1] for f in files] == ["file-0.json.gz", "file-1.json.gz"]
+
+
+def test_read_export_file_restores_binary_values_and_sets(export_bucket, tmp_path):
+    s3, manifest = export_bucket
+    key = export_data_files(s3, "exports", manifest)[0]
+
+    native = tmp_path / "native"
+    native.mkdir()
+    assert read_export_file(s3, "exports", key, SimpleNamespace(output_folder=str(native)), {}, threading.Event()) == 1
+
+    (item,) = read_rows(native)
+    assert item["blob"] == base64.b64encode(b"\x00\x01").decode()
+    assert sorted(item["tags"]) == ["x", "y"]
+    assert sorted(item["scores"], key=float) == ["1", "2.5"]
+    assert item["nested"]["blobs"] == ["AQI="]
+    assert item["nested"]["list"] == ["Aw==", "7"]
+
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    read_export_file(s3, "exports", key, SimpleNamespace(output_folder=str(raw)), {}, threading.Event(), "raw")
+    assert read_rows(raw) == [EXPORT_ITEMS[0]]
+
+
+def test_ingest_export_reads_every_file_and_clears_the_export(export_bucket, tmp_path):
+    s3, manifest = export_bucket
+    client = ExportClient("exports", manifest)
+    state = DictState()
+
+    rows = ingest_export(
+        client, s3, "table", "exports", SimpleNamespace(output_folder=str(tmp_path)), {}, state, item_format="plain"
+    )
+
+    assert rows == 2
+    assert client.started == 1
+    assert sorted(item["id"] for item in read_rows(tmp_path)) == ["a", "b"]
+    assert all(value == {"export_arn": None} for value in state.states.values())
+
+
+def test_parallel_scan_resumes_with_the_segments_it_started_with(monkeypatch, tmp_path):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        client = boto3.client("dynamodb")
+        client.create_table(
+            TableName="table",
+            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        for i in range(20):
+            client.put_item(TableName="table", Item={"id": {"S": f"item-{i}"}})
+
+        # A previous scan of the table as 3 segments finished its first segment
+        state = DictState()
+        checkpoints = SegmentCheckpoints(state, checkpoint_key("DynamoDB", "table"))
+        checkpoints.total_segments = 3
+        checkpoints.set(0, {"done": True})
+        first = {item["id"]["S"] for item in client.scan(TableName="table", Segment=0, TotalSegments=3)["Items"]}
+
+        rows = parallel_scan(
+            "table", SimpleNamespace(output_folder=str(tmp_path)), {}, state, total_segments=8, item_format="plain"
+        )
+
+        assert rows == 20 - len(first)
+        assert {item["id"] for item in read_rows(tmp_path)} == {f"item-{i}" for i in range(20)} - first
+        assert SegmentCheckpoints(state, checkpoint_key("DynamoDB", "table")).total_segments is None
@@ -0,0 +1,29 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_modules(code):
+    """Run code in a fresh interpreter and list the package and geniusrise modules it loaded."""
+    script = (
+        f"import sys, json; {code}; "
+        "print(json.dumps(sorted(m for m in sys.modules "
+        "if m.startswith('geniusrise_databases.') or m.split('.')[0] == 'geniusrise')))"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def test_importing_the_package_loads_no_spout():
+    assert loaded_modules("import geniusrise_databases") == []
+
+
+def test_a_spout_is_loaded_on_first_access():
+    loaded = loaded_modules("import geniusrise_databases; geniusrise_databases.SQLite")
+
+    assert "geniusrise_databases.sqlite" in loaded
+    assert "geniusrise_databases.postgres" not in loaded
+    assert "geniusrise_databases.mongodb" not in loaded
@@ -0,0 +1,251 @@
+import contextlib
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import bson
+import mongomock
+from bson import Decimal128, ObjectId, Timestamp, json_util
+
+from geniusrise_databases.mongodb import export_raw, id_range_filters, read_range, split_ids, stream_changes
+
+
+def read_documents(folder):
+    documents = []
+    for filename in sorted(os.listdir(folder)):
+        with open(os.path.join(folder, filename)) as f:
+            documents.extend(json_util.loads(f.read()))
+    return documents
+
+
+def test_documents_are_saved_as_extended_json(tmp_path):
+    collection = mongomock.MongoClient().db.collection
+    document = {
+        "_id": ObjectId(),
+        "created": datetime(2023, 1, 1, 12, 30),
+        "clock": Timestamp(1672576200, 1),
+        "price": Decimal128("9.99"),
+        "payload": b"\x00\x01",
+    }
+    collection.insert_one(document)
+
+    relaxed = tmp_path / "relaxed"
+    relaxed.mkdir()
+    read_range(collection, {}, SimpleNamespace(output_folder=str(relaxed)), {}, 10, threading.Event())
+    assert read_documents(relaxed) == [document]
+
+    canonical = tmp_path / "canonical"
+    canonical.mkdir()
+    arguments = {"extended_json": "canonical"}
+    read_range(collection, {}, SimpleNamespace(output_folder=str(canonical)), arguments, 10, threading.Event())
+    with open(os.path.join(canonical, os.listdir(canonical)[0])) as f:
+        assert '"$numberLong"' in f.read()
+    assert read_documents(canonical) == [document]
+
+
+def test_id_ranges_read_every_document_once_with_mixed_id_types(tmp_path):
+    collection = mongomock.MongoClient().db.collection
+    object_ids = [ObjectId() for _ in range(6)]
+    others = ["a", "b", 1, 2.5, datetime(2023, 1, 1)]
+    collection.insert_many([{"_id": value} for value in object_ids + others])
+
+    filters = id_range_filters([object_ids[2], object_ids[4]])
+    assert len(filters) == 4
+
+    ids = []
+    for i, query in enumerate(filters):
+        folder = tmp_path / str(i)
+        folder.mkdir()
+        read_range(collection, query, SimpleNamespace(output_folder=str(folder)), {}, 2, threading.Event())
+        ids += [document["_id"] for document in read_documents(folder)]
+
+    assert len(ids) == len(object_ids + others)
+    assert set(map(str, ids)) == set(map(str, object_ids + others))
+
+
+def test_mixed_split_points_read_the_collection_as_one_range():
+    buckets = [{"_id": {"min": value}} for value in [ObjectId(), ObjectId(), "a", 3]]
+    collection = SimpleNamespace(aggregate=lambda pipeline, allowDiskUse: buckets)
+
+    assert split_ids(collection, 4) == []
+    assert id_range_filters([]) == [{}]
+
+
+class RawBatchCollection:
+    """A collection whose raw batches hold the BSON of the given documents, a few documents per batch."""
+
+    def __init__(self, documents, per_batch):
+        self.documents = documents
+        self.per_batch = per_batch
+        self.calls = []
+
+    def find_raw_batches(self, query, projection, batch_size):
+        self.calls.append((query, projection, batch_size))
+        encoded = [bson.encode(document) for document in self.documents]
+        return contextlib.nullcontext(
+            [b"".join(encoded[i : i + self.per_batch]) for i in range(0, len(encoded), self.per_batch)]
+        )
+
+
+def raw_files(folder, extension):
+    names = os.listdir(folder)
+    assert all(name.endswith(extension) for name in names)
+    files = []
+    for name in names:
+        with open(os.path.join(folder, name), "rb") as f:
+            files.append(f.read())
+    return files
+
+
+def test_raw_bson_export_never_splits_a_document(tmp_path):
+    documents = [{"_id": i, "text": "x" * (i * 10)} for i in range(20)]
+    collection = RawBatchCollection(documents, 3)
+
+    count, size = export_raw(
+        collection, {"a": 1}, SimpleNamespace(output_folder=str(tmp_path)), fields="_id, text", file_size=500
+    )
+
+    assert count == 20
+    assert collection.calls == [({"a": 1}, {"_id": 1, "text": 1}, 1000)]
+    files = raw_files(tmp_path, ".bson")
+    assert len(files) > 1
+    assert size == sum(len(data) for data in files)
+    assert sorted(document["_id"] for data in files for document in bson.decode_all(data)) == list(range(20))
+
+
+def test_raw_length_prefixed_export_frames_every_document(tmp_path):
+    documents = [{"_id": i, "text": "x" * (i * 10)} for i in range(20)]
+
+    count, _ = export_raw(
+        RawBatchCollection(documents, 4),
+        {},
+        SimpleNamespace(output_folder=str(tmp_path)),
+        raw_format="length_prefixed",
+        file_size=500,
+    )
+
+    assert count == 20
+    decoded = []
+    for data in raw_files(tmp_path, ".bin"):
+        offset = 0
+        while offset < len(data):
+            (size,) = struct.unpack_from(">I", data, offset)
+            document = data[offset + 4 : offset + 4 + size]
+            # The frame holds exactly one document, whose own size is little-endian
+            assert struct.unpack_from("<i", document)[0] == size
+            decoded.append(bson.decode(document))
+            offset += 4 + size
+        assert offset == len(data)
+    assert sorted(document["_id"] for document in decoded) == list(range(20))
+
+
+class DictState:
+    def __init__(self):
+        self.states = {}
+
+    def get_state(self, key):
+        return self.states.get(key)
+
+    def set_state(self, key, value):
+        self.states[key] = value
+
+
+class ChangeStream:
+    """A change stream over an event log, whose resume token {"_data": n} points after the first n events."""
+
+    def __init__(self, events, position):
+        self.events = events
+        self.position = position
+        self.alive = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.alive = False
+
+    @property
+    def resume_token(self):
+        return {"_data": self.position}
+
+    def try_next(self):
+        if self.position < len(self.events):
+            self.position += 1
+            return self.events[self.position - 1]
+        time.sleep(0.01)
+        return None
+
+
+class WatchedCollection:
+    """A mongomock collection with a change stream, and a hook run while a snapshot reads it."""
+
+    def __init__(self, on_find=None):
+        self.collection = mongomock.MongoClient().db.collection
+        self.database = self.collection.database
+        self.name = self.collection.name
+        self.full_name = self.collection.full_name
+        self.events = []
+        self.watches = []
+        self.on_find = on_find
+
+    def change(self, operation, document):
+        self.events.append(
+            {
+                "_id": {"_data": len(self.events) + 1},
+                "operationType": operation,
+                "documentKey": {"_id": document["_id"]},
+                "fullDocument": document,
+            }
+        )
+
+    def find(self, query, batch_size):
+        if self.on_find is not None:
+            self.on_find(self)
+        return self.collection.find(query, batch_size=batch_size)
+
+    def watch(self, pipeline, full_document, resume_after=None, **kwargs):
+        self.watches.append(resume_after)
+        return ChangeStream(self.events, len(self.events) if resume_after is None else resume_after["_data"])
+
+
+def test_change_stream_resumes_after_the_stored_token(tmp_path):
+    collection = WatchedCollection()
+    for i in range(3):
+        collection.change("insert", {"_id": i})
+    state = DictState()
+    state.set_state("key", {"resume_token": {"_data": 1}})
+
+    events = stream_changes(collection, SimpleNamespace(output_folder=str(tmp_path)), {}, state, "key", duration=0.2)
+
+    assert events == 2
+    assert collection.watches == [{"_data": 1}]
+    assert [event["documentKey"]["_id"] for event in read_documents(tmp_path)] == [1, 2]
+    assert state.get_state("key") == {"resume_token": {"_data": 3}}
+
+
+def test_snapshot_hands_off_to_the_change_stream(tmp_path):
+    def change_during_snapshot(collection):
+        collection.collection.insert_one({"_id": "c"})
+        collection.change("insert", {"_id": "c"})
+
+    collection = WatchedCollection(on_find=change_during_snapshot)
+    collection.collection.insert_many([{"_id": "a"}, {"_id": "b"}])
+    collection.change("insert", {"_id": "before"})
+    state = DictState()
+
+    events = stream_changes(
+        collection, SimpleNamespace(output_folder=str(tmp_path)), {}, state, "key", snapshot=True, duration=0.2
+    )
+
+    # The stream is opened before the snapshot, and resumed from that point after it
+    assert collection.watches == [None, {"_data": 1}]
+    documents = read_documents(tmp_path)
+    snapshot = sorted(event["documentKey"]["_id"] for event in documents if event["operationType"] == "snapshot")
+    changes = [event["documentKey"]["_id"] for event in documents if event["operationType"] == "insert"]
+    assert events == len(documents)
+    assert changes == ["c"]
+    assert set(snapshot) <= {"a", "b", "c"} and {"a", "b"} <= set(snapshot)
+    assert state.get_state("key") == {"resume_token": {"_data": 2}}
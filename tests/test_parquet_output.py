@@ -0,0 +1,81 @@
+import os
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+from geniusrise_databases.parquet_output import ParquetOutput, to_table
+
+
+def write(tmp_path, rows):
+    output = ParquetOutput(SimpleNamespace(output_folder=str(tmp_path)))
+    output.extend(rows)
+    filename = output.flush()
+    return pq.read_table(os.path.join(str(tmp_path), filename)).to_pylist()
+
+
+def test_integers_beyond_64_bits_are_stored_as_strings(tmp_path):
+    assert to_table([{"a": 2**70}]).column("a").to_pylist() == [str(2**70)]
+    assert write(tmp_path, [{"a": 2**70}, {"a": 1}]) == [{"a": str(2**70)}, {"a": "1"}]
+
+
+def test_nested_empty_documents_are_stored_as_json(tmp_path):
+    assert write(tmp_path, [{"a": [{}]}, {"a": [{}, {}]}]) == [{"a": "[{}]"}, {"a": "[{}, {}]"}]
+    assert to_table([{"a": {"b": {}}}]).column("a").to_pylist() == ['{"b": {}}']
+
+
+def test_nested_documents_are_stored_as_structs(tmp_path):
+    assert write(tmp_path, [{"a": [{"b": 1}]}]) == [{"a": [{"b": 1}]}]
+
+
+def test_record_batches_are_written_as_they_are(tmp_path):
+    flushed = []
+    output = ParquetOutput(
+        SimpleNamespace(output_folder=str(tmp_path)), max_rows=4, on_flush=lambda name, row: flushed.append(row)
+    )
+    for start in range(0, 6, 2):
+        output.add_batch(pa.record_batch({"id": [start, start + 1], "value": [1.5, None]}))
+    output.flush()
+
+    assert output.rows_written == 6
+    assert flushed == [{"id": 3, "value": None}, {"id": 5, "value": None}]
+    assert sorted(
+        row["id"] for filename in os.listdir(str(tmp_path)) for row in pq.read_table(tmp_path / filename).to_pylist()
+    ) == list(range(6))
+
+
+def test_later_files_keep_the_schema_of_the_first_file(tmp_path):
+    output = ParquetOutput(SimpleNamespace(output_folder=str(tmp_path)), max_rows=2)
+    output.extend(
+        [
+            {"id": 1, "big": 2**70, "note": None, "score": 1.5},
+            {"id": 2, "big": 3, "note": None, "score": None},
+            {"id": 3, "big": 4, "note": "late", "score": 2},
+            {"id": 4, "big": None, "note": None, "score": None, "extra": True},
+        ]
+    )
+    output.flush()
+
+    table = ds.dataset(str(tmp_path), format="parquet", schema=output.schema).to_table().sort_by("id")
+    assert table.schema.field("big").type == pa.string()
+    assert table.schema.field("note").type == pa.string()
+    assert table.schema.field("score").type == pa.float64()
+    assert table.to_pylist() == [
+        {"id": 1, "big": str(2**70), "note": None, "score": 1.5, "extra": None},
+        {"id": 2, "big": "3", "note": None, "score": None, "extra": None},
+        {"id": 3, "big": "4", "note": "late", "score": 2.0, "extra": None},
+        {"id": 4, "big": None, "note": None, "score": None, "extra": True},
+    ]
+
+    # A dataset of the files without an explicit schema reads the columns of the first file with their types
+    assert ds.dataset(str(tmp_path), format="parquet").to_table().num_rows == 4
+
+
+def test_values_that_do_not_fit_the_schema_are_rejected(tmp_path):
+    output = ParquetOutput(SimpleNamespace(output_folder=str(tmp_path)), max_rows=1)
+    output.add({"id": 1})
+
+    with pytest.raises(ValueError, match="Column id"):
+        output.add({"id": 2**70})